@@ -1,4 +1,84 @@
+import configparser
 import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DB_PATH = os.path.join(BASE_DIR, 'my_database.db')
\ No newline at end of file
+DB_PATH = os.path.join(BASE_DIR, 'my_database.db')
+
+#In-memory mode
+# Setting DB_PATH to MEMORY_DB_PATH runs EasyForce on a shared-cache in-memory database seen by all
+# of the process's threads (any other "file:...?mode=memory&cache=shared" URI works as well). snapshot.py copies
+# it from / to SNAPSHOT_PATH with the SQLite backup API. Threads meeting each other's table locks
+# wait for up to busy_timeout ms (see db_connection.py).
+MEMORY_DB_PATH = ":memory:"
+SNAPSHOT_PATH = os.path.join(BASE_DIR, 'my_database.db')
+
+#Database performance profile
+# PRAGMAs applied to every connection (see db_connection.py). A profile is chosen by name and
+# single PRAGMAs can be overridden, both from the [database] section of the config file or from
+# the environment (which wins):
+#   [database]                          EASYFORCE_DB_PROFILE=bulk-import
+#   profile = bulk-import               EASYFORCE_DB_SYNCHRONOUS=NORMAL
+#   synchronous = NORMAL
+# journal_mode = WAL is stored in the database file itself: the first connection under a WAL
+# profile converts an existing file for good (it keeps its -wal / -shm companions, and any other
+# SQLite tool opening it uses WAL too). Set journal_mode = DELETE to keep, or return to, a
+# rollback-journal file; the read-only-reporting profile never changes the journal mode.
+CONFIG_FILE = os.environ.get("EASYFORCE_CONFIG", os.path.join(BASE_DIR, 'easyforce.ini'))
+
+PROFILE_PRAGMAS = ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout",
+                   "query_only")
+
+PERFORMANCE_PROFILES = {
+    # Day-to-day menus: many small transactions. WAL + NORMAL syncs only at checkpoints and lets
+    # readers run during a write; a crash may lose the last commits but never corrupts the file.
+    "interactive": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,        # KiB (negative = size, not pages): ~16 MB
+        "mmap_size": 64 * 1024 ** 2,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,        # ms
+    },
+    # Large imports inside BaseEntity.bulk_load(): no fsync at all and a large cache.
+    # A power loss during the import can lose it; the import is expected to be re-runnable.
+    "bulk-import": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256000,
+        "mmap_size": 256 * 1024 ** 2,
+        "temp_store": "MEMORY",
+        "busy_timeout": 30000,
+    },
+    # Read-only reporting over the whole history: large cache and memory map for scans, and
+    # query_only, so a reporting process can never write (or migrate) the database it reads.
+    # Meant for an existing, initialized database; the journal mode is left as the file has it.
+    "read-only-reporting": {
+        "cache_size": -128000,
+        "mmap_size": 1024 ** 3,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "query_only": "ON",
+    },
+}
+
+# Former profile names that still select a profile
+PROFILE_ALIASES = {
+    "reporting": "read-only-reporting",
+}
+
+
+def _load_db_settings():
+    """Returns (profile name, {pragma: value} overrides) from the config file and the environment."""
+    parser = configparser.ConfigParser()
+    parser.read(CONFIG_FILE)
+    section = parser["database"] if parser.has_section("database") else {}
+    profile = os.environ.get("EASYFORCE_DB_PROFILE", section.get("profile", "interactive"))
+    overrides = {}
+    for pragma in PROFILE_PRAGMAS:
+        value = os.environ.get(f"EASYFORCE_DB_{pragma.upper()}", section.get(pragma))
+        if value is not None:
+            overrides[pragma] = value
+    return profile, overrides
+
+
+DB_PROFILE, DB_PRAGMA_OVERRIDES = _load_db_settings()
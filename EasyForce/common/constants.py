@@ -27,3 +27,17 @@ YEAR = 365
 MIDNIGHT = "00:00"
 UNNECESSARILY_TIME_RANGE = 2 #In minutes
 DEFAULT_MORNING_HOUR = "08:00"
+
+#Database
+MAX_SQL_VARIABLES = 900 #Stays under SQLite's historical limit of 999 bound parameters per statement
+FETCH_BATCH_SIZE = 1000 #Rows pulled per fetchmany() call by the streaming iterators
+ENTITY_CACHE_SIZE = 10000 #Most entities kept by the identity map of one cache scope (least recently used are evicted)
+TIME_RANGE_RTREE = "TimeRangeRTree" #R*Tree mirror of the TimeRange intervals, in epoch minutes
+GARBAGE_COLLECTOR_BATCH_SIZE = 5000 #TimeRange rows deleted per statement (and transaction) by the startup cleanup
+
+#Scheduling
+SCHEDULE_HORIZON_DAYS = 30 #Days schedule_shifts() plans ahead by default
+SHIFT_SLOT_CACHE_SIZE = 4096 #(daily window, day) pairs whose shifts shift_slots.window_shifts() keeps memoized
+ELIGIBILITY_BATCH_SIZE = 1024 #Shifts per eligibility matrix: the scheduler builds and solves one batch at a time
+DEFAULT_SCHEDULE_SOLVER = "greedy" #Assignment solver of schedule_shifts(): "greedy" or "flow" (see schedule_logic.SOLVERS)
+REPAIR_FAIRNESS_DAYS = 7 #Days before and after a repaired shift whose assignments count towards fairness (see reschedule.py)
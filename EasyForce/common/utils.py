@@ -1,3 +1,4 @@
+import calendar
 from datetime import datetime,timedelta
 
 from EasyForce.common.constants import *
@@ -248,4 +249,26 @@ def iso_to_ddmmyyyy(time_iso: str) -> str:
     into a 'dd/mm/yyyy hh:mm' format string (e.g. '27/02/2025 14:15').
     """
     dt = datetime.fromisoformat(time_iso)      # Parse the ISO string
-    return dt.strftime('%d/%m/%Y %H:%M')       # Format to dd/mm/yyyy hh:mm
\ No newline at end of file
+    return dt.strftime('%d/%m/%Y %H:%M')       # Format to dd/mm/yyyy hh:mm
+
+def to_epoch_minutes(value) -> int:
+    """
+    Converts a datetime (or an ISO 8601 string) into whole minutes since the Unix epoch,
+    the same value SQLite stores in TimeRange.StartMinute / EndMinute (unixepoch(...) / 60):
+    naive datetimes are taken as they are, aware ones are converted to UTC first,
+    and seconds / microseconds are truncated.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return calendar.timegm(value.utctimetuple()) // 60
+
+
+def from_epoch_minutes(minutes: int) -> datetime:
+    """The inverse of to_epoch_minutes(): a naive datetime for whole minutes since the Unix epoch."""
+    return datetime(1970, 1, 1) + timedelta(minutes=minutes)
+
+
+def hhmm_to_minutes(hhmm: str) -> int:
+    """Converts an 'HH:MM' time of day (e.g. RecurringTask.EveryDayStartTime) into minutes after midnight."""
+    hours, minutes = hhmm.split(":")[:2]
+    return int(hours) * MIN_IN_HOUR + int(minutes)
@@ -0,0 +1,107 @@
+"""
+bulk_load.py
+
+Bulk-load mode for large imports.
+
+Normally every insert into Presence, TaskRole, CurrentTaskAssignment and TaskHistory runs
+per-row validation triggers, each with its own lookups into the referenced tables.
+Inside bulk_load() those insert triggers are dropped for the duration of one transaction; when
+the block ends, INTEGRITY_CHECKS verify the same rules for the rows the load inserted (those
+above each table's MAX(rowid) when it started) with a few set-based anti-join queries.
+Any violation raises IntegrityCheckError and the whole load - including the dropped triggers -
+is rolled back; otherwise the triggers are recreated and the load commits once.
+
+Rows already in the database are not checked again, so a load is not rejected for data it did
+not write (e.g. the Presence rows of a deleted soldier). A row loaded with an explicit id below
+its table's maximum is not checked either; bulk loads should let SQLite assign the ids.
+
+The trigger that adds new TimeRange rows to the R*Tree is dropped as well: the ranges above the
+TimeRange mark are indexed in one statement at the end, so a load costs R*Tree work for the rows
+it inserted only. The update and delete triggers stay, so changes to existing ranges made inside
+the block are mirrored as usual. A range loaded with an explicit TimeID below the mark is not
+indexed either, another reason to let SQLite assign the ids.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+
+from EasyForce.data_management.db_connection import transaction
+from EasyForce.data_management.init_db.init_triggers import DEFERRABLE_TRIGGERS, INTEGRITY_CHECKS
+from EasyForce.data_management.init_db.init_indexes import INTERVAL_INDEX_INSERT_TRIGGER, INDEX_LOADED_RANGES
+
+
+class IntegrityCheckError(sqlite3.IntegrityError):
+    """
+    Raised when the set-based check at the end of a bulk load finds violating rows.
+    'violations' is a list of (message, rows) pairs, one per failed check.
+    """
+
+    def __init__(self, violations: list):
+        self.violations = violations
+        summary = "; ".join(f"{message} ({len(rows)} row(s), e.g. {rows[0]})" for message, rows in violations)
+        super().__init__(f"Bulk load rejected: {summary}")
+
+
+def row_marks(conn) -> dict:
+    """
+    Returns:
+        dict: {table: MAX(rowid)} of every table INTEGRITY_CHECKS looks at (0 for an empty table).
+    """
+    return {table: conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+            for _, table, _ in INTEGRITY_CHECKS}
+
+
+def check_integrity(conn, marks: dict = None) -> list:
+    """
+    Runs every INTEGRITY_CHECKS query on 'conn'.
+
+    Args:
+        marks (dict): row_marks() taken before the load; only rows above them are checked.
+                      Default: every row.
+
+    Returns:
+        list: (message, violating rows) for each check that found rows; empty if all passed.
+    """
+    marks = marks or {}
+    violations = []
+    for message, table, query in INTEGRITY_CHECKS:
+        rows = conn.execute(query, {"before": marks.get(table, 0)}).fetchall()
+        if rows:
+            violations.append((message, rows))
+    return violations
+
+
+@contextmanager
+def bulk_load():
+    """
+    Runs the enclosed block as one transaction with the per-row validation triggers turned off:
+
+        with bulk_load():
+            Presence.add_many(presence_rows)
+            TaskHistory.add_many(history_rows)
+
+    Raises IntegrityCheckError (after rolling everything back) if the loaded data breaks
+    a rule the triggers would have enforced.
+
+    Yields:
+        sqlite3.Connection: the shared connection, for callers that run raw SQL.
+    """
+    with transaction() as conn:
+        dropped = DEFERRABLE_TRIGGERS + (INTERVAL_INDEX_INSERT_TRIGGER,)
+        placeholders = ", ".join(["?"] * len(dropped))
+        triggers = conn.execute(
+            f"SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})",
+            dropped).fetchall()
+        for name, _ in triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+        marks = row_marks(conn)
+
+        yield conn
+
+        violations = check_integrity(conn, marks)
+        if violations:
+            raise IntegrityCheckError(violations)
+        conn.execute(INDEX_LOADED_RANGES, {"before": marks["TimeRange"]})
+        # On an exception the rollback restores the dropped triggers; on success they are recreated
+        for _, sql in triggers:
+            conn.execute(sql)
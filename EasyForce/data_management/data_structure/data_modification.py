@@ -4,12 +4,21 @@ data_modification.py
 Contains the base class (the "father" class) that provides generic CRUD operations
 for any subclass that defines table name, columns, and primary keys.
 
-All database connections are opened internally, so no external 'conn' is passed around.
+All database connections are taken internally from the per-thread pool in db_connection.py,
+so no external 'conn' is passed around. Writes run inside BaseEntity.transaction(), so several
+entity operations can be grouped into one unit of work that commits once.
 """
 
 import sqlite3
-from typing import Optional, Dict, Any, Union
-from EasyForce.common.config import DB_PATH
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Union, Iterable, Iterator
+
+from EasyForce.common.constants import MAX_SQL_VARIABLES, FETCH_BATCH_SIZE, ENTITY_CACHE_SIZE
+from EasyForce.data_management.db_connection import get_connection, transaction
+from EasyForce.data_management.bulk_load import bulk_load
+from EasyForce.data_management.schema_catalog import get_table_schema
+from EasyForce.data_management.data_structure.entity_cache import active_cache, entity_cache_scope
+from EasyForce.data_management.data_structure.query import Query
 
 
 class BaseEntity:
@@ -20,22 +29,163 @@ class BaseEntity:
     2) Define the columns through get_columns().
     3) Define the primary key columns through get_primary_key_columns_names().
     4) Optionally indicate whether the table uses AUTOINCREMENT through is_autoincrement().
+    5) Declare its columns as __slots__ (same names as get_columns()), so instances
+       carry no per-instance __dict__.
+
+    Instances read from the database track which columns were changed since they were
+    loaded (or last written), so update() only writes those columns.
     """
+    # None: not loaded from the database (update() writes every column),
+    # otherwise the tuple of columns changed since the row was loaded or last written.
+    __slots__ = ("_changed",)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        try:
+            columns = cls.get_columns()
+        except NotImplementedError:
+            return
+        if set(cls.__slots__) != set(columns):
+            raise TypeError(f"{cls.__name__}.__slots__ must list exactly its columns: {columns}")
+        cls._row_constructors = {}
+        cls._slot_setters = {col: getattr(cls, col).__set__ for col in columns}
 
     def __init__(self, **kwargs: Any):
         """
-        Dynamically set attributes based on provided keyword arguments.
+        Sets the given columns; every column that is not given is None.
         """
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        object.__setattr__(self, "_changed", None)
+        for col in self.get_columns():
+            setattr(self, col, kwargs.pop(col, None))
+        if kwargs:
+            raise TypeError(f"{type(self).__name__} has no column(s) {', '.join(kwargs)}.")
+
+    def __setattr__(self, name: str, value: Any):
+        changed = self._changed
+        if changed is not None and name not in changed and getattr(self, name) != value:
+            object.__setattr__(self, "_changed", changed + (name,))
+        object.__setattr__(self, name, value)
+
+    def changed_columns(self) -> Optional[tuple]:
+        """
+        Returns the columns changed since this instance was loaded or last written,
+        or None if it was not loaded from the database (then every column counts as changed).
+        """
+        return self._changed
+
+    def _mark_clean(self):
+        """Internal helper: the instance now matches its row, so nothing is changed."""
+        object.__setattr__(self, "_changed", ())
+
+    @classmethod
+    def _row_constructor(cls, layout: tuple):
+        """
+        Returns a constructor that turns a row with the given column layout into an instance.
+        The code is generated (and cached) once per layout; it fills the slots straight from
+        the row (through the slot descriptors, bypassing the change tracking of __setattr__),
+        and columns missing from the layout (e.g. in a projection) are set to None.
+        Every call returns a fresh constructor: the rows it builds share one object per distinct
+        value of the get_repeated_columns(), so call it once per query.
+        """
+        make = cls._row_constructors.get(layout)
+        if make is not None:
+            return make()
+
+        columns = cls.get_columns()
+        repeated = [col for col in cls.get_repeated_columns() if col in layout]
+        positions = {col: i for i, col in enumerate(layout)}
+        body = "".join(
+            f"        value = row[{positions[col]}]\n        set_{col}(obj, share_{col}(value, value))\n" if col in repeated
+            else f"        set_{col}(obj, row[{positions[col]}])\n" if col in positions
+            else f"        set_{col}(obj, None)\n"
+            for col in columns)
+        shares = "".join(f"    share_{col} = {{}}.setdefault\n" for col in repeated)
+        source = (
+            "def make():\n"
+            f"{shares}"
+            "    def build(row):\n"
+            "        obj = new(cls)\n"
+            "        set_changed(obj, ())\n"
+            f"{body}"
+            "        return obj\n"
+            "    return build\n"
+        )
+        namespace = {"new": object.__new__, "cls": cls, "set_changed": BaseEntity._changed.__set__}
+        namespace.update({f"set_{col}": setter for col, setter in cls._slot_setters.items()})
+        exec(source, namespace)
+        make = cls._row_constructors[layout] = namespace["make"]
+        return make()
 
     @classmethod
     def _get_connection(cls):
         """
-        Internal helper: opens a connection to DB_PATH.
+        Internal helper: returns the current thread's pooled connection to DB_PATH.
         All class methods will call this instead of receiving a conn param.
+        The connection is long-lived and must not be closed by the caller.
+        """
+        return get_connection()
+
+    @classmethod
+    @contextmanager
+    def transaction(cls):
+        """
+        Groups several entity operations into one unit of work:
+
+            with BaseEntity.transaction():
+                time_range.add()
+                presence.add()
+
+        Every operation inside the block uses the same connection and the block commits once.
+        Scopes can be nested (inner scopes become savepoints); an exception raised inside
+        a scope rolls back everything done in that scope and is re-raised.
+        A rollback also clears the identity map (see cached()), which may hold rolled back rows.
+        """
+        try:
+            with transaction() as conn:
+                yield conn
+        except BaseException:
+            cache = active_cache()
+            if cache is not None:
+                cache.clear()
+            raise
+
+    @classmethod
+    @contextmanager
+    def bulk_load(cls):
+        """
+        Runs the enclosed block as one transaction with the per-row validation triggers
+        turned off, and checks the loaded data with set-based queries at the end (see bulk_load.py):
+
+            with BaseEntity.bulk_load():
+                Presence.add_many(presence_rows)
+
+        Raises bulk_load.IntegrityCheckError, after rolling the whole block back, on any violation.
+        """
+        with cls.transaction():
+            with bulk_load() as conn:
+                yield conn
+
+    @classmethod
+    def cached(cls, maxsize: int = ENTITY_CACHE_SIZE):
         """
-        return sqlite3.connect(DB_PATH)
+        Enables the identity map for the enclosed block:
+
+            with BaseEntity.cached() as cache:
+                ...
+                print(cache.stats())
+
+        Inside the block get_by_id() / get_many_by_ids() read every primary key from SQLite
+        at most once and return the same instance on later lookups; add/upsert/update/delete
+        drop the written key from the map. The map keeps at most 'maxsize' entities (LRU).
+        """
+        return entity_cache_scope(maxsize)
+
+    def _forget(self):
+        """Internal helper: drops this entity's primary key from the identity map (if one is active)."""
+        cache = active_cache()
+        if cache is not None:
+            cache.invalidate((self.get_table_name(),
+                              tuple(getattr(self, col, None) for col in self.get_primary_key_columns_names())))
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -58,6 +208,62 @@ class BaseEntity:
         """
         raise NotImplementedError("Subclasses must define the primary key columns.")
 
+    @classmethod
+    def get_generated_columns(cls):
+        """
+        Override in subclass to name the columns SQLite computes itself (GENERATED ALWAYS AS).
+        They are read like any other column but never written; add() and update() refresh
+        them from the statement's RETURNING clause.
+        """
+        return ()
+
+    @classmethod
+    def get_repeated_columns(cls):
+        """
+        Override in subclass to name the columns whose values repeat across many rows (entity
+        types, foreign keys, enumerations). The rows one query reads share one object per
+        distinct value of these columns instead of holding a copy each (see _row_constructor()).
+        """
+        return ()
+
+    @classmethod
+    def _writable_columns(cls) -> tuple:
+        """Internal helper: get_columns() without the generated columns."""
+        generated = cls.get_generated_columns()
+        return tuple(col for col in cls.get_columns() if col not in generated)
+
+    def _set_generated(self, row):
+        """Internal helper: stores the generated column values returned by a write statement."""
+        for col, value in zip(self.get_generated_columns(), row):
+            self._slot_setters[col](self, value)
+
+    @classmethod
+    def _reload_generated(cls, entities: list):
+        """
+        Internal helper: re-reads the generated columns of freshly written entities
+        (executemany() cannot return them). Single-column keys are matched in one query
+        that selects only the key and the generated columns; composite keys fall back to
+        a chunked get_many_by_ids() lookup.
+        """
+        generated = cls.get_generated_columns()
+        if not generated or not entities:
+            return
+        pk_cols = cls.get_primary_key_columns_names()
+        if len(pk_cols) == 1:
+            query, params = cls.query().columns(pk_cols[0], *generated) \
+                .where(pk_cols[0], "IN", [getattr(entity, pk_cols[0]) for entity in entities]).sql()
+            stored = {row[0]: row[1:] for row in cls._get_connection().execute(query, params)}
+            for entity in entities:
+                row = stored.get(getattr(entity, pk_cols[0]))
+                if row is not None:
+                    entity._set_generated(row)
+            return
+        stored = cls.get_many_by_ids([{col: getattr(entity, col) for col in pk_cols} for entity in entities])
+        for entity in entities:
+            row = stored.get(tuple(getattr(entity, col) for col in pk_cols))
+            if row is not None and row is not entity:
+                entity._set_generated([getattr(row, col) for col in generated])
+
     @classmethod
     def is_autoincrement(cls) -> bool:
         """
@@ -65,11 +271,32 @@ class BaseEntity:
         """
         return False
 
+    @classmethod
+    def get_schema(cls):
+        """
+        Returns the table's schema_catalog.TableSchema (declared column types, primary key,
+        UNIQUE columns and indexes as created in the database), or None if the table does not exist.
+        """
+        return get_table_schema(cls.get_table_name())
+
+    @classmethod
+    def get_by_unique_name(cls, name: str) -> Optional["BaseEntity"]:
+        """
+        Fetches a record by the value of the table's UNIQUE column (e.g. TeamName, RoleName, TaskName).
+        Returns an instance if found, or None if no match.
+        Raises ValueError for a table without a single-column UNIQUE constraint.
+        """
+        schema = cls.get_schema()
+        if schema is None or not schema.unique_columns:
+            raise ValueError(f"Table '{cls.get_table_name()}' has no UNIQUE column.")
+        return cls.query().where(schema.unique_columns[0], "=", name).first()
+
     @classmethod
     def get_by_id(cls, pk_dict: Dict[str, Any]) -> Optional["BaseEntity"]:
         """
         Fetches a single record by its primary key(s) and returns an instance of the subclass,
         or None if no matching record is found.
+        Inside a cached() block a key that was already read is served from the identity map.
 
         Because we don't pass conn, we open it internally.
         """
@@ -80,19 +307,113 @@ class BaseEntity:
         if set(pk_cols) != set(pk_dict.keys()):
             raise ValueError("Provided keys do not match primary key definition.")
 
-        with cls._get_connection() as conn:
-            cursor = conn.cursor()
-            where_clause = " AND ".join([f"{col} = ?" for col in pk_cols])
-            query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE {where_clause}"
-            pk_values_ordered = [pk_dict[col] for col in pk_cols]
-            cursor.execute(query, pk_values_ordered)
-            row = cursor.fetchone()
+        cache = active_cache()
+        if cache is not None:
+            cache_key = (table_name, tuple(pk_dict[col] for col in pk_cols))
+            cached_entity = cache.get(cache_key)
+            if cached_entity is not None:
+                return cached_entity
+
+        cursor = cls._get_connection().cursor()
+        where_clause = " AND ".join([f"{col} = ?" for col in pk_cols])
+        query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE {where_clause}"
+        pk_values_ordered = [pk_dict[col] for col in pk_cols]
+        cursor.execute(query, pk_values_ordered)
+        row = cursor.fetchone()
 
         if row:
-            data_dict = dict(zip(columns, row))
-            return cls(**data_dict)
+            entity = cls._row_constructor(columns)(row)
+            if cache is not None:
+                cache.put(cache_key, entity)
+            return entity
         return None
 
+    @classmethod
+    def get_many_by_ids(cls, pk_dicts: Iterable[Dict[str, Any]]) -> Dict[tuple, "BaseEntity"]:
+        """
+        Fetches many records by their primary key(s) with a few chunked queries,
+        instead of one get_by_id() round trip per key.
+        Single-column keys are matched with 'pk IN (...)'; composite keys are joined
+        against a VALUES list of the requested keys.
+        Inside a cached() block only the keys missing from the identity map are queried.
+
+        Args:
+            pk_dicts: Primary key dictionaries, in the same form get_by_id() accepts.
+
+        Returns:
+            dict: {pk values tuple (in get_primary_key_columns_names() order): instance}.
+                  Keys that do not exist in the table are simply absent.
+        """
+        table_name = cls.get_table_name()
+        columns = cls.get_columns()
+        pk_cols = cls.get_primary_key_columns_names()
+
+        keys = []
+        for pk_dict in pk_dicts:
+            if set(pk_cols) != set(pk_dict.keys()):
+                raise ValueError("Provided keys do not match primary key definition.")
+            keys.append(tuple(pk_dict[col] for col in pk_cols))
+        keys = list(dict.fromkeys(keys))
+
+        results = {}
+        cache = active_cache()
+        if cache is not None:
+            missing_keys = []
+            for key in keys:
+                cached_entity = cache.get((table_name, key))
+                if cached_entity is not None:
+                    results[key] = cached_entity
+                else:
+                    missing_keys.append(key)
+            keys = missing_keys
+
+        pk_indexes = [columns.index(col) for col in pk_cols]
+        build = cls._row_constructor(columns)
+        select_columns = ", ".join([f"t.{col}" for col in columns])
+        chunk_size = MAX_SQL_VARIABLES // len(pk_cols)
+        cursor = cls._get_connection().cursor()
+
+        for start in range(0, len(keys), chunk_size):
+            chunk = keys[start:start + chunk_size]
+            if len(pk_cols) == 1:
+                query = (f"SELECT {select_columns} FROM {table_name} AS t "
+                         f"WHERE t.{pk_cols[0]} IN ({', '.join(['?'] * len(chunk))})")
+            else:
+                row_placeholder = f"({', '.join(['?'] * len(pk_cols))})"
+                join_clause = " AND ".join([f"t.{col} = k.{col}" for col in pk_cols])
+                query = (f"WITH k({', '.join(pk_cols)}) AS (VALUES {', '.join([row_placeholder] * len(chunk))}) "
+                         f"SELECT {select_columns} FROM {table_name} AS t JOIN k ON {join_clause}")
+            cursor.execute(query, [value for key in chunk for value in key])
+            for row in cursor.fetchall():
+                key = tuple(row[i] for i in pk_indexes)
+                results[key] = entity = build(row)
+                if cache is not None:
+                    cache.put((table_name, key), entity)
+        return results
+
+    @classmethod
+    def query(cls) -> Query:
+        """
+        Starts a composable SELECT on this table (see query.py), e.g.:
+
+            TimeRange.query().where("StartDateTime", "<=", end).where("EndDateTime", ">=", start).all()
+            Role.query().where("RoleName", "=", name).first()
+        """
+        return Query(cls)
+
+    @classmethod
+    def overlapping(cls, start, end) -> list:
+        """
+        Returns the rows whose time range (TimeID column) overlaps [start, end], both ends included.
+        The lookup goes through the TimeRange R*Tree, so it does not scan the table.
+
+        Args:
+            start, end: datetimes or ISO 8601 strings; compared at minute precision.
+        Raises:
+            ValueError: if the table has no TimeID column.
+        """
+        return cls.query().overlapping(start, end).all()
+
     @classmethod
     def get_all(cls) -> list:
         """
@@ -102,13 +423,65 @@ class BaseEntity:
         table_name = cls.get_table_name()
         columns = cls.get_columns()
 
-        with cls._get_connection() as conn:
-            cursor = conn.cursor()
-            query = f"SELECT {', '.join(columns)} FROM {table_name}"
-            cursor.execute(query)
-            rows = cursor.fetchall()
+        cursor = cls._get_connection().cursor()
+        query = f"SELECT {', '.join(columns)} FROM {table_name}"
+        cursor.execute(query)
+        rows = cursor.fetchall()
 
-        return [cls(**dict(zip(columns, row))) for row in rows]
+        build = cls._row_constructor(columns)
+        return [build(row) for row in rows]
+
+    @classmethod
+    def _iter_query(cls, query: str, params: list, batch_size: int,
+                    layout: Optional[tuple] = None) -> Iterator["BaseEntity"]:
+        """
+        Internal helper: runs 'query' on its own cursor and yields one instance per row,
+        pulling 'batch_size' rows at a time with fetchmany(), so memory stays flat
+        no matter how many rows the query returns.
+        'layout' is the query's column order (all columns by default).
+        """
+        build = cls._row_constructor(layout or cls.get_columns())
+        cursor = cls._get_connection().cursor()
+        cursor.arraysize = batch_size
+        cursor.execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    return
+                yield from map(build, rows)
+        finally:
+            cursor.close()
+
+    @classmethod
+    def iter_all(cls, batch_size: int = FETCH_BATCH_SIZE) -> Iterator["BaseEntity"]:
+        """
+        Lazily yields every record of the table, 'batch_size' rows per fetch.
+        Use it instead of get_all() for large tables (TimeRange, Presence, TaskHistory).
+        Writing to the same table while iterating is not supported; collect what to change first.
+        """
+        query = f"SELECT {', '.join(cls.get_columns())} FROM {cls.get_table_name()}"
+        return cls._iter_query(query, [], batch_size)
+
+    @classmethod
+    def iter_by_columns(cls, filters: Dict[str, Any], batch_size: int = FETCH_BATCH_SIZE) -> Iterator["BaseEntity"]:
+        """
+        Lazily yields the records matching the given column-value pairs,
+        the streaming counterpart of get_all_by_columns_values().
+        Empty 'filters' match every row. Yields nothing (after printing an error)
+        if a filter column does not exist.
+        """
+        table_name = cls.get_table_name()
+        columns = cls.get_columns()
+        for column_name in filters.keys():
+            if column_name not in columns:
+                print(f"Error: Column '{column_name}' does not exist in table '{table_name}'.")
+                return iter(())
+
+        query = f"SELECT {', '.join(columns)} FROM {table_name}"
+        if filters:
+            query += " WHERE " + " AND ".join([f"{col} = ?" for col in filters.keys()])
+        return cls._iter_query(query, list(filters.values()), batch_size)
 
     @classmethod
     def get_column_values(cls, column_name: str) -> Optional[list]:
@@ -130,23 +503,22 @@ class BaseEntity:
             print(f"Error: Column '{column_name}' does not exist in table '{table_name}'.")
             return []
 
-        with cls._get_connection() as conn:
-            cursor = conn.cursor()
+        cursor = cls._get_connection().cursor()
 
-            try:
-                # Query to fetch all values from the specified column
-                query = f"SELECT {column_name} FROM {table_name}"
-                cursor.execute(query)
-                rows = cursor.fetchall()
-
-                if rows:
-                    # Return a flat list of values
-                    return [row[0] for row in rows]
-                else:
-                    return []
-            except sqlite3.Error as e:
-                print(f"Database error while retrieving column '{column_name}': {e}")
+        try:
+            # Query to fetch all values from the specified column
+            query = f"SELECT {column_name} FROM {table_name}"
+            cursor.execute(query)
+            rows = cursor.fetchall()
+
+            if rows:
+                # Return a flat list of values
+                return [row[0] for row in rows]
+            else:
                 return []
+        except sqlite3.Error as e:
+            print(f"Database error while retrieving column '{column_name}': {e}")
+            return []
 
     @classmethod
     def get_all_by_column_value(cls, column_name: str, value: Any) -> Optional[list]:
@@ -171,15 +543,14 @@ class BaseEntity:
             return None
 
         # 2) Construct and execute the query
-        with cls._get_connection() as conn:
-            cursor = conn.cursor()
-            query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE {column_name} = ?"
-            try:
-                cursor.execute(query, (value,))
-                rows = cursor.fetchall()
-            except sqlite3.Error as e:
-                print(f"Database error while filtering by column '{column_name}': {e}")
-                return None
+        cursor = cls._get_connection().cursor()
+        query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE {column_name} = ?"
+        try:
+            cursor.execute(query, (value,))
+            rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Database error while filtering by column '{column_name}': {e}")
+            return None
 
         # 3) If no rows, return None
         if not rows:
@@ -187,12 +558,8 @@ class BaseEntity:
             return None
 
         # 4) Convert rows to entity objects
-        results = []
-        for row in rows:
-            data_dict = dict(zip(columns, row))
-            results.append(cls(**data_dict))
-
-        return results
+        build = cls._row_constructor(columns)
+        return [build(row) for row in rows]
 
     @classmethod
     def get_all_by_columns_values(cls, filters: Dict[str, Any]) -> Optional[list]:
@@ -220,21 +587,21 @@ class BaseEntity:
         values = list(filters.values())
 
         # 3) Execute the query
-        with cls._get_connection() as conn:
-            cursor = conn.cursor()
-            query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE {where_clause}"
-            try:
-                cursor.execute(query, values)
-                rows = cursor.fetchall()
-            except sqlite3.Error as e:
-                print(f"Database error while filtering by columns {filters}: {e}")
-                return None
+        cursor = cls._get_connection().cursor()
+        query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE {where_clause}"
+        try:
+            cursor.execute(query, values)
+            rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Database error while filtering by columns {filters}: {e}")
+            return None
 
         # 4) Return results as entity instances
         if not rows:
             return []
 
-        return [cls(**dict(zip(columns, row))) for row in rows]
+        build = cls._row_constructor(columns)
+        return [build(row) for row in rows]
 
     def copy(self, copy_primary_keys: bool = True) -> "BaseEntity":
         """
@@ -250,27 +617,31 @@ class BaseEntity:
             copied according to the copy_primary_keys parameter.
         """
         # Create a blank instance of the same subclass (e.g., TimeRange, Soldier, etc.)
-        new_obj = type(self)()
-
-        columns = self.get_columns()
+        new_obj = type(self).__new__(type(self))
+        object.__setattr__(new_obj, "_changed", None)
         pk_cols = self.get_primary_key_columns_names()
 
-        for col in columns:
-            # If we do not want to copy PK, skip them
+        for col in self.get_columns():
+            # If we do not want to copy PK, blank them
             if not copy_primary_keys and col in pk_cols:
-                continue
-
-            # Retrieve the value from the current (self) object and set it on the new object
-            value = getattr(self, col, None)
-            setattr(new_obj, col, value)
-
+                setattr(new_obj, col, None)
+            else:
+                setattr(new_obj, col, getattr(self, col))
         return new_obj
 
+    def _is_primary_key_conflict(self, error: sqlite3.Error) -> bool:
+        """Returns True if 'error' is SQLite rejecting a duplicate primary key of this table."""
+        message = str(error)
+        return (isinstance(error, sqlite3.IntegrityError)
+                and message.startswith("UNIQUE constraint failed")
+                and all(f"{self.get_table_name()}.{col}" in message
+                        for col in self.get_primary_key_columns_names()))
 
     def add(self) -> Union["BaseEntity", None]:
         """
         Inserts a new row into the database.
         If autoincrement and single PK, updates self.pk_col with cursor.lastrowid.
+        A duplicate primary key is detected by the INSERT itself (no SELECT beforehand).
         """
         pk_cols = self.get_primary_key_columns_names()
         autoincrement = self.is_autoincrement() and (len(pk_cols) == 1)
@@ -281,36 +652,98 @@ class BaseEntity:
                 if getattr(self, pk_col, None) is None:
                     print(f"Add Error: Missing primary key value for '{pk_col}'.")
                     return None
-            # Check duplicates by PK
-            pk_dict = {col: getattr(self, col) for col in pk_cols}
-            existing = type(self).get_by_id(pk_dict)
-            if existing is not None:
-                print("Add Error: A record with these primary key values already exists.")
-                print(pk_dict)
-                return None
 
         table_name = self.get_table_name()
-        columns = self.get_columns()
+        columns = self._writable_columns()
+        generated = self.get_generated_columns()
         values = [getattr(self, col, None) for col in columns]
 
         placeholders = ", ".join(["?"] * len(columns))
         query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+        if generated:
+            query += f" RETURNING {', '.join(generated)}"
 
+        self._forget()
         try:
-            with self._get_connection() as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, values)
-                conn.commit()
+                if generated:
+                    self._set_generated(cursor.fetchone())
                 if autoincrement:
                     setattr(self, pk_cols[0], cursor.lastrowid)
+            self._mark_clean()
             return self
         except sqlite3.Error as e:
-            print(f"Add Error: {e}")
+            if self._is_primary_key_conflict(e):
+                print("Add Error: A record with these primary key values already exists.")
+                print({col: getattr(self, col) for col in pk_cols})
+            else:
+                print(f"Add Error: {e}")
+            return None
+
+    def upsert(self) -> Union["BaseEntity", None]:
+        """
+        Inserts the row, or - if a row with the same primary key already exists -
+        updates its non-key columns, in a single INSERT ... ON CONFLICT DO UPDATE statement.
+        Tables whose columns are all part of the primary key use ON CONFLICT DO NOTHING.
+        An autoincrement row without a PK value is simply inserted.
+        """
+        pk_cols = self.get_primary_key_columns_names()
+        autoincrement = self.is_autoincrement() and (len(pk_cols) == 1)
+        if autoincrement and getattr(self, pk_cols[0], None) is None:
+            return self.add()
+
+        for pk_col in pk_cols:
+            if getattr(self, pk_col, None) is None:
+                print(f"Upsert Error: Missing primary key value for '{pk_col}'.")
+                return None
+
+        table_name = self.get_table_name()
+        columns = self._writable_columns()
+        generated = self.get_generated_columns()
+        non_pk_cols = [col for col in columns if col not in pk_cols]
+        values = [getattr(self, col, None) for col in columns]
+
+        placeholders = ", ".join(["?"] * len(columns))
+        if non_pk_cols:
+            conflict_action = "UPDATE SET " + ", ".join([f"{col} = excluded.{col}" for col in non_pk_cols])
+        else:
+            conflict_action = "NOTHING"
+        query = (f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders}) "
+                 f"ON CONFLICT ({', '.join(pk_cols)}) DO {conflict_action}")
+        if generated:
+            query += f" RETURNING {', '.join(generated)}"
+
+        self._forget()
+        try:
+            with self.transaction() as conn:
+                row = conn.execute(query, values).fetchone()
+                if generated and row:
+                    self._set_generated(row)
+            self._mark_clean()
+            return self
+        except sqlite3.Error as e:
+            print(f"Upsert Error: {e}")
             return None
 
+    def _columns_to_write(self) -> tuple:
+        """
+        Internal helper: the non-key columns update() has to write -
+        the changed ones for a loaded instance, all of them otherwise.
+        """
+        pk_cols = self.get_primary_key_columns_names()
+        changed = self._changed
+        return tuple(col for col in self._writable_columns()
+                     if col not in pk_cols and (changed is None or col in changed))
+
     def update(self) -> Union["BaseEntity", None]:
         """
         Updates the existing record in the database.
+        Only the columns changed since the instance was loaded are written, so the
+        BEFORE UPDATE triggers of untouched columns do not run; if nothing changed,
+        no statement is executed at all.
+        A missing record is detected from the UPDATE's rowcount (no SELECT beforehand).
         """
         pk_cols = self.get_primary_key_columns_names()
         for pk_col in pk_cols:
@@ -318,36 +751,43 @@ class BaseEntity:
                 print(f"Update Error: Missing primary key value for '{pk_col}'.")
                 return None
 
-        # Check if record exists
-        pk_dict = {col: getattr(self, col) for col in pk_cols}
-        existing = type(self).get_by_id(pk_dict)
-        if existing is None:
-            print("Update Error: No existing record found with these primary key values.")
-            return None
-
-        table_name = self.get_table_name()
-        columns = self.get_columns()
+        set_cols = self._columns_to_write()
+        if not set_cols:
+            return self
 
-        set_clause = ", ".join([f"{col} = ?" for col in columns if col not in pk_cols])
+        set_clause = ", ".join([f"{col} = ?" for col in set_cols])
         where_clause = " AND ".join([f"{col} = ?" for col in pk_cols])
-        query = f"UPDATE {table_name} SET {set_clause} WHERE {where_clause}"
+        query = f"UPDATE {self.get_table_name()} SET {set_clause} WHERE {where_clause}"
+        generated = self.get_generated_columns()
+        if generated:
+            query += f" RETURNING {', '.join(generated)}"
 
-        non_pk_values = [getattr(self, col) for col in columns if col not in pk_cols]
+        non_pk_values = [getattr(self, col) for col in set_cols]
         pk_values = [getattr(self, col) for col in pk_cols]
 
+        self._forget()
         try:
-            with self._get_connection() as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, non_pk_values + pk_values)
-                conn.commit()
-            return self
+                if generated:
+                    row = cursor.fetchone()
+                    if row:
+                        self._set_generated(row)
         except sqlite3.Error as e:
             print(f"Update Error: {e}")
             return None
 
+        if cursor.rowcount == 0:
+            print("Update Error: No existing record found with these primary key values.")
+            return None
+        self._mark_clean()
+        return self
+
     def delete(self) -> Union["BaseEntity", None]:
         """
         Deletes the record from the database based on the primary key.
+        Returns None if no record with these primary key values exists (detected from the rowcount).
         """
         pk_cols = self.get_primary_key_columns_names()
         pk_values = [getattr(self, col, None) for col in pk_cols]
@@ -359,12 +799,196 @@ class BaseEntity:
         where_clause = " AND ".join([f"{col} = ?" for col in pk_cols])
         query = f"DELETE FROM {table_name} WHERE {where_clause}"
 
+        self._forget()
         try:
-            with self._get_connection() as conn:
+            with self.transaction() as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, pk_values)
-                conn.commit()
-            return self
         except sqlite3.Error as e:
             print(f"Delete Error: {e}")
-            return None
\ No newline at end of file
+            return None
+
+        if cursor.rowcount == 0:
+            print("Delete Error: No existing record found with these primary key values.")
+            return None
+        return self
+
+    ######################## Bulk operations ########################
+
+    @classmethod
+    def _run_bulk(cls, cursor, query: str, params: list, row_indexes: list, results: list,
+                  entities: list, action: str, autoincrement_col: Optional[str] = None):
+        """
+        Internal helper for the bulk methods (runs inside the caller's transaction).
+        Runs 'query' for every params entry with a single executemany() inside a savepoint.
+        If the batch fails, or touches fewer rows than expected (update/delete of a missing row),
+        it is rolled back and replayed row by row, each row in its own savepoint,
+        so every row gets its own result in 'results' (the entity, or None on failure).
+        """
+        if not params:
+            return
+
+        for i in row_indexes:
+            entities[i]._forget()
+        try:
+            with cls.transaction():
+                cursor.executemany(query, params)
+                if action != "Add" and cursor.rowcount != len(params):
+                    raise LookupError
+                if autoincrement_col:
+                    # executemany() runs the INSERT once per row. No other connection can write during
+                    # this transaction, so the rows got consecutive ids ending at last_insert_rowid().
+                    # The row-by-row fallback below reads each id from lastrowid instead.
+                    last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                    for row_id, i in enumerate(row_indexes, start=last_id - len(row_indexes) + 1):
+                        setattr(entities[i], autoincrement_col, row_id)
+        except (sqlite3.Error, LookupError):
+            pass
+        else:
+            for i in row_indexes:
+                results[i] = entities[i]
+                if action != "Delete":
+                    entities[i]._mark_clean()
+            return
+
+        for i, row_params in zip(row_indexes, params):
+            try:
+                with cls.transaction():
+                    cursor.execute(query, row_params)
+            except sqlite3.Error as e:
+                print(f"{action} Error: {e} ({entities[i]})")
+                continue
+            if action != "Add" and cursor.rowcount == 0:
+                print(f"{action} Error: No existing record found for {entities[i]}.")
+                continue
+            if autoincrement_col:
+                setattr(entities[i], autoincrement_col, cursor.lastrowid)
+            results[i] = entities[i]
+            if action != "Delete":
+                entities[i]._mark_clean()
+
+    @classmethod
+    def add_many(cls, entities: list) -> list:
+        """
+        Inserts many rows of this table in one transaction, using executemany().
+        Rows of an AUTOINCREMENT table without a PK value get their generated id filled in.
+
+        Returns:
+            list: One result per input row, in the same order:
+                  the entity if it was inserted, or None if it failed.
+        """
+        entities = list(entities)
+        results = [None] * len(entities)
+        pk_cols = cls.get_primary_key_columns_names()
+        autoincrement = cls.is_autoincrement() and (len(pk_cols) == 1)
+        columns = cls._writable_columns()
+        non_pk_cols = [col for col in columns if col not in pk_cols]
+
+        explicit_rows, generated_rows = [], []
+        for i, entity in enumerate(entities):
+            if autoincrement and getattr(entity, pk_cols[0], None) is None:
+                generated_rows.append(i)
+            elif any(getattr(entity, pk_col, None) is None for pk_col in pk_cols):
+                print(f"Add Error: Missing primary key value(s) for {entity}.")
+            else:
+                explicit_rows.append(i)
+
+        table_name = cls.get_table_name()
+        explicit_query = (f"INSERT INTO {table_name} ({', '.join(columns)}) "
+                          f"VALUES ({', '.join(['?'] * len(columns))})")
+        generated_query = (f"INSERT INTO {table_name} ({', '.join(non_pk_cols)}) "
+                           f"VALUES ({', '.join(['?'] * len(non_pk_cols))})")
+
+        try:
+            with cls.transaction() as conn:
+                cursor = conn.cursor()
+                cls._run_bulk(cursor, explicit_query,
+                              [[getattr(entities[i], col, None) for col in columns] for i in explicit_rows],
+                              explicit_rows, results, entities, "Add")
+                cls._run_bulk(cursor, generated_query,
+                              [[getattr(entities[i], col, None) for col in non_pk_cols] for i in generated_rows],
+                              generated_rows, results, entities, "Add",
+                              autoincrement_col=pk_cols[0] if autoincrement else None)
+                cls._reload_generated([entity for entity in results if entity is not None])
+        except sqlite3.Error as e:
+            print(f"Add Error: {e}")
+            return [None] * len(entities)
+        return results
+
+    @classmethod
+    def update_many(cls, entities: list) -> list:
+        """
+        Updates many existing rows of this table in one transaction, using executemany().
+        As in update(), only changed columns are written: rows are grouped by the set of
+        columns they changed (one executemany() per group), and unchanged rows are skipped.
+
+        Returns:
+            list: One result per input row, in the same order:
+                  the entity if its row was updated, or None if it is missing or failed.
+        """
+        entities = list(entities)
+        results = [None] * len(entities)
+        pk_cols = cls.get_primary_key_columns_names()
+        non_pk_cols = [col for col in cls._writable_columns() if col not in pk_cols]
+        if not non_pk_cols:
+            print(f"Update Error: Table '{cls.get_table_name()}' has no non-key columns to update.")
+            return results
+
+        groups = {}
+        for i, entity in enumerate(entities):
+            if any(getattr(entity, pk_col, None) is None for pk_col in pk_cols):
+                print(f"Update Error: Missing primary key value(s) for {entity}.")
+                continue
+            set_cols = entity._columns_to_write()
+            if set_cols:
+                groups.setdefault(set_cols, []).append(i)
+            else:
+                results[i] = entity
+
+        where_clause = " AND ".join([f"{col} = ?" for col in pk_cols])
+        try:
+            with cls.transaction() as conn:
+                cursor = conn.cursor()
+                for set_cols, rows in groups.items():
+                    set_clause = ", ".join([f"{col} = ?" for col in set_cols])
+                    query = f"UPDATE {cls.get_table_name()} SET {set_clause} WHERE {where_clause}"
+                    params = [[getattr(entities[i], col) for col in set_cols] +
+                              [getattr(entities[i], col) for col in pk_cols] for i in rows]
+                    cls._run_bulk(cursor, query, params, rows, results, entities, "Update")
+                cls._reload_generated([entities[i] for rows in groups.values() for i in rows if results[i] is not None])
+        except sqlite3.Error as e:
+            print(f"Update Error: {e}")
+            return [None] * len(entities)
+        return results
+
+    @classmethod
+    def delete_many(cls, entities: list) -> list:
+        """
+        Deletes many rows of this table (by primary key) in one transaction, using executemany().
+
+        Returns:
+            list: One result per input row, in the same order:
+                  the entity if its row was deleted, or None if it is missing or failed.
+        """
+        entities = list(entities)
+        results = [None] * len(entities)
+        pk_cols = cls.get_primary_key_columns_names()
+
+        rows = []
+        for i, entity in enumerate(entities):
+            if any(getattr(entity, pk_col, None) is None for pk_col in pk_cols):
+                print(f"Delete Error: Missing primary key value(s) for {entity}.")
+            else:
+                rows.append(i)
+
+        where_clause = " AND ".join([f"{col} = ?" for col in pk_cols])
+        query = f"DELETE FROM {cls.get_table_name()} WHERE {where_clause}"
+        params = [[getattr(entities[i], col) for col in pk_cols] for i in rows]
+
+        try:
+            with cls.transaction() as conn:
+                cls._run_bulk(conn.cursor(), query, params, rows, results, entities, "Delete")
+        except sqlite3.Error as e:
+            print(f"Delete Error: {e}")
+            return [None] * len(entities)
+        return results
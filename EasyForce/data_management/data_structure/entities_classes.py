@@ -4,15 +4,20 @@ entities_classes.py
 Contains classes representing the main entity tables, each inheriting from BaseEntity,
 with typed attributes and without parentheses when returning tuples.
 """
-from datetime import datetime,timedelta
 
 from EasyForce.common.constants import UNNECESSARILY_TIME_RANGE
 from EasyForce.data_management.data_structure.data_modification import BaseEntity
+from EasyForce.data_management.data_structure.entity_cache import active_cache
 
 class TimeRange(BaseEntity):
-    TimeID: int = None
-    StartDateTime: str = None
-    EndDateTime: str = None
+    __slots__ = ("TimeID", "StartDateTime", "EndDateTime", "StartMinute", "EndMinute")
+
+    TimeID: int
+    StartDateTime: str
+    EndDateTime: str
+    # Generated by SQLite from the two ISO strings: whole minutes since the epoch
+    StartMinute: int
+    EndMinute: int
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -20,7 +25,11 @@ class TimeRange(BaseEntity):
 
     @classmethod
     def get_columns(cls):
-        return "TimeID", "StartDateTime", "EndDateTime"
+        return "TimeID", "StartDateTime", "EndDateTime", "StartMinute", "EndMinute"
+
+    @classmethod
+    def get_generated_columns(cls):
+        return "StartMinute", "EndMinute"
 
     @classmethod
     def get_primary_key_columns_names(cls):
@@ -30,20 +39,42 @@ class TimeRange(BaseEntity):
     def is_autoincrement(cls) -> bool:
         return True
     @classmethod
-    def garbage_collector(cls):
-        from EasyForce.data_management.data_structure.relationships_classes import Presence, CurrentTaskAssignment, TaskHistory
-
-        presence_table_time_ids = Presence.get_column_values("TimeID")
-        current_task_assignment_table_time_ids = CurrentTaskAssignment.get_column_values("TimeID")
-        task_history_table_time_ids = TaskHistory.get_column_values("TimeID")
-        unified_time_ids = set(presence_table_time_ids) | set(current_task_assignment_table_time_ids) | set(task_history_table_time_ids)
-        time_range_rows = TimeRange.get_all()
-        for row in time_range_rows:
-            if (row.TimeID not in unified_time_ids or
-                    (datetime.fromisoformat(row.EndDateTime).replace(microsecond=0) -
-                     datetime.fromisoformat(row.StartDateTime).replace(microsecond=0)) <
-                     timedelta(minutes=UNNECESSARILY_TIME_RANGE)):
-                row.delete()
+    def garbage_collector(cls, batch_size: int = None, max_batches: int = None) -> int:
+        """
+        Deletes the time ranges no Presence, CurrentTaskAssignment or TaskHistory row uses,
+        and the ranges shorter than UNNECESSARILY_TIME_RANGE minutes, with one set-based DELETE.
+
+        Args:
+            batch_size: Delete at most this many rows per statement, each batch in its own
+                        transaction, so a large cleanup never holds the write lock for long.
+                        None deletes everything in one statement.
+            max_batches: Stop after this many batches (incremental cleanup); None runs until done.
+        Returns:
+            int: The number of deleted time ranges.
+        """
+        candidates = f"""
+            SELECT TimeID FROM TimeRange AS t
+            WHERE (NOT EXISTS (SELECT 1 FROM Presence WHERE TimeID = t.TimeID)
+                   AND NOT EXISTS (SELECT 1 FROM CurrentTaskAssignment WHERE TimeID = t.TimeID)
+                   AND NOT EXISTS (SELECT 1 FROM TaskHistory WHERE TimeID = t.TimeID))
+               OR t.EndMinute - t.StartMinute < ?
+            {"LIMIT ?" if batch_size else ""}"""
+        params = (UNNECESSARILY_TIME_RANGE, batch_size) if batch_size else (UNNECESSARILY_TIME_RANGE,)
+        query = f"DELETE FROM TimeRange WHERE TimeID IN ({candidates}) RETURNING TimeID"
+
+        deleted = batches = 0
+        cache = active_cache()
+        while max_batches is None or batches < max_batches:
+            with cls.transaction() as conn:
+                time_ids = conn.execute(query, params).fetchall()
+            if cache is not None:
+                for time_id in time_ids:
+                    cache.invalidate((cls.get_table_name(), time_id))
+            deleted += len(time_ids)
+            batches += 1
+            if not batch_size or len(time_ids) < batch_size:
+                break
+        return deleted
 
     def __repr__(self):
         return (
@@ -54,8 +85,10 @@ class TimeRange(BaseEntity):
 
 
 class Team(BaseEntity):
-    TeamID: int = None
-    TeamName: str = None
+    __slots__ = ("TeamID", "TeamName")
+
+    TeamID: int
+    TeamName: str
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -73,26 +106,6 @@ class Team(BaseEntity):
     def is_autoincrement(cls) -> bool:
         return True
 
-    @classmethod
-    def get_by_unique_name(cls, team_name: str):
-        """
-        Fetches a Team by its unique TeamName.
-        Returns a Team instance if found, or None if no match.
-        """
-        columns = cls.get_columns()
-        table_name = cls.get_table_name()
-
-        with cls._get_connection() as conn:
-            cursor = conn.cursor()
-            query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE TeamName = ?"
-            cursor.execute(query, (team_name,))
-            row = cursor.fetchone()
-
-        if row:
-            data_dict = dict(zip(columns, row))
-            return cls(**data_dict)
-        return None
-
     def __repr__(self):
         return (
             f"<Team(TeamID={getattr(self, 'TeamID', None)}, "
@@ -101,9 +114,11 @@ class Team(BaseEntity):
 
 
 class Soldier(BaseEntity):
-    SoldierID: int = None
-    FullName: str= None
-    TeamID: int= None
+    __slots__ = ("SoldierID", "FullName", "TeamID")
+
+    SoldierID: int
+    FullName: str
+    TeamID: int
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -117,6 +132,10 @@ class Soldier(BaseEntity):
     def get_primary_key_columns_names(cls):
         return "SoldierID",
 
+    @classmethod
+    def get_repeated_columns(cls):
+        return "TeamID",
+
     @classmethod
     def is_autoincrement(cls) -> bool:
         return False
@@ -130,8 +149,10 @@ class Soldier(BaseEntity):
 
 
 class Role(BaseEntity):
-    RoleID: int= None
-    RoleName: str= None
+    __slots__ = ("RoleID", "RoleName")
+
+    RoleID: int
+    RoleName: str
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -149,26 +170,6 @@ class Role(BaseEntity):
     def is_autoincrement(cls) -> bool:
         return True
 
-    @classmethod
-    def get_by_unique_name(cls, role_name: str):
-        """
-        Fetches a Role by its unique RoleName.
-        Returns a Role instance if found, or None if no match.
-        """
-        columns = cls.get_columns()
-        table_name = cls.get_table_name()
-
-        with cls._get_connection() as conn:
-            cursor = conn.cursor()
-            query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE RoleName = ?"
-            cursor.execute(query, (role_name,))
-            row = cursor.fetchone()
-
-        if row:
-            data_dict = dict(zip(columns, row))
-            return cls(**data_dict)
-        return None
-
     def __repr__(self):
         return (
             f"<Role(RoleID={getattr(self, 'RoleID', None)}, "
@@ -177,9 +178,11 @@ class Role(BaseEntity):
 
 
 class TemporaryTask(BaseEntity):
-    TaskID: int= None
-    TaskName: str= None
-    TaskReputation: str= None
+    __slots__ = ("TaskID", "TaskName", "TaskReputation")
+
+    TaskID: int
+    TaskName: str
+    TaskReputation: str
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -194,28 +197,12 @@ class TemporaryTask(BaseEntity):
         return "TaskID",
 
     @classmethod
-    def is_autoincrement(cls) -> bool:
-        return True
+    def get_repeated_columns(cls):
+        return "TaskReputation",
 
     @classmethod
-    def get_by_unique_name(cls, task_name: str) :
-        """
-        Fetches a TemporaryTask by its unique TaskName.
-        Returns a TemporaryTask instance if found, or None if no match.
-        """
-        columns = cls.get_columns()
-        table_name = cls.get_table_name()
-
-        with cls._get_connection() as conn:
-            cursor = conn.cursor()
-            query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE TaskName = ?"
-            cursor.execute(query, (task_name,))
-            row = cursor.fetchone()
-
-        if row:
-            data_dict = dict(zip(columns, row))
-            return cls(**data_dict)
-        return None
+    def is_autoincrement(cls) -> bool:
+        return True
 
     def __repr__(self):
         return (
@@ -226,12 +213,14 @@ class TemporaryTask(BaseEntity):
 
 
 class RecurringTask(BaseEntity):
-    TaskID: int= None
-    TaskName: str= None
-    ShiftDurationInMinutes: int= None
-    EveryDayStartTime: str= None
-    EveryDayEndTime: str= None
-    RequiredPersonnel: int= None
+    __slots__ = ("TaskID", "TaskName", "ShiftDurationInMinutes", "EveryDayStartTime", "EveryDayEndTime", "RequiredPersonnel")
+
+    TaskID: int
+    TaskName: str
+    ShiftDurationInMinutes: int
+    EveryDayStartTime: str
+    EveryDayEndTime: str
+    RequiredPersonnel: int
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -249,26 +238,6 @@ class RecurringTask(BaseEntity):
     def is_autoincrement(cls) -> bool:
         return True
 
-    @classmethod
-    def get_by_unique_name(cls, task_name: str):
-        """
-        Fetches a RecurringTask by its unique TaskName.
-        Returns a RecurringTask instance if found, or None if no match.
-        """
-        columns = cls.get_columns()
-        table_name = cls.get_table_name()
-
-        with cls._get_connection() as conn:
-            cursor = conn.cursor()
-            query = f"SELECT {', '.join(columns)} FROM {table_name} WHERE TaskName = ?"
-            cursor.execute(query, (task_name,))
-            row = cursor.fetchone()
-
-        if row:
-            data_dict = dict(zip(columns, row))
-            return cls(**data_dict)
-        return None
-
     def __repr__(self):
         return (
             f"<RecurringTask(TaskID={getattr(self, 'TaskID', None)}, "
@@ -0,0 +1,90 @@
+"""
+entity_cache.py
+
+Optional identity map for BaseEntity primary-key lookups.
+
+Inside an entity_cache_scope() (BaseEntity.cached()), get_by_id() and get_many_by_ids()
+first look up (table name, primary key values) in an LRU map of the current thread,
+and only the keys that are not there are read from SQLite. Every add/upsert/update/delete
+of an entity drops its key from the map, and a rolled back transaction clears the whole map,
+so a cached entity matches what the current thread's connection would read.
+Lookups return the shared instance: changes made to it without saving them
+are seen by later lookups in the same scope.
+
+Outside a scope there is no cache and every lookup goes to the database.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from EasyForce.common.constants import ENTITY_CACHE_SIZE
+
+_local = threading.local()
+
+
+class EntityCache:
+    """
+    A size-bounded LRU map of (table name, primary key values tuple) -> entity instance,
+    with hit/miss counters.
+    """
+
+    def __init__(self, maxsize: int = ENTITY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: tuple):
+        """Returns the cached entity for 'key' (counting a hit), or None (counting a miss)."""
+        entity = self._entries.get(key)
+        if entity is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entity
+
+    def put(self, key: tuple, entity):
+        self._entries[key] = entity
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: tuple):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+def active_cache():
+    """Returns the current thread's EntityCache, or None outside entity_cache_scope()."""
+    return getattr(_local, "cache", None)
+
+
+@contextmanager
+def entity_cache_scope(maxsize: int = ENTITY_CACHE_SIZE):
+    """
+    Enables the identity map for the enclosed block (e.g. one menu flow or one scheduler run).
+    A nested scope shares the outer scope's cache. The cache is dropped when the outermost scope ends.
+
+    Yields:
+        EntityCache: the active cache, for reading its hit/miss counters.
+    """
+    outer = active_cache()
+    if outer is not None:
+        yield outer
+        return
+
+    _local.cache = EntityCache(maxsize)
+    try:
+        yield _local.cache
+    finally:
+        _local.cache = None
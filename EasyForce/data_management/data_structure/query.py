@@ -0,0 +1,167 @@
+"""
+query.py
+
+A small composable SELECT builder for BaseEntity subclasses, so filtering, ordering and
+paging run inside SQLite instead of fetching every row and filtering it in Python.
+
+    TimeRange.query().where("StartDateTime", "<=", end).where("EndDateTime", ">=", start).all()
+    Role.query().where("RoleName", "=", name).first()
+    Soldier.query().where("TeamID", "IN", team_ids).order_by("FullName").limit(20).all()
+    Presence.query().columns("TimeID").where("isActive", "=", 1).iter()
+    Presence.query().where("isActive", "=", 1).overlapping(start, end).all()
+
+Every builder method returns a new Query, so a partial query can be kept and refined.
+Column names and operators are validated against the entity; values are always bound parameters.
+"""
+
+import json
+import sqlite3
+from typing import Any, Iterator, Optional
+
+from EasyForce.common.constants import MAX_SQL_VARIABLES, FETCH_BATCH_SIZE, TIME_RANGE_RTREE
+from EasyForce.common.utils import to_epoch_minutes
+
+OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "LIKE", "IS", "IS NOT", "IN", "NOT IN", "BETWEEN")
+
+
+class Query:
+    """
+    A SELECT over one entity table. Build it with BaseEntity.query(), refine it with
+    where() / overlapping() / order_by() / limit() / columns(), then run it with all(), first(), iter(),
+    exists() or count().
+    """
+
+    def __init__(self, entity_cls):
+        self._entity_cls = entity_cls
+        self._layout = tuple(entity_cls.get_columns())
+        self._conditions = ()
+        self._params = ()
+        self._order = ()
+        self._limit = None
+        self._offset = None
+
+    def _refine(self, **changes) -> "Query":
+        query = object.__new__(Query)
+        query.__dict__.update(self.__dict__)
+        query.__dict__.update(changes)
+        return query
+
+    def _check_column(self, column: str):
+        if column not in self._entity_cls.get_columns():
+            raise ValueError(f"Column '{column}' does not exist in table '{self._entity_cls.get_table_name()}'.")
+
+    ######################## Building ########################
+
+    def where(self, column: str, op: str, value: Any = None) -> "Query":
+        """
+        Adds a condition; all conditions are combined with AND.
+
+        Args:
+            column: A column of the entity.
+            op: One of OPERATORS. 'IN' / 'NOT IN' take an iterable of values,
+                'BETWEEN' takes a (low, high) pair (both ends included).
+            value: The value to compare with.
+        """
+        self._check_column(column)
+        op = op.upper()
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported operator '{op}'. Use one of: {', '.join(OPERATORS)}.")
+
+        if op in ("IN", "NOT IN"):
+            values = list(value)
+            if len(values) > MAX_SQL_VARIABLES:
+                # A long list is passed as one JSON parameter instead of one parameter per value;
+                # values JSON cannot hold (e.g. datetimes) go through sqlite3's adapters, as bound ones do
+                condition, params = f"{column} {op} (SELECT value FROM json_each(?))", (json.dumps(values, default=sqlite3.adapt),)
+            else:
+                condition, params = f"{column} {op} ({', '.join(['?'] * len(values))})", tuple(values)
+        elif op == "BETWEEN":
+            low, high = value
+            condition, params = f"{column} BETWEEN ? AND ?", (low, high)
+        else:
+            condition, params = f"{column} {op} ?", (value,)
+        return self._refine(_conditions=self._conditions + (condition,), _params=self._params + params)
+
+    def overlapping(self, start, end, time_column: str = "TimeID") -> "Query":
+        """
+        Keeps the rows whose time range overlaps [start, end] (both ends included), found
+        through the TimeRange R*Tree instead of comparing every range.
+
+        Args:
+            start, end: datetimes or ISO 8601 strings; compared at minute precision.
+            time_column: The column holding the TimeRange id.
+        """
+        self._check_column(time_column)
+        condition = (f"{time_column} IN (SELECT TimeID FROM {TIME_RANGE_RTREE} "
+                     f"WHERE StartMinute <= ? AND EndMinute >= ?)")
+        params = (to_epoch_minutes(end), to_epoch_minutes(start))
+        return self._refine(_conditions=self._conditions + (condition,), _params=self._params + params)
+
+    def order_by(self, column: str, descending: bool = False) -> "Query":
+        """Adds a sort key; keys apply in the order they were added."""
+        self._check_column(column)
+        return self._refine(_order=self._order + (f"{column} {'DESC' if descending else 'ASC'}",))
+
+    def limit(self, count: int, offset: int = 0) -> "Query":
+        """Returns at most 'count' rows, skipping the first 'offset' rows."""
+        return self._refine(_limit=count, _offset=offset)
+
+    def columns(self, *columns: str) -> "Query":
+        """
+        Selects only the given columns. The other columns of the returned instances are None,
+        so a projected instance should not be passed to update().
+        """
+        for column in columns:
+            self._check_column(column)
+        return self._refine(_layout=tuple(columns))
+
+    ######################## SQL ########################
+
+    def _where_sql(self) -> str:
+        return f" WHERE {' AND '.join(self._conditions)}" if self._conditions else ""
+
+    def _select_sql(self, select_list: str) -> tuple:
+        sql = f"SELECT {select_list} FROM {self._entity_cls.get_table_name()}{self._where_sql()}"
+        params = list(self._params)
+        if self._order:
+            sql += f" ORDER BY {', '.join(self._order)}"
+        if self._limit is not None or self._offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [self._limit if self._limit is not None else -1, self._offset or 0]
+        return sql, params
+
+    def sql(self) -> tuple:
+        """Returns the (SELECT statement, parameters) this query runs; useful for debugging."""
+        return self._select_sql(", ".join(self._layout))
+
+    ######################## Running ########################
+
+    def all(self) -> list:
+        """Returns every matching row as an entity instance."""
+        query, params = self.sql()
+        cursor = self._entity_cls._get_connection().cursor()
+        cursor.execute(query, params)
+        build = self._entity_cls._row_constructor(self._layout)
+        return [build(row) for row in cursor.fetchall()]
+
+    def first(self) -> Optional[Any]:
+        """Returns the first matching row (in ORDER BY order, if given), or None."""
+        query, params = self.limit(1, self._offset or 0).sql()
+        row = self._entity_cls._get_connection().execute(query, params).fetchone()
+        return self._entity_cls._row_constructor(self._layout)(row) if row else None
+
+    def iter(self, batch_size: int = FETCH_BATCH_SIZE) -> Iterator[Any]:
+        """Lazily yields the matching rows, 'batch_size' rows per fetch."""
+        query, params = self.sql()
+        return self._entity_cls._iter_query(query, params, batch_size, self._layout)
+
+    def exists(self) -> bool:
+        """Returns True if at least one row matches; SQLite stops at the first match."""
+        query, params = self._select_sql("1")
+        row = self._entity_cls._get_connection().execute(f"SELECT EXISTS ({query})", params).fetchone()
+        return bool(row[0])
+
+    def count(self) -> int:
+        """Returns the number of matching rows (after limit/offset, if given)."""
+        query, params = self._select_sql("1")
+        return self._entity_cls._get_connection().execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
@@ -3,19 +3,22 @@ relationships_classes.py
 
 Relationship (bridge) tables, also only calling .add(), .delete(), etc. internally.
 """
+import sqlite3
 from typing import Union
 
-from EasyForce.common.constants import PRESENCE_TABLE, TIME_RANGE_TABLE
+from EasyForce.common.constants import SOLDIER_TABLE
 from EasyForce.data_management.data_structure.data_modification import BaseEntity
 from EasyForce.data_management.data_structure.entities_classes import TimeRange
-from EasyForce.data_management.read_db import display_table
+from EasyForce.data_processing.interval_set import Interval, IntervalSet, diff
 
 
 class Presence(BaseEntity):
-    SoldierTeamTaskType: str= None
-    SoldierTeamTaskID: int= None
-    TimeID: int= None
-    isActive: int= None
+    __slots__ = ("SoldierTeamTaskType", "SoldierTeamTaskID", "TimeID", "isActive")
+
+    SoldierTeamTaskType: str
+    SoldierTeamTaskID: int
+    TimeID: int
+    isActive: int
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -29,6 +32,10 @@ class Presence(BaseEntity):
     def get_primary_key_columns_names(cls):
         return "SoldierTeamTaskType", "SoldierTeamTaskID", "TimeID"
 
+    @classmethod
+    def get_repeated_columns(cls):
+        return "SoldierTeamTaskType", "SoldierTeamTaskID"
+
     @classmethod
     def is_autoincrement(cls) -> bool:
         return False
@@ -41,72 +48,107 @@ class Presence(BaseEntity):
             f"isActive={getattr(self, 'isActive', None)})>"
         )
 
-    def add(self) -> Union["BaseEntity", None]:
-        def get_time_id(start_time,end_time):
-            same_time_range = TimeRange.get_all_by_columns_values({"StartDateTime": start_time, "EndDateTime": end_time})
-            if same_time_range:
-                same_time_range = same_time_range[0].copy()
-            else:
-                same_time_range = TimeRange(**{"StartDateTime": start_time, "EndDateTime": end_time})
-                if start_time < end_time:
-                    same_time_range.add()
-            return same_time_range.TimeID
+    @classmethod
+    def present_at(cls, moment, entity_type: str = SOLDIER_TABLE) -> list:
+        """
+        Returns the ids of the entities of 'entity_type' (Soldier / Team / task table) that are
+        present (isActive = 1) at 'moment' (a datetime or an ISO 8601 string), in id order.
+        """
+        return [row.SoldierTeamTaskID for row in cls.query()
+                .columns("SoldierTeamTaskID")
+                .where("SoldierTeamTaskType", "=", entity_type)
+                .where("isActive", "=", 1)
+                .overlapping(moment, moment)
+                .order_by("SoldierTeamTaskID").all()]
 
+    def add(self) -> Union["BaseEntity", None]:
+        """
+        Adds the presence row, merging it with (or splitting) the entity's overlapping rows.
+        The whole merge runs as one transaction: if any write fails, every
+        TimeRange/Presence change made while merging is rolled back.
+        On success self.TimeID is the range of the merged row that now covers the new period.
+        """
+        try:
+            with self.transaction():
+                added = self._merge_and_add()
+                if added is None:
+                    raise sqlite3.DatabaseError("the merged presence row could not be inserted")
+        except sqlite3.Error as e:
+            print(f"Add Error: {e}")
+            return None
+        return added
+
+    def _merge_and_add(self) -> Union["BaseEntity", None]:
+        """
+        Loads the entity's presence periods once, applies the new period to them in memory
+        (see data_processing/interval_set.py) and writes only the rows that changed.
+        Periods are compared as epoch minutes, so ISO strings of different precision still line up.
+        """
         new_time_range = TimeRange.get_by_id({"TimeID": self.TimeID})
-        same_entities = Presence.get_all_by_columns_values({"SoldierTeamTaskType":self.SoldierTeamTaskType,"SoldierTeamTaskID":self.SoldierTeamTaskID})
-        if not same_entities:
+        same_entities = Presence.query() \
+            .where("SoldierTeamTaskType", "=", self.SoldierTeamTaskType) \
+            .where("SoldierTeamTaskID", "=", self.SoldierTeamTaskID).all()
+        if (not same_entities or new_time_range is None or new_time_range.StartMinute is None
+                or new_time_range.EndMinute is None or not new_time_range.StartMinute < new_time_range.EndMinute):
             return super().add()
-        tmp = None
-        for old_entity in same_entities:
-            old_time_range = TimeRange.get_by_id({"TimeID":old_entity.TimeID})
-            if not (new_time_range.EndDateTime < old_time_range.StartDateTime or new_time_range.StartDateTime > old_time_range.EndDateTime):  # has blending range
-                if self.isActive == old_entity.isActive: #extend range
-                    new_start = min(new_time_range.StartDateTime,new_time_range.EndDateTime,old_time_range.StartDateTime,old_time_range.EndDateTime)
-                    new_end = max(new_time_range.StartDateTime,new_time_range.EndDateTime,old_time_range.StartDateTime,old_time_range.EndDateTime)
-                    self.TimeID = get_time_id(new_start,new_end)
-                    old_entity.delete()
-                else: #Presence during a time defined as absence, and vice versa
-                    print()
-                    prev_time_id = get_time_id(old_time_range.StartDateTime,new_time_range.StartDateTime)
-                    post_time_id = get_time_id(new_time_range.EndDateTime,old_time_range.EndDateTime)
-                    # [new pried], (old period)
-                    # [ ( ) ] => [ ]
-                    if new_time_range.StartDateTime <= old_time_range.StartDateTime <= old_time_range.EndDateTime <= new_time_range.EndDateTime:
-                        old_entity.delete()
-                    # ( [ ] ) => ( )[ ]( )
-                    elif old_time_range.StartDateTime <= new_time_range.StartDateTime <= new_time_range.EndDateTime <= old_time_range.EndDateTime:
-                        prev = old_entity.copy()
-                        post = old_entity.copy()
-                        prev.TimeID = prev_time_id
-                        post.TimeID = post_time_id
-                        old_entity.delete()
-                        prev.add()
-                        post.add()
-                    # [ ( ] ) => [ ]( )
-                    elif new_time_range.StartDateTime <= old_time_range.StartDateTime <= new_time_range.EndDateTime <= old_time_range.EndDateTime:
-                        post = old_entity.copy()
-                        post.TimeID = post_time_id
-                        old_entity.delete()
-                        post.add()
-                    else: # ( [ ) ] => ( )[ ]
-                        prev = old_entity.copy()
-                        prev.TimeID = prev_time_id
-                        old_entity.delete()
-                        prev.add()
-            print("BEFORE:")
-            display_table(TIME_RANGE_TABLE)
-            display_table(PRESENCE_TABLE)
-            print(self)
-            tmp = super().add()
-            TimeRange.garbage_collector()
-            print("AFTER:")
-            display_table(TIME_RANGE_TABLE)
-            display_table(PRESENCE_TABLE)
-        return tmp
+        time_ranges = TimeRange.get_many_by_ids([{"TimeID": entity.TimeID} for entity in same_entities])
+
+        # Current rows as intervals; rows whose range is missing or not a valid period are left alone
+        stored, duplicates = {}, []
+        texts = {}
+        for entity in same_entities:
+            time_range = time_ranges.get((entity.TimeID,))
+            if time_range is None or time_range.StartMinute is None or time_range.EndMinute is None:
+                continue
+            interval = Interval(time_range.StartMinute, time_range.EndMinute, entity.isActive)
+            if interval in stored:  # the same period stored twice (through two identical ranges)
+                duplicates.append(entity)
+                continue
+            stored[interval] = entity
+            texts.setdefault(time_range.StartMinute, time_range.StartDateTime)
+            texts.setdefault(time_range.EndMinute, time_range.EndDateTime)
+        texts[new_time_range.StartMinute] = new_time_range.StartDateTime
+        texts[new_time_range.EndMinute] = new_time_range.EndDateTime
+
+        timeline = IntervalSet(stored)
+        merged = timeline.assign(new_time_range.StartMinute, new_time_range.EndMinute, self.isActive)
+        removed, added = diff(stored, timeline)
+
+        # A TimeRange row per added interval: the new range itself, an existing identical range, or a new one
+        time_ids = {(new_time_range.StartMinute, new_time_range.EndMinute): new_time_range.TimeID}
+        wanted = [(interval.start, interval.end) for interval in added if (interval.start, interval.end) not in time_ids]
+        if wanted:
+            existing = TimeRange.query().where("StartDateTime", "IN", {texts[start] for start, _ in wanted}).all()
+            by_text = {(time_range.StartDateTime, time_range.EndDateTime): time_range.TimeID for time_range in existing}
+            missing = {}
+            for start, end in wanted:
+                time_id = by_text.get((texts[start], texts[end]))
+                if time_id is None:
+                    missing[(start, end)] = TimeRange(StartDateTime=texts[start], EndDateTime=texts[end])
+                else:
+                    time_ids[(start, end)] = time_id
+            created = TimeRange.add_many(list(missing.values()))
+            if None in created:
+                return None
+            # Keyed by the periods asked for, not by the generated minute columns read back after the insert
+            time_ids.update({period: time_range.TimeID for period, time_range in zip(missing, created)})
+
+        if None in Presence.delete_many([stored[interval] for interval in removed] + duplicates):
+            return None
+        new_rows = [Presence(SoldierTeamTaskType=self.SoldierTeamTaskType, SoldierTeamTaskID=self.SoldierTeamTaskID,
+                             TimeID=time_ids[(interval.start, interval.end)], isActive=interval.value)
+                    for interval in added]
+        if None in Presence.add_many(new_rows):
+            return None
+        self.TimeID = time_ids.get((merged.start, merged.end), stored.get(merged, self).TimeID)
+        self._mark_clean()
+        return self
 
 class SoldierRole(BaseEntity):
-    SoldierID: int= None
-    RoleID: int= None
+    __slots__ = ("SoldierID", "RoleID")
+
+    SoldierID: int
+    RoleID: int
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -120,6 +162,10 @@ class SoldierRole(BaseEntity):
     def get_primary_key_columns_names(cls):
         return "SoldierID", "RoleID"
 
+    @classmethod
+    def get_repeated_columns(cls):
+        return "SoldierID", "RoleID"
+
     @classmethod
     def is_autoincrement(cls) -> bool:
         return False
@@ -131,12 +177,14 @@ class SoldierRole(BaseEntity):
         )
 
 class TaskRole(BaseEntity):
-    TaskType: str= None
-    TaskID: int= None
-    SoldierOrRole: str= None
-    SoldierOrRoleID: int= None
-    MinRequiredCount: int= None
-    RoleEnforcementType: int= None
+    __slots__ = ("TaskType", "TaskID", "SoldierOrRole", "SoldierOrRoleID", "MinRequiredCount", "RoleEnforcementType")
+
+    TaskType: str
+    TaskID: int
+    SoldierOrRole: str
+    SoldierOrRoleID: int
+    MinRequiredCount: int
+    RoleEnforcementType: int
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -150,6 +198,10 @@ class TaskRole(BaseEntity):
     def get_primary_key_columns_names(cls):
         return "TaskType", "TaskID", "SoldierOrRole", "SoldierOrRoleID"
 
+    @classmethod
+    def get_repeated_columns(cls):
+        return "TaskType", "TaskID", "SoldierOrRole"
+
     @classmethod
     def is_autoincrement(cls) -> bool:
         return False
@@ -165,11 +217,13 @@ class TaskRole(BaseEntity):
         )
 
 class CurrentTaskAssignment(BaseEntity):
-    TaskType: str= None
-    TaskID: int= None
-    SoldierOrTeamType: str= None
-    SoldierOrTeamID: int= None
-    TimeID: int= None
+    __slots__ = ("TaskType", "TaskID", "SoldierOrTeamType", "SoldierOrTeamID", "TimeID")
+
+    TaskType: str
+    TaskID: int
+    SoldierOrTeamType: str
+    SoldierOrTeamID: int
+    TimeID: int
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -183,6 +237,10 @@ class CurrentTaskAssignment(BaseEntity):
     def get_primary_key_columns_names(cls):
         return "TaskType", "TaskID", "SoldierOrTeamType", "SoldierOrTeamID", "TimeID"
 
+    @classmethod
+    def get_repeated_columns(cls):
+        return "TaskType", "TaskID", "SoldierOrTeamType", "SoldierOrTeamID", "TimeID"
+
     @classmethod
     def is_autoincrement(cls) -> bool:
         return False
@@ -196,14 +254,16 @@ class CurrentTaskAssignment(BaseEntity):
         )
 
 class TaskHistory(BaseEntity):
-    HistoryID: int= None
-    TaskType: str= None
-    TaskID: int= None
-    SoldierOrTeamType: str= None
-    SoldierOrTeamID: int= None
-    TaskReputation: str= None
-    TimeID: int= None
-    CompletionStatus: str= None
+    __slots__ = ("HistoryID", "TaskType", "TaskID", "SoldierOrTeamType", "SoldierOrTeamID", "TaskReputation", "TimeID", "CompletionStatus")
+
+    HistoryID: int
+    TaskType: str
+    TaskID: int
+    SoldierOrTeamType: str
+    SoldierOrTeamID: int
+    TaskReputation: str
+    TimeID: int
+    CompletionStatus: str
 
     @classmethod
     def get_table_name(cls) -> str:
@@ -217,6 +277,10 @@ class TaskHistory(BaseEntity):
     def get_primary_key_columns_names(cls):
         return "HistoryID",
 
+    @classmethod
+    def get_repeated_columns(cls):
+        return "TaskType", "TaskID", "SoldierOrTeamType", "SoldierOrTeamID", "TaskReputation", "CompletionStatus"
+
     @classmethod
     def is_autoincrement(cls) -> bool:
         return True
@@ -0,0 +1,249 @@
+"""
+db_connection.py
+
+Per-thread pool of long-lived SQLite connections.
+
+Every module that talks to the database (BaseEntity, read_db and the init_db scripts)
+asks this module for its connection instead of calling sqlite3.connect() itself.
+The first call on a thread opens the connection and applies the connection PRAGMAs and the
+PRAGMAs of the configured performance profile (config.DB_PROFILE, see config.py);
+later calls on the same thread reuse it until close_connections() is called.
+
+config.DB_PATH may also name an in-memory database: config.MEMORY_DB_PATH (':memory:') opens
+one named shared-cache in-memory database that every thread's connection shares, and any
+'file:' URI, e.g. 'file:sim?mode=memory&cache=shared', is passed to SQLite as a URI.
+An in-memory database lives until its last connection is closed.
+Shared-cache connections lock tables, not the file: a statement that meets another thread's
+table lock fails at once with SQLITE_LOCKED, which busy_timeout does not cover. Their statements
+are therefore retried for up to busy_timeout ms (see _SharedCacheConnection).
+
+Connections run in autocommit mode: a statement outside transaction() commits on its own,
+and every multi-statement write is wrapped in transaction(), which commits once at the end.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from EasyForce.common import config
+
+# PRAGMAs applied to every pooled connection, right after it is opened.
+# Foreign keys stay unenforced at runtime, as they always were: before pooling, only the init_db
+# scripts' own connections turned them ON, and every entity operation ran on a fresh connection
+# with SQLite's default (OFF). Turning them ON for all connections would change the schema's
+# behaviour: TaskHistory's reference to TemporaryTask(TaskReputation) is not a valid foreign key
+# (the parent column is not unique), so every TaskHistory insert and every TemporaryTask delete
+# would fail with "foreign key mismatch", and deleting a Team or a TimeRange would start to
+# cascade to rows the application cleans up itself.
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = OFF;",
+)
+
+_PRAGMA_VALUE = re.compile(r"-?\w+")
+
+# What config.MEMORY_DB_PATH opens: a named shared-cache database rather than a private ':memory:'
+# one, so the per-thread connections of this process see the same data. (The memdb VFS would
+# lock like a file, but it cannot open a snapshot copied from a WAL-mode file.)
+MEMORY_DB_URI = "file:easyforce?mode=memory&cache=shared"
+
+SQLITE_LOCKED = 6  # primary result code; the low byte of SQLITE_LOCKED_SHAREDCACHE too
+# Longest pause between two attempts of a statement that met a shared-cache table lock
+LOCKED_RETRY_MAX_SLEEP = 0.05  # seconds
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = {"opened": 0, "reused": 0}
+
+
+def profile_pragmas(profile: str = None) -> tuple:
+    """
+    Returns the PRAGMA statements of a performance profile, with config.DB_PRAGMA_OVERRIDES applied.
+
+    Args:
+        profile: A key of config.PERFORMANCE_PROFILES or config.PROFILE_ALIASES; defaults to config.DB_PROFILE.
+    Raises:
+        ValueError: for an unknown profile or a malformed PRAGMA value.
+    """
+    profile = config.DB_PROFILE if profile is None else profile
+    profile = config.PROFILE_ALIASES.get(profile, profile)
+    if profile not in config.PERFORMANCE_PROFILES:
+        raise ValueError(f"Unknown database profile '{profile}'. Use one of: {', '.join(config.PERFORMANCE_PROFILES)}.")
+    settings = {**config.PERFORMANCE_PROFILES[profile], **config.DB_PRAGMA_OVERRIDES}
+    statements = []
+    # query_only goes last: the PRAGMAs before it (e.g. an overridden journal_mode) may write
+    for pragma, value in sorted(settings.items(), key=lambda setting: setting[0] == "query_only"):
+        if pragma not in config.PROFILE_PRAGMAS or not _PRAGMA_VALUE.fullmatch(str(value)):
+            raise ValueError(f"Invalid database setting {pragma} = {value!r}.")
+        statements.append(f"PRAGMA {pragma} = {value};")
+    return tuple(statements)
+
+
+def is_memory_database(db_path: str = None) -> bool:
+    """Returns True if 'db_path' (default config.DB_PATH) names an in-memory database."""
+    db_path = config.DB_PATH if db_path is None else db_path
+    return db_path == config.MEMORY_DB_PATH or (
+        db_path.startswith("file:") and ("mode=memory" in db_path or "vfs=memdb" in db_path))
+
+
+def is_read_only() -> bool:
+    """Returns True if the current connection refuses writes (PRAGMA query_only, e.g. the read-only-reporting profile)."""
+    return bool(get_connection().execute("PRAGMA query_only").fetchone()[0])
+
+
+def _retry_locked(statement, timeout: float):
+    """
+    Internal helper: runs 'statement' and, while it fails with SQLITE_LOCKED (a shared-cache
+    table lock held by another connection), runs it again with growing pauses for up to
+    'timeout' seconds. A locked statement has not changed anything, so it is safe to repeat.
+    """
+    deadline = time.monotonic() + timeout
+    pause = 0.001
+    while True:
+        try:
+            return statement()
+        except sqlite3.OperationalError as e:
+            if getattr(e, "sqlite_errorcode", None) is None or e.sqlite_errorcode & 0xFF != SQLITE_LOCKED \
+                    or time.monotonic() >= deadline:
+                raise
+        time.sleep(pause)
+        pause = min(pause * 2, LOCKED_RETRY_MAX_SLEEP)
+
+
+class _SharedCacheCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        return _retry_locked(lambda: super(_SharedCacheCursor, self).execute(sql, parameters),
+                             self.connection.locked_timeout)
+
+
+class _SharedCacheConnection(sqlite3.Connection):
+    """
+    A connection to a shared-cache database whose execute() calls wait out other connections'
+    table locks like busy_timeout waits out file locks. executemany() is not retried: it may
+    fail after some rows were written, and the bulk methods already replay a failed batch
+    row by row through execute() (see BaseEntity._run_bulk()).
+    """
+    locked_timeout = 0.0  # seconds; set from busy_timeout when the connection is opened
+
+    def cursor(self, factory=_SharedCacheCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, parameters):
+        return self.cursor().executemany(sql, parameters)
+
+
+def _open_connection(db_path):
+    pragmas = CONNECTION_PRAGMAS + profile_pragmas()
+    if db_path == config.MEMORY_DB_PATH:
+        db_path = MEMORY_DB_URI
+    uri = db_path.startswith("file:")
+    shared_cache = uri and "cache=shared" in db_path
+    conn = sqlite3.connect(db_path, isolation_level=None, uri=uri,
+                           factory=_SharedCacheConnection if shared_cache else sqlite3.Connection)
+    for pragma in pragmas:
+        conn.execute(pragma)
+    if shared_cache:
+        conn.locked_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0] / 1000
+    with _stats_lock:
+        _stats["opened"] += 1
+    return conn
+
+
+def get_connection():
+    """
+    Returns the current thread's connection to config.DB_PATH, opening it on first use.
+
+    The connection stays open between calls, so callers must not close it.
+    If config.DB_PATH changed since the connection was opened, the old connection
+    is closed and a new one is opened to the new path. A change of config.DB_PROFILE
+    takes effect on the next connection opened, e.g. after close_connections().
+    """
+    db_path = config.DB_PATH
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.db_path == db_path:
+        with _stats_lock:
+            _stats["reused"] += 1
+        return conn
+
+    if conn is not None:
+        conn.close()
+    _local.conn = _open_connection(db_path)
+    _local.db_path = db_path
+    _local.depth = 0
+    return _local.conn
+
+
+@contextmanager
+def transaction():
+    """
+    Runs the enclosed block as one unit of work on the current thread's connection.
+
+    The outermost scope opens a transaction and commits it once when the block ends;
+    nested scopes become savepoints, so a failing inner block only undoes its own work.
+    Any exception (including KeyboardInterrupt) rolls the scope back and is re-raised.
+
+    Yields:
+        sqlite3.Connection: the shared connection, for callers that run raw SQL.
+    """
+    conn = get_connection()
+    depth = _local.depth
+    savepoint = f"sp_{depth}"
+    conn.execute("BEGIN" if depth == 0 else f"SAVEPOINT {savepoint}")
+    _local.depth = depth + 1
+    try:
+        yield conn
+    except BaseException:
+        _local.depth = depth
+        if depth == 0:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+        else:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+        raise
+
+    _local.depth = depth
+    if depth > 0:
+        conn.execute(f"RELEASE {savepoint}")
+        return
+    try:
+        conn.execute("COMMIT")
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+
+def in_transaction() -> bool:
+    """Returns True while the current thread is inside a transaction() scope."""
+    return getattr(_local, "depth", 0) > 0
+
+
+def close_connections():
+    """Closes the current thread's pooled connection (if any)."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+    _local.conn = None
+    _local.db_path = None
+    _local.depth = 0
+
+
+def connection_stats() -> dict:
+    """
+    Returns a copy of the pool counters:
+    'opened' - how many sqlite3 connections were actually opened,
+    'reused' - how many get_connection() calls were served by an open connection.
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_connection_stats():
+    with _stats_lock:
+        _stats["opened"] = 0
+        _stats["reused"] = 0
@@ -1,13 +1,64 @@
-from EasyForce.data_management.init_db.init_entities import init_entities
-from EasyForce.data_management.init_db.init_relationships import init_relationships
-from EasyForce.data_management.init_db.init_triggers import init_triggers
+"""
+init_database.py
+
+Versioned schema migrations keyed on SQLite's PRAGMA user_version.
+
+Each migration is (version, description, statements). On startup the stored user_version
+is compared with the latest version: an up-to-date database costs a single PRAGMA read,
+otherwise every pending migration is applied - together with the new user_version -
+in one transaction, so a failing migration leaves the database at its previous version.
+
+To change the schema, append a migration; never edit one that has already shipped.
+"""
+import sqlite3
+
+from EasyForce.data_management.db_connection import get_connection, transaction
+from EasyForce.data_management.init_db.init_entities import ENTITY_TABLES, TIME_RANGE_EPOCH_MINUTES
+from EasyForce.data_management.init_db.init_relationships import RELATIONSHIP_TABLES
+from EasyForce.data_management.init_db.init_triggers import (
+    TRIGGERS, DROP_REDUNDANT_UNIQUENESS_TRIGGERS, TIME_RANGE_VALIDITY_TRIGGERS
+)
+from EasyForce.data_management.init_db.init_indexes import INDEXES, EPOCH_MINUTE_INDEXES, INTERVAL_INDEX
+
+MIGRATIONS = (
+    # Databases created before versioning hold this schema at user_version 0;
+    # its statements use IF NOT EXISTS, so applying it to them is harmless.
+    (1, "Entity and relationship tables, validation triggers", ENTITY_TABLES + RELATIONSHIP_TABLES + TRIGGERS),
+    (2, "Secondary indexes for hot lookup paths", INDEXES),
+    (3, "Drop name-uniqueness triggers that repeat the UNIQUE constraints", DROP_REDUNDANT_UNIQUENESS_TRIGGERS),
+    (4, "Epoch-minute columns and index for TimeRange", TIME_RANGE_EPOCH_MINUTES + EPOCH_MINUTE_INDEXES),
+    (5, "R*Tree interval index for TimeRange", INTERVAL_INDEX),
+    (6, "Compare TimeRange bounds as epoch minutes in the validity triggers", TIME_RANGE_VALIDITY_TRIGGERS),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version() -> int:
+    """Returns the schema version stored in the database (0 for a new database)."""
+    return get_connection().execute("PRAGMA user_version").fetchone()[0]
+
 
 def initialize_database():
-    """Initialize the database and create all necessary tables."""
-    if not init_entities():
+    """Initialize the database: bring its schema up to SCHEMA_VERSION."""
+    current_version = get_schema_version()
+    if current_version == SCHEMA_VERSION:
+        return True
+    if current_version > SCHEMA_VERSION:
+        print(f"The database schema (version {current_version}) is newer than this program (version {SCHEMA_VERSION}).")
         return False
-    if not init_relationships():
-        return False
-    if not init_triggers():
+
+    try:
+        with transaction() as conn:
+            for version, description, statements in MIGRATIONS:
+                if version <= current_version:
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                print(f"Applied migration {version}: {description}")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    except sqlite3.Error as e:
+        print(f"An error occurred while migrating the database schema: {e}")
         return False
-    return True
\ No newline at end of file
+    print(f"The database schema is up to date (version {SCHEMA_VERSION}).")
+    return True
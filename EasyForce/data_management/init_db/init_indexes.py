@@ -0,0 +1,75 @@
+# Secondary indexes, created by migration 2 (see init_database.py),
+# for the lookups that do not start with a table's primary key.
+# Without them each of these lookups is a full table scan.
+INDEXES = (
+    # Presence.add -> get_time_id(): TimeRange by (StartDateTime, EndDateTime), and the overlap range query
+    "CREATE INDEX IF NOT EXISTS idx_TimeRange_Start_End ON TimeRange (StartDateTime, EndDateTime);",
+    # Soldiers of a team (add_team, team deletion)
+    "CREATE INDEX IF NOT EXISTS idx_Soldier_TeamID ON Soldier (TeamID);",
+    # Soldiers holding a role
+    "CREATE INDEX IF NOT EXISTS idx_SoldierRole_RoleID ON SoldierRole (RoleID);",
+    # Tasks a soldier / role is required for or excluded from
+    "CREATE INDEX IF NOT EXISTS idx_TaskRole_SoldierOrRole ON TaskRole (SoldierOrRole, SoldierOrRoleID);",
+    # Assignments and history of a soldier / team, and rows using a time range (TimeRange garbage collector)
+    "CREATE INDEX IF NOT EXISTS idx_CurrentTaskAssignment_SoldierOrTeam ON CurrentTaskAssignment (SoldierOrTeamType, SoldierOrTeamID);",
+    "CREATE INDEX IF NOT EXISTS idx_CurrentTaskAssignment_TimeID ON CurrentTaskAssignment (TimeID);",
+    "CREATE INDEX IF NOT EXISTS idx_TaskHistory_SoldierOrTeam ON TaskHistory (SoldierOrTeamType, SoldierOrTeamID);",
+    "CREATE INDEX IF NOT EXISTS idx_TaskHistory_TimeID ON TaskHistory (TimeID);",
+    "CREATE INDEX IF NOT EXISTS idx_Presence_TimeID ON Presence (TimeID);",
+)
+
+# Migration 4: interval lookups on the epoch-minute columns of TimeRange (see init_entities.py).
+EPOCH_MINUTE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_TimeRange_Minutes ON TimeRange (StartMinute, EndMinute);",
+)
+
+# Migration 5: an R*Tree mirror of the TimeRange intervals (TimeID, StartMinute, EndMinute) for
+# overlap queries, which a B-tree can only bound on one side. The triggers keep it in sync with
+# every insert, update and delete of TimeRange; bulk_load() indexes the ranges it loads once at
+# the end instead (see INDEX_LOADED_RANGES). Ranges whose bounds are not valid dates (NULL minutes)
+# or are reversed are not indexed and so never match an overlap query.
+FILL_INTERVAL_INDEX = """
+    INSERT INTO TimeRangeRTree (TimeID, StartMinute, EndMinute)
+    SELECT TimeID, StartMinute, EndMinute FROM TimeRange WHERE StartMinute <= EndMinute ORDER BY StartMinute;
+"""
+
+INTERVAL_INDEX = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS TimeRangeRTree USING rtree_i32(TimeID, StartMinute, EndMinute);",
+    """
+    CREATE TRIGGER IF NOT EXISTS sync_TimeRangeRTree_insert
+    AFTER INSERT ON TimeRange
+    WHEN NEW.StartMinute <= NEW.EndMinute
+    BEGIN
+        INSERT INTO TimeRangeRTree (TimeID, StartMinute, EndMinute) VALUES (NEW.TimeID, NEW.StartMinute, NEW.EndMinute);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sync_TimeRangeRTree_update
+    AFTER UPDATE OF TimeID, StartDateTime, EndDateTime ON TimeRange
+    BEGIN
+        DELETE FROM TimeRangeRTree WHERE TimeID = OLD.TimeID;
+        INSERT INTO TimeRangeRTree (TimeID, StartMinute, EndMinute)
+        SELECT NEW.TimeID, NEW.StartMinute, NEW.EndMinute WHERE NEW.StartMinute <= NEW.EndMinute;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS sync_TimeRangeRTree_delete
+    AFTER DELETE ON TimeRange
+    BEGIN
+        DELETE FROM TimeRangeRTree WHERE TimeID = OLD.TimeID;
+    END;
+    """,
+    # Existing ranges
+    FILL_INTERVAL_INDEX,
+)
+
+# bulk_load() drops only the insert trigger and indexes the loaded ranges - those above the TimeRange
+# rowid mark it takes at the start - in one statement at the end. A loaded range updated during the
+# load was already indexed by the update trigger, hence OR REPLACE.
+INTERVAL_INDEX_INSERT_TRIGGER = "sync_TimeRangeRTree_insert"
+
+INDEX_LOADED_RANGES = """
+    INSERT OR REPLACE INTO TimeRangeRTree (TimeID, StartMinute, EndMinute)
+    SELECT TimeID, StartMinute, EndMinute FROM TimeRange
+    WHERE TimeID > :before AND StartMinute <= EndMinute ORDER BY StartMinute;
+"""
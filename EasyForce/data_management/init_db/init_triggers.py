@@ -1,375 +1,480 @@
-import sqlite3
-from EasyForce.common.config import DB_PATH
-
-def init_triggers():
-    """Initialize the triggers."""
-    conn = None
-    return_val = True
-
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        # Enable foreign key constraints
-        conn.execute("PRAGMA foreign_keys = ON;")
-
-        ##### Create all Triggers tables #####
-
-        # 1) Check_time_range_validity
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS check_time_range_validity_insert
-        BEFORE INSERT ON TimeRange
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN NEW.EndDateTime <= NEW.StartDateTime THEN
-                    RAISE(ABORT, 'EndDateTime must be after StartDateTime')
-            END;
+# Validation triggers, created by migration 1 (see init_database.py);
+# the name-uniqueness ones are dropped again by migration 3.
+TRIGGERS = (
+    # 1) Check_time_range_validity (compares the ISO text; migration 6 replaces both triggers
+    #    with TIME_RANGE_VALIDITY_TRIGGERS below, which compare epoch minutes)
+    """
+    CREATE TRIGGER IF NOT EXISTS check_time_range_validity_insert
+    BEFORE INSERT ON TimeRange
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN NEW.EndDateTime <= NEW.StartDateTime THEN
+                RAISE(ABORT, 'EndDateTime must be after StartDateTime')
         END;
-        """)
-
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS check_time_range_validity_update
-        BEFORE UPDATE ON TimeRange
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN NEW.EndDateTime <= NEW.StartDateTime THEN
-                    RAISE(ABORT, 'EndDateTime must be after StartDateTime')
-            END;
+    END;
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS check_time_range_validity_update
+    BEFORE UPDATE ON TimeRange
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN NEW.EndDateTime <= NEW.StartDateTime THEN
+                RAISE(ABORT, 'EndDateTime must be after StartDateTime')
         END;
-        """)
-
-        # 2) Ensure_positive_required_personnel
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS ensure_positive_required_personnel_insert
-        BEFORE INSERT ON RecurringTask
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN NEW.RequiredPersonnel < 0 THEN
-                    RAISE(ABORT, 'RequiredPersonnel cannot be negative')
-            END;
+    END;
+    """,
+
+    # 2) Ensure_positive_required_personnel
+    """
+    CREATE TRIGGER IF NOT EXISTS ensure_positive_required_personnel_insert
+    BEFORE INSERT ON RecurringTask
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN NEW.RequiredPersonnel < 0 THEN
+                RAISE(ABORT, 'RequiredPersonnel cannot be negative')
         END;
-        """)
-
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS ensure_positive_required_personnel_update
-        BEFORE UPDATE ON RecurringTask
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN NEW.RequiredPersonnel < 0 THEN
-                    RAISE(ABORT, 'RequiredPersonnel cannot be negative')
-            END;
+    END;
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS ensure_positive_required_personnel_update
+    BEFORE UPDATE ON RecurringTask
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN NEW.RequiredPersonnel < 0 THEN
+                RAISE(ABORT, 'RequiredPersonnel cannot be negative')
         END;
-        """)
-
-        # 3) Validate Presence References
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_presence_reference_insert
-        BEFORE INSERT ON Presence
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN NEW.SoldierTeamTaskType = 'Soldier'
-                     AND (SELECT COUNT(*) FROM Soldier WHERE SoldierID = NEW.SoldierTeamTaskID) = 0 THEN
-                    RAISE(ABORT, 'SoldierTeamTaskID does not exist in Soldier table')
-                WHEN NEW.SoldierTeamTaskType = 'Team'
-                     AND (SELECT COUNT(*) FROM Team WHERE TeamID = NEW.SoldierTeamTaskID) = 0 THEN
-                    RAISE(ABORT, 'SoldierTeamTaskID does not exist in Team table')
-                WHEN NEW.SoldierTeamTaskType = 'RecurringTask'
-                     AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.SoldierTeamTaskID) = 0 THEN
-                    RAISE(ABORT, 'SoldierTeamTaskID does not exist in RecurringTask table')
-                WHEN NEW.SoldierTeamTaskType = 'TemporaryTask'
-                     AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.SoldierTeamTaskID) = 0 THEN
-                    RAISE(ABORT, 'SoldierTeamTaskID does not exist in TemporaryTask table')
-            END;
+    END;
+    """,
+
+    # 3) Validate Presence References
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_presence_reference_insert
+    BEFORE INSERT ON Presence
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN NEW.SoldierTeamTaskType = 'Soldier'
+                 AND (SELECT COUNT(*) FROM Soldier WHERE SoldierID = NEW.SoldierTeamTaskID) = 0 THEN
+                RAISE(ABORT, 'SoldierTeamTaskID does not exist in Soldier table')
+            WHEN NEW.SoldierTeamTaskType = 'Team'
+                 AND (SELECT COUNT(*) FROM Team WHERE TeamID = NEW.SoldierTeamTaskID) = 0 THEN
+                RAISE(ABORT, 'SoldierTeamTaskID does not exist in Team table')
+            WHEN NEW.SoldierTeamTaskType = 'RecurringTask'
+                 AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.SoldierTeamTaskID) = 0 THEN
+                RAISE(ABORT, 'SoldierTeamTaskID does not exist in RecurringTask table')
+            WHEN NEW.SoldierTeamTaskType = 'TemporaryTask'
+                 AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.SoldierTeamTaskID) = 0 THEN
+                RAISE(ABORT, 'SoldierTeamTaskID does not exist in TemporaryTask table')
         END;
-        """)
-
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_presence_reference_update
-        BEFORE UPDATE ON Presence
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN NEW.SoldierTeamTaskType = 'Soldier'
-                     AND (SELECT COUNT(*) FROM Soldier WHERE SoldierID = NEW.SoldierTeamTaskID) = 0 THEN
-                    RAISE(ABORT, 'SoldierTeamTaskID does not exist in Soldier table')
-                WHEN NEW.SoldierTeamTaskType = 'Team'
-                     AND (SELECT COUNT(*) FROM Team WHERE TeamID = NEW.SoldierTeamTaskID) = 0 THEN
-                    RAISE(ABORT, 'SoldierTeamTaskID does not exist in Team table')
-                WHEN NEW.SoldierTeamTaskType = 'RecurringTask'
-                     AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.SoldierTeamTaskID) = 0 THEN
-                    RAISE(ABORT, 'SoldierTeamTaskID does not exist in RecurringTask table')
-                WHEN NEW.SoldierTeamTaskType = 'TemporaryTask'
-                     AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.SoldierTeamTaskID) = 0 THEN
-                    RAISE(ABORT, 'SoldierTeamTaskID does not exist in TemporaryTask table')
-            END;
+    END;
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_presence_reference_update
+    BEFORE UPDATE ON Presence
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN NEW.SoldierTeamTaskType = 'Soldier'
+                 AND (SELECT COUNT(*) FROM Soldier WHERE SoldierID = NEW.SoldierTeamTaskID) = 0 THEN
+                RAISE(ABORT, 'SoldierTeamTaskID does not exist in Soldier table')
+            WHEN NEW.SoldierTeamTaskType = 'Team'
+                 AND (SELECT COUNT(*) FROM Team WHERE TeamID = NEW.SoldierTeamTaskID) = 0 THEN
+                RAISE(ABORT, 'SoldierTeamTaskID does not exist in Team table')
+            WHEN NEW.SoldierTeamTaskType = 'RecurringTask'
+                 AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.SoldierTeamTaskID) = 0 THEN
+                RAISE(ABORT, 'SoldierTeamTaskID does not exist in RecurringTask table')
+            WHEN NEW.SoldierTeamTaskType = 'TemporaryTask'
+                 AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.SoldierTeamTaskID) = 0 THEN
+                RAISE(ABORT, 'SoldierTeamTaskID does not exist in TemporaryTask table')
         END;
-        """)
-
-        # 5) Validate TaskRole References
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_taskrole_reference_insert
-        BEFORE INSERT ON TaskRole
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN NEW.TaskType = 'TemporaryTask'
-                     AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.TaskID) = 0 THEN
-                    RAISE(ABORT, 'TaskID does not exist in TemporaryTask table')
-                WHEN NEW.TaskType = 'RecurringTask'
-                     AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.TaskID) = 0 THEN
-                    RAISE(ABORT, 'TaskID does not exist in RecurringTask table')
-            END;
+    END;
+    """,
+
+    # 5) Validate TaskRole References
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_taskrole_reference_insert
+    BEFORE INSERT ON TaskRole
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN NEW.TaskType = 'TemporaryTask'
+                 AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.TaskID) = 0 THEN
+                RAISE(ABORT, 'TaskID does not exist in TemporaryTask table')
+            WHEN NEW.TaskType = 'RecurringTask'
+                 AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.TaskID) = 0 THEN
+                RAISE(ABORT, 'TaskID does not exist in RecurringTask table')
         END;
-        """)
-
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_taskrole_reference_update
-        BEFORE UPDATE ON TaskRole
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN NEW.TaskType = 'TemporaryTask'
-                     AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.TaskID) = 0 THEN
-                    RAISE(ABORT, 'TaskID does not exist in TemporaryTask table')
-                WHEN NEW.TaskType = 'RecurringTask'
-                     AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.TaskID) = 0 THEN
-                    RAISE(ABORT, 'TaskID does not exist in RecurringTask table')
-            END;
+    END;
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_taskrole_reference_update
+    BEFORE UPDATE ON TaskRole
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN NEW.TaskType = 'TemporaryTask'
+                 AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.TaskID) = 0 THEN
+                RAISE(ABORT, 'TaskID does not exist in TemporaryTask table')
+            WHEN NEW.TaskType = 'RecurringTask'
+                 AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.TaskID) = 0 THEN
+                RAISE(ABORT, 'TaskID does not exist in RecurringTask table')
         END;
-        """)
-
-        # 6) Validate CurrentTaskAssignment References
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_currenttaskassignment_reference_insert
-        BEFORE INSERT ON CurrentTaskAssignment
-        FOR EACH ROW
-        BEGIN
-            -- First check the Task part
-            SELECT CASE
-                WHEN NEW.TaskType = 'TemporaryTask'
-                     AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.TaskID) = 0 THEN
-                    RAISE(ABORT, 'TaskID does not exist in TemporaryTask table')
-                WHEN NEW.TaskType = 'RecurringTask'
-                     AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.TaskID) = 0 THEN
-                    RAISE(ABORT, 'TaskID does not exist in RecurringTask table')
-            END;
-
-            -- Then check the SoldierOrTeam part
-            SELECT CASE
-                WHEN NEW.SoldierOrTeamType = 'Soldier'
-                     AND (SELECT COUNT(*) FROM Soldier WHERE SoldierID = NEW.SoldierOrTeamID) = 0 THEN
-                    RAISE(ABORT, 'SoldierOrTeamID does not exist in Soldier table')
-                WHEN NEW.SoldierOrTeamType = 'Team'
-                     AND (SELECT COUNT(*) FROM Team WHERE TeamID = NEW.SoldierOrTeamID) = 0 THEN
-                    RAISE(ABORT, 'SoldierOrTeamID does not exist in Team table')
-            END;
+    END;
+    """,
+
+    # 6) Validate CurrentTaskAssignment References
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_currenttaskassignment_reference_insert
+    BEFORE INSERT ON CurrentTaskAssignment
+    FOR EACH ROW
+    BEGIN
+        -- First check the Task part
+        SELECT CASE
+            WHEN NEW.TaskType = 'TemporaryTask'
+                 AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.TaskID) = 0 THEN
+                RAISE(ABORT, 'TaskID does not exist in TemporaryTask table')
+            WHEN NEW.TaskType = 'RecurringTask'
+                 AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.TaskID) = 0 THEN
+                RAISE(ABORT, 'TaskID does not exist in RecurringTask table')
         END;
-        """)
-
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_currenttaskassignment_reference_update
-        BEFORE UPDATE ON CurrentTaskAssignment
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN NEW.TaskType = 'TemporaryTask'
-                     AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.TaskID) = 0 THEN
-                    RAISE(ABORT, 'TaskID does not exist in TemporaryTask table')
-                WHEN NEW.TaskType = 'RecurringTask'
-                     AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.TaskID) = 0 THEN
-                    RAISE(ABORT, 'TaskID does not exist in RecurringTask table')
-            END;
-
-            SELECT CASE
-                WHEN NEW.SoldierOrTeamType = 'Soldier'
-                     AND (SELECT COUNT(*) FROM Soldier WHERE SoldierID = NEW.SoldierOrTeamID) = 0 THEN
-                    RAISE(ABORT, 'SoldierOrTeamID does not exist in Soldier table')
-                WHEN NEW.SoldierOrTeamType = 'Team'
-                     AND (SELECT COUNT(*) FROM Team WHERE TeamID = NEW.SoldierOrTeamID) = 0 THEN
-                    RAISE(ABORT, 'SoldierOrTeamID does not exist in Team table')
-            END;
+
+        -- Then check the SoldierOrTeam part
+        SELECT CASE
+            WHEN NEW.SoldierOrTeamType = 'Soldier'
+                 AND (SELECT COUNT(*) FROM Soldier WHERE SoldierID = NEW.SoldierOrTeamID) = 0 THEN
+                RAISE(ABORT, 'SoldierOrTeamID does not exist in Soldier table')
+            WHEN NEW.SoldierOrTeamType = 'Team'
+                 AND (SELECT COUNT(*) FROM Team WHERE TeamID = NEW.SoldierOrTeamID) = 0 THEN
+                RAISE(ABORT, 'SoldierOrTeamID does not exist in Team table')
         END;
-        """)
-
-        # 7) Validate TaskHistory References
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_taskhistory_reference_insert
-        BEFORE INSERT ON TaskHistory
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN NEW.TaskType = 'TemporaryTask'
-                     AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.TaskID) = 0 THEN
-                    RAISE(ABORT, 'TaskID does not exist in TemporaryTask table')
-                WHEN NEW.TaskType = 'RecurringTask'
-                     AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.TaskID) = 0 THEN
-                    RAISE(ABORT, 'TaskID does not exist in RecurringTask table')
-            END;
-
-            SELECT CASE
-                WHEN NEW.SoldierOrTeamType = 'Soldier'
-                     AND (SELECT COUNT(*) FROM Soldier WHERE SoldierID = NEW.SoldierOrTeamID) = 0 THEN
-                    RAISE(ABORT, 'SoldierOrTeamID does not exist in Soldier table')
-                WHEN NEW.SoldierOrTeamType = 'Team'
-                     AND (SELECT COUNT(*) FROM Team WHERE TeamID = NEW.SoldierOrTeamID) = 0 THEN
-                    RAISE(ABORT, 'SoldierOrTeamID does not exist in Team table')
-            END;
+    END;
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_currenttaskassignment_reference_update
+    BEFORE UPDATE ON CurrentTaskAssignment
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN NEW.TaskType = 'TemporaryTask'
+                 AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.TaskID) = 0 THEN
+                RAISE(ABORT, 'TaskID does not exist in TemporaryTask table')
+            WHEN NEW.TaskType = 'RecurringTask'
+                 AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.TaskID) = 0 THEN
+                RAISE(ABORT, 'TaskID does not exist in RecurringTask table')
         END;
-        """)
-
-        # 8) Validate unique TeamName in Team table
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_team_name_uniqueness_insert
-        BEFORE INSERT ON Team
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN (
-                    SELECT COUNT(*)
-                    FROM Team
-                    WHERE TeamName = NEW.TeamName
-                      AND TeamID != NEW.TeamID
-                ) > 0 THEN
-                    RAISE(ABORT, 'The team name already exists. Please use a unique name')
-            END;
+
+        SELECT CASE
+            WHEN NEW.SoldierOrTeamType = 'Soldier'
+                 AND (SELECT COUNT(*) FROM Soldier WHERE SoldierID = NEW.SoldierOrTeamID) = 0 THEN
+                RAISE(ABORT, 'SoldierOrTeamID does not exist in Soldier table')
+            WHEN NEW.SoldierOrTeamType = 'Team'
+                 AND (SELECT COUNT(*) FROM Team WHERE TeamID = NEW.SoldierOrTeamID) = 0 THEN
+                RAISE(ABORT, 'SoldierOrTeamID does not exist in Team table')
         END;
-        """)
-
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_team_name_uniqueness_update
-        BEFORE UPDATE ON Team
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN (
-                    SELECT COUNT(*)
-                    FROM Team
-                    WHERE TeamName = NEW.TeamName
-                      AND TeamID != NEW.TeamID
-                ) > 0 THEN
-                    RAISE(ABORT, 'The team name already exists. Please use a unique name')
-            END;
+    END;
+    """,
+
+    # 7) Validate TaskHistory References
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_taskhistory_reference_insert
+    BEFORE INSERT ON TaskHistory
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN NEW.TaskType = 'TemporaryTask'
+                 AND (SELECT COUNT(*) FROM TemporaryTask WHERE TaskID = NEW.TaskID) = 0 THEN
+                RAISE(ABORT, 'TaskID does not exist in TemporaryTask table')
+            WHEN NEW.TaskType = 'RecurringTask'
+                 AND (SELECT COUNT(*) FROM RecurringTask WHERE TaskID = NEW.TaskID) = 0 THEN
+                RAISE(ABORT, 'TaskID does not exist in RecurringTask table')
         END;
-        """)
-
-        # 9) Validate unique RoleName in Role table
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_role_name_uniqueness_insert
-        BEFORE INSERT ON Role
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN (
-                    SELECT COUNT(*)
-                    FROM Role
-                    WHERE RoleName = NEW.RoleName
-                      AND RoleID != NEW.RoleID
-                ) > 0 THEN
-                    RAISE(ABORT, 'The role name already exists. Please use a unique name')
-            END;
+
+        SELECT CASE
+            WHEN NEW.SoldierOrTeamType = 'Soldier'
+                 AND (SELECT COUNT(*) FROM Soldier WHERE SoldierID = NEW.SoldierOrTeamID) = 0 THEN
+                RAISE(ABORT, 'SoldierOrTeamID does not exist in Soldier table')
+            WHEN NEW.SoldierOrTeamType = 'Team'
+                 AND (SELECT COUNT(*) FROM Team WHERE TeamID = NEW.SoldierOrTeamID) = 0 THEN
+                RAISE(ABORT, 'SoldierOrTeamID does not exist in Team table')
         END;
-        """)
-
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_role_name_uniqueness_update
-        BEFORE UPDATE ON Role
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN (
-                    SELECT COUNT(*)
-                    FROM Role
-                    WHERE RoleName = NEW.RoleName
-                      AND RoleID != NEW.RoleID
-                ) > 0 THEN
-                    RAISE(ABORT, 'The role name already exists. Please use a unique name')
-            END;
+    END;
+    """,
+
+    # 8) Validate unique TeamName in Team table
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_team_name_uniqueness_insert
+    BEFORE INSERT ON Team
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN (
+                SELECT COUNT(*)
+                FROM Team
+                WHERE TeamName = NEW.TeamName
+                  AND TeamID != NEW.TeamID
+            ) > 0 THEN
+                RAISE(ABORT, 'The team name already exists. Please use a unique name')
         END;
-        """)
-
-        # 10) Validate unique TaskName in TemporaryTask
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_temporary_task_name_uniqueness_insert
-        BEFORE INSERT ON TemporaryTask
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN (
-                    SELECT COUNT(*)
-                    FROM TemporaryTask
-                    WHERE TaskName = NEW.TaskName
-                      AND TaskID != NEW.TaskID
-                ) > 0 THEN
-                    RAISE(ABORT, 'The temporary task name already exists. Please use a unique name')
-            END;
+    END;
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_team_name_uniqueness_update
+    BEFORE UPDATE ON Team
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN (
+                SELECT COUNT(*)
+                FROM Team
+                WHERE TeamName = NEW.TeamName
+                  AND TeamID != NEW.TeamID
+            ) > 0 THEN
+                RAISE(ABORT, 'The team name already exists. Please use a unique name')
         END;
-        """)
-
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_temporary_task_name_uniqueness_update
-        BEFORE UPDATE ON TemporaryTask
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN (
-                    SELECT COUNT(*)
-                    FROM TemporaryTask
-                    WHERE TaskName = NEW.TaskName
-                      AND TaskID != NEW.TaskID
-                ) > 0 THEN
-                    RAISE(ABORT, 'The temporary task name already exists. Please use a unique name')
-            END;
+    END;
+    """,
+
+    # 9) Validate unique RoleName in Role table
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_role_name_uniqueness_insert
+    BEFORE INSERT ON Role
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN (
+                SELECT COUNT(*)
+                FROM Role
+                WHERE RoleName = NEW.RoleName
+                  AND RoleID != NEW.RoleID
+            ) > 0 THEN
+                RAISE(ABORT, 'The role name already exists. Please use a unique name')
         END;
-        """)
-
-        # 11) Validate unique TaskName in RecurringTask
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_recurring_task_name_uniqueness_insert
-        BEFORE INSERT ON RecurringTask
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN (
-                    SELECT COUNT(*)
-                    FROM RecurringTask
-                    WHERE TaskName = NEW.TaskName
-                      AND TaskID != NEW.TaskID
-                ) > 0 THEN
-                    RAISE(ABORT, 'The recurring task name already exists. Please use a unique name')
-            END;
+    END;
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_role_name_uniqueness_update
+    BEFORE UPDATE ON Role
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN (
+                SELECT COUNT(*)
+                FROM Role
+                WHERE RoleName = NEW.RoleName
+                  AND RoleID != NEW.RoleID
+            ) > 0 THEN
+                RAISE(ABORT, 'The role name already exists. Please use a unique name')
         END;
-        """)
-
-        cursor.execute("""
-        CREATE TRIGGER IF NOT EXISTS validate_recurring_task_name_uniqueness_update
-        BEFORE UPDATE ON RecurringTask
-        FOR EACH ROW
-        BEGIN
-            SELECT CASE
-                WHEN (
-                    SELECT COUNT(*)
-                    FROM RecurringTask
-                    WHERE TaskName = NEW.TaskName
-                      AND TaskID != NEW.TaskID
-                ) > 0 THEN
-                    RAISE(ABORT, 'The recurring task name already exists. Please use a unique name')
-            END;
+    END;
+    """,
+
+    # 10) Validate unique TaskName in TemporaryTask
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_temporary_task_name_uniqueness_insert
+    BEFORE INSERT ON TemporaryTask
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN (
+                SELECT COUNT(*)
+                FROM TemporaryTask
+                WHERE TaskName = NEW.TaskName
+                  AND TaskID != NEW.TaskID
+            ) > 0 THEN
+                RAISE(ABORT, 'The temporary task name already exists. Please use a unique name')
         END;
-        """)
-
-        # Commit triggers
-        conn.commit()
-        print("All triggers have been initialized successfully!")
-
-    except sqlite3.Error as e:
-        print(f"An error occurred during the initialization of triggers tables: {e}")
-        return_val = False
-    finally:
-        if conn:
-            conn.close()
-            return return_val
\ No newline at end of file
+    END;
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_temporary_task_name_uniqueness_update
+    BEFORE UPDATE ON TemporaryTask
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN (
+                SELECT COUNT(*)
+                FROM TemporaryTask
+                WHERE TaskName = NEW.TaskName
+                  AND TaskID != NEW.TaskID
+            ) > 0 THEN
+                RAISE(ABORT, 'The temporary task name already exists. Please use a unique name')
+        END;
+    END;
+    """,
+
+    # 11) Validate unique TaskName in RecurringTask
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_recurring_task_name_uniqueness_insert
+    BEFORE INSERT ON RecurringTask
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN (
+                SELECT COUNT(*)
+                FROM RecurringTask
+                WHERE TaskName = NEW.TaskName
+                  AND TaskID != NEW.TaskID
+            ) > 0 THEN
+                RAISE(ABORT, 'The recurring task name already exists. Please use a unique name')
+        END;
+    END;
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS validate_recurring_task_name_uniqueness_update
+    BEFORE UPDATE ON RecurringTask
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN (
+                SELECT COUNT(*)
+                FROM RecurringTask
+                WHERE TaskName = NEW.TaskName
+                  AND TaskID != NEW.TaskID
+            ) > 0 THEN
+                RAISE(ABORT, 'The recurring task name already exists. Please use a unique name')
+        END;
+    END;
+    """,
+)
+
+# The name-uniqueness triggers above only repeat the tables' UNIQUE constraints
+# (and never fire on an insert without an id); migration 3 drops them.
+REDUNDANT_UNIQUENESS_TRIGGERS = (
+    "validate_team_name_uniqueness_insert",
+    "validate_team_name_uniqueness_update",
+    "validate_role_name_uniqueness_insert",
+    "validate_role_name_uniqueness_update",
+    "validate_temporary_task_name_uniqueness_insert",
+    "validate_temporary_task_name_uniqueness_update",
+    "validate_recurring_task_name_uniqueness_insert",
+    "validate_recurring_task_name_uniqueness_update",
+)
+
+DROP_REDUNDANT_UNIQUENESS_TRIGGERS = tuple(
+    f"DROP TRIGGER IF EXISTS {trigger};" for trigger in REDUNDANT_UNIQUENESS_TRIGGERS
+)
+
+# Migration 6: the time-range validity triggers compare the bounds as epoch minutes - the values
+# of TimeRange's StartMinute / EndMinute columns - instead of as text, so ISO strings of different
+# shapes ('2025-03-01 08:00' vs '2025-03-01T07:30:00') are ordered by time. Bounds that are not
+# valid dates give NULL minutes and, as before for text, are not rejected here.
+TIME_RANGE_VALIDITY_TRIGGERS = (
+    "DROP TRIGGER IF EXISTS check_time_range_validity_insert;",
+    "DROP TRIGGER IF EXISTS check_time_range_validity_update;",
+    """
+    CREATE TRIGGER IF NOT EXISTS check_time_range_validity_insert
+    BEFORE INSERT ON TimeRange
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN unixepoch(NEW.EndDateTime) / 60 <= unixepoch(NEW.StartDateTime) / 60 THEN
+                RAISE(ABORT, 'EndDateTime must be after StartDateTime')
+        END;
+    END;
+    """,
+
+    """
+    CREATE TRIGGER IF NOT EXISTS check_time_range_validity_update
+    BEFORE UPDATE ON TimeRange
+    FOR EACH ROW
+    BEGIN
+        SELECT CASE
+            WHEN unixepoch(NEW.EndDateTime) / 60 <= unixepoch(NEW.StartDateTime) / 60 THEN
+                RAISE(ABORT, 'EndDateTime must be after StartDateTime')
+        END;
+    END;
+    """,
+)
+
+# Per-row insert validation triggers that bulk-load mode turns off for the duration of a load.
+# The update triggers stay in place, so every row a load did not insert is still validated per row;
+# INTEGRITY_CHECKS below verify the inserted rows in a few set-based queries.
+DEFERRABLE_TRIGGERS = (
+    "check_time_range_validity_insert",
+    "ensure_positive_required_personnel_insert",
+    "validate_presence_reference_insert",
+    "validate_taskrole_reference_insert",
+    "validate_currenttaskassignment_reference_insert",
+    "validate_taskhistory_reference_insert",
+)
+
+# (violation message, checked table, query returning one row per violating row)
+# Each query only looks at rows with a rowid above :before - the checked table's MAX(rowid) when
+# the load started - and applies exactly the rule of the insert trigger it stands in for: a
+# reference is only checked for the type values the trigger knows, any other type passes.
+INTEGRITY_CHECKS = (
+    ("EndDateTime must be after StartDateTime", "TimeRange", """
+    SELECT TimeID, StartDateTime, EndDateTime FROM TimeRange
+    WHERE rowid > :before AND EndMinute <= StartMinute
+    """),
+
+    ("RequiredPersonnel cannot be negative", "RecurringTask", """
+    SELECT TaskID, RequiredPersonnel FROM RecurringTask
+    WHERE rowid > :before AND RequiredPersonnel < 0
+    """),
+
+    ("Presence.SoldierTeamTaskID does not exist in the table named by SoldierTeamTaskType", "Presence", """
+    SELECT p.SoldierTeamTaskType, p.SoldierTeamTaskID, p.TimeID
+    FROM Presence AS p
+    LEFT JOIN Soldier AS s ON p.SoldierTeamTaskType = 'Soldier' AND s.SoldierID = p.SoldierTeamTaskID
+    LEFT JOIN Team AS t ON p.SoldierTeamTaskType = 'Team' AND t.TeamID = p.SoldierTeamTaskID
+    LEFT JOIN RecurringTask AS rt ON p.SoldierTeamTaskType = 'RecurringTask' AND rt.TaskID = p.SoldierTeamTaskID
+    LEFT JOIN TemporaryTask AS tt ON p.SoldierTeamTaskType = 'TemporaryTask' AND tt.TaskID = p.SoldierTeamTaskID
+    WHERE p.rowid > :before
+      AND ((p.SoldierTeamTaskType = 'Soldier' AND s.SoldierID IS NULL)
+        OR (p.SoldierTeamTaskType = 'Team' AND t.TeamID IS NULL)
+        OR (p.SoldierTeamTaskType = 'RecurringTask' AND rt.TaskID IS NULL)
+        OR (p.SoldierTeamTaskType = 'TemporaryTask' AND tt.TaskID IS NULL))
+    """),
+
+    ("TaskRole.TaskID does not exist in the table named by TaskType", "TaskRole", """
+    SELECT r.TaskType, r.TaskID, r.SoldierOrRole, r.SoldierOrRoleID
+    FROM TaskRole AS r
+    LEFT JOIN RecurringTask AS rt ON r.TaskType = 'RecurringTask' AND rt.TaskID = r.TaskID
+    LEFT JOIN TemporaryTask AS tt ON r.TaskType = 'TemporaryTask' AND tt.TaskID = r.TaskID
+    WHERE r.rowid > :before
+      AND ((r.TaskType = 'RecurringTask' AND rt.TaskID IS NULL)
+        OR (r.TaskType = 'TemporaryTask' AND tt.TaskID IS NULL))
+    """),
+
+    ("CurrentTaskAssignment references a missing task, soldier or team", "CurrentTaskAssignment", """
+    SELECT a.TaskType, a.TaskID, a.SoldierOrTeamType, a.SoldierOrTeamID, a.TimeID
+    FROM CurrentTaskAssignment AS a
+    LEFT JOIN RecurringTask AS rt ON a.TaskType = 'RecurringTask' AND rt.TaskID = a.TaskID
+    LEFT JOIN TemporaryTask AS tt ON a.TaskType = 'TemporaryTask' AND tt.TaskID = a.TaskID
+    LEFT JOIN Soldier AS s ON a.SoldierOrTeamType = 'Soldier' AND s.SoldierID = a.SoldierOrTeamID
+    LEFT JOIN Team AS t ON a.SoldierOrTeamType = 'Team' AND t.TeamID = a.SoldierOrTeamID
+    WHERE a.rowid > :before
+      AND ((a.TaskType = 'RecurringTask' AND rt.TaskID IS NULL)
+        OR (a.TaskType = 'TemporaryTask' AND tt.TaskID IS NULL)
+        OR (a.SoldierOrTeamType = 'Soldier' AND s.SoldierID IS NULL)
+        OR (a.SoldierOrTeamType = 'Team' AND t.TeamID IS NULL))
+    """),
+
+    ("TaskHistory references a missing task, soldier or team", "TaskHistory", """
+    SELECT h.HistoryID, h.TaskType, h.TaskID, h.SoldierOrTeamType, h.SoldierOrTeamID
+    FROM TaskHistory AS h
+    LEFT JOIN RecurringTask AS rt ON h.TaskType = 'RecurringTask' AND rt.TaskID = h.TaskID
+    LEFT JOIN TemporaryTask AS tt ON h.TaskType = 'TemporaryTask' AND tt.TaskID = h.TaskID
+    LEFT JOIN Soldier AS s ON h.SoldierOrTeamType = 'Soldier' AND s.SoldierID = h.SoldierOrTeamID
+    LEFT JOIN Team AS t ON h.SoldierOrTeamType = 'Team' AND t.TeamID = h.SoldierOrTeamID
+    WHERE h.rowid > :before
+      AND ((h.TaskType = 'RecurringTask' AND rt.TaskID IS NULL)
+        OR (h.TaskType = 'TemporaryTask' AND tt.TaskID IS NULL)
+        OR (h.SoldierOrTeamType = 'Soldier' AND s.SoldierID IS NULL)
+        OR (h.SoldierOrTeamType = 'Team' AND t.TeamID IS NULL))
+    """),
+)
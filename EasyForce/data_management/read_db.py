@@ -1,16 +1,15 @@
 import sqlite3
 
-from EasyForce.common.config import DB_PATH
 from EasyForce.common.utils import initialize_table_names
+from EasyForce.data_management.db_connection import get_connection
+from EasyForce.data_management.schema_catalog import get_table_schema
 
 def display_table(table_name):
     """Display the contents of a specified table, printing first the tuple of column names
     in their creation order, then each row in that same order."""
 
-    database_name = DB_PATH
-    conn = None
     try:
-        conn = sqlite3.connect(database_name)
+        conn = get_connection()
         cursor = conn.cursor()
 
         # Execute a query to select all columns
@@ -34,9 +33,6 @@ def display_table(table_name):
 
     except sqlite3.Error as e:
         print(f"An error occurred: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 def display_all_tables():
     tables = initialize_table_names()
@@ -55,8 +51,6 @@ def get_primary_key_val_by_unique_column_val(table, unique_text_value):
         int or None: The primary key of the record if found, or None if no matching record exists.
     """
 
-    database_name = DB_PATH
-
     # Get the primary key column(s) and unique column name
     primary_key_column = get_primary_key_column_names(table)
     text_column = get_unique_column_name(table)
@@ -69,23 +63,22 @@ def get_primary_key_val_by_unique_column_val(table, unique_text_value):
         return None
 
     try:
-        with sqlite3.connect(database_name) as conn:
-            cursor = conn.cursor()
-
-            # Query to find the primary key based on the unique text column
-            query = f"""
-            SELECT {primary_key_column_str}
-            FROM {table}
-            WHERE {text_column} = ?;
-            """
-            cursor.execute(query, (unique_text_value,))
-            result = cursor.fetchone()
-
-            if result:
-                return result[0]
-            else:
-                print(f"No record found in table '{table}' with {text_column} = '{unique_text_value}'.")
-                return None
+        cursor = get_connection().cursor()
+
+        # Query to find the primary key based on the unique text column
+        query = f"""
+        SELECT {primary_key_column_str}
+        FROM {table}
+        WHERE {text_column} = ?;
+        """
+        cursor.execute(query, (unique_text_value,))
+        result = cursor.fetchone()
+
+        if result:
+            return result[0]
+        else:
+            print(f"No record found in table '{table}' with {text_column} = '{unique_text_value}'.")
+            return None
     except sqlite3.Error as e:
         print(f"An error occurred: {e}")
         return None
@@ -104,36 +97,34 @@ def get_column_value_by_primary_key(table, column, primary_key_columns, primary_
     Returns:
         The value of the specified column if found, or None if no matching record exists.
     """
-    database_name = DB_PATH
     if len(primary_key_columns) != len(primary_key_values):
         print("Error: The number of PK columns does not match the number of PK values.")
         return None
 
     try:
-        with sqlite3.connect(database_name) as conn:
-            cursor = conn.cursor()
-
-            # Build the WHERE clause dynamically based on the tuple of PK columns
-            where_clause = " AND ".join([f"{col} = ?" for col in primary_key_columns])
-
-            # Construct the SQL query
-            query = f"""
-            SELECT {column}
-            FROM {table}
-            WHERE {where_clause};
-            """
-
-            cursor.execute(query, primary_key_values)
-            result = cursor.fetchone()
-
-            if result:
-                return result[0]
-            else:
-                print(
-                    f"No record found in table '{table}' "
-                    f"with PK columns {primary_key_columns} = {primary_key_values}."
-                )
-                return None
+        cursor = get_connection().cursor()
+
+        # Build the WHERE clause dynamically based on the tuple of PK columns
+        where_clause = " AND ".join([f"{col} = ?" for col in primary_key_columns])
+
+        # Construct the SQL query
+        query = f"""
+        SELECT {column}
+        FROM {table}
+        WHERE {where_clause};
+        """
+
+        cursor.execute(query, primary_key_values)
+        result = cursor.fetchone()
+
+        if result:
+            return result[0]
+        else:
+            print(
+                f"No record found in table '{table}' "
+                f"with PK columns {primary_key_columns} = {primary_key_values}."
+            )
+            return None
     except sqlite3.Error as e:
         print(f"An error occurred: {e}")
         return None
@@ -142,48 +133,13 @@ def get_unique_column_name(table):
     """
     Returns the name of the column that is defined as UNIQUE in the specified table.
     If no UNIQUE column is found or the table does not exist, returns None.
+    Read from the cached schema catalog, not from the PRAGMAs on every call.
     """
-
-    # If the table has only a composite key (like SoldierRole),
-    # and no single unique column, just return None immediately.
-    if table in ("SoldierRole", "Presence", "TaskRole"):
-        return None
-
-    database_name = DB_PATH
-    try:
-        with sqlite3.connect(database_name) as conn:
-            cursor = conn.cursor()
-
-            # 1) Ensure the table exists
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name=?;",
-                (table,)
-            )
-            if not cursor.fetchone():
-                print(f"Table '{table}' does not exist in the database.")
-                return None
-
-            # 2) Retrieve all indexes on the table
-            cursor.execute(f"PRAGMA index_list({table});")
-            indexes = cursor.fetchall()
-
-            # 3) Search for an index that is marked as unique
-            for idx in indexes:
-                index_name = idx[1]
-                is_unique = idx[2]
-                if is_unique == 1:
-                    # 4) Retrieve the columns of that unique index
-                    cursor.execute(f"PRAGMA index_info({index_name});")
-                    index_info = cursor.fetchall()
-                    if index_info:
-                        # 5) Return the first column name from that unique index
-                        return index_info[0][2]
-
-            return None
-
-    except sqlite3.Error as e:
-        print(f"An error occurred: {e}")
+    schema = get_table_schema(table)
+    if schema is None:
+        print(f"Table '{table}' does not exist in the database.")
         return None
+    return schema.unique_columns[0] if schema.unique_columns else None
 
 def get_column_values(table, column):
     """
@@ -196,27 +152,24 @@ def get_column_values(table, column):
     Returns:
         list: A list of values from the specified column, or None if an error occurs or no values exist.
     """
-    database_name = DB_PATH
     try:
-        with sqlite3.connect(database_name) as conn:
-            cursor = conn.cursor()
-
-            # Construct the SQL query
-            query = f"SELECT {column} FROM {table};"
-            cursor.execute(query)
-            results = cursor.fetchall()
-
-            if results:
-                # Extract the first element from each row to return a flat list
-                return [row[0] for row in results]
-            else:
-                print(f"No records found in table '{table}' for column '{column}'.")
-                return None
+        cursor = get_connection().cursor()
+
+        # Construct the SQL query
+        query = f"SELECT {column} FROM {table};"
+        cursor.execute(query)
+        results = cursor.fetchall()
+
+        if results:
+            # Extract the first element from each row to return a flat list
+            return [row[0] for row in results]
+        else:
+            print(f"No records found in table '{table}' for column '{column}'.")
+            return None
     except sqlite3.Error as e:
         print(f"An error occurred: {e}")
         return None
 
-################ need to rewrite it ################################
 def get_primary_key_column_names(table):
     """
     Get the primary key column names for a specified table.
@@ -225,20 +178,8 @@ def get_primary_key_column_names(table):
         table (str): The name of the table.
 
     Returns:
-        tuple or None: A tuple of primary key column names if the table exists in the mapping,
+        tuple or None: A tuple of primary key column names (in key order) if the table exists,
         otherwise None.
     """
-    primary_keys = {
-        "TimeRange": ("TimeID",),
-        "Team": ("TeamID",),
-        "Soldier": ("SoldierID",),
-        "Role": ("RoleID",),
-        "TemporaryTask": ("TaskID",),
-        "RecurringTask": ("TaskID",),
-        "Presence": ("SoldierTeamTaskType", "SoldierTeamTaskID", "TimeID"),
-        "SoldierRole": ("SoldierID", "RoleID"),
-        "TaskRole": ("TaskType", "TaskID","SoldierOrRole", "SoldierOrRoleID"),
-        "CurrentTaskAssignment": ("TaskType", "TaskID", "SoldierOrTeamType", "SoldierOrTeamID", "TimeID"),
-        "TaskHistory": ("HistoryID",),
-    }
-    return primary_keys[table] if table in primary_keys else None
+    schema = get_table_schema(table)
+    return schema.primary_key if schema else None
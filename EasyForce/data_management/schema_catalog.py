@@ -0,0 +1,76 @@
+"""
+schema_catalog.py
+
+Cached description of the database schema: columns and their declared types, generated columns,
+primary keys, UNIQUE columns and indexes of every table.
+
+The catalog of a connection is read once (sqlite_master plus PRAGMA table_xinfo / index_list /
+index_info for every table) and reused until the schema changes; a change is detected through
+PRAGMA schema_version, which SQLite bumps on every CREATE / DROP / ALTER.
+read_db.py and BaseEntity read schema details from here instead of querying the PRAGMAs each time.
+"""
+
+import threading
+from collections import namedtuple
+
+from EasyForce.data_management.db_connection import get_connection
+
+# name: index name, columns: tuple of column names, unique: bool,
+# origin: 'c' (CREATE INDEX), 'u' (UNIQUE constraint) or 'pk' (PRIMARY KEY constraint)
+IndexInfo = namedtuple("IndexInfo", "name columns unique origin")
+
+# columns: tuple in creation order (generated columns included), column_types: {column: declared type},
+# generated_columns: tuple of GENERATED ALWAYS AS columns, primary_key: tuple in key order,
+# unique_columns: tuple of single-column UNIQUE constraints, indexes: tuple of IndexInfo
+TableSchema = namedtuple("TableSchema",
+                         "name columns column_types generated_columns primary_key unique_columns indexes")
+
+# Per thread, like the connections: the connection the catalog was read from,
+# its schema_version at that time and the catalog itself ({table name: TableSchema})
+_local = threading.local()
+
+
+def _load_table(cursor, table: str) -> TableSchema:
+    # table_xinfo = table_info plus a 'hidden' flag: 2 / 3 for VIRTUAL / STORED generated columns
+    table_info = cursor.execute(f"PRAGMA table_xinfo({table})").fetchall()
+    columns = tuple(row[1] for row in table_info)
+    column_types = {row[1]: row[2] for row in table_info}
+    generated_columns = tuple(row[1] for row in table_info if row[6] in (2, 3))
+    primary_key = tuple(row[1] for row in sorted((row for row in table_info if row[5]), key=lambda row: row[5]))
+
+    indexes = []
+    for _, index_name, unique, origin, _ in cursor.execute(f"PRAGMA index_list({table})").fetchall():
+        index_columns = tuple(row[2] for row in cursor.execute(f"PRAGMA index_info({index_name})").fetchall())
+        indexes.append(IndexInfo(index_name, index_columns, bool(unique), origin))
+    unique_columns = tuple(index.columns[0] for index in indexes
+                           if index.unique and index.origin != "pk" and len(index.columns) == 1)
+
+    return TableSchema(table, columns, column_types, generated_columns, primary_key, unique_columns, tuple(indexes))
+
+
+def get_catalog() -> dict:
+    """
+    Returns {table name: TableSchema} for the current thread's connection,
+    reloading it only if the schema changed since it was last read.
+    """
+    conn = get_connection()
+    schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+    if getattr(_local, "conn", None) is conn and _local.schema_version == schema_version:
+        return _local.catalog
+
+    cursor = conn.cursor()
+    tables = [row[0] for row in cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'").fetchall()]
+    catalog = {table: _load_table(cursor, table) for table in tables}
+    _local.conn, _local.schema_version, _local.catalog = conn, schema_version, catalog
+    return catalog
+
+
+def get_table_schema(table: str):
+    """Returns the TableSchema of 'table', or None if the table does not exist."""
+    return get_catalog().get(table)
+
+
+def invalidate_catalog():
+    """Forgets the current thread's catalog, so the next lookup reads the schema again."""
+    _local.conn = None
@@ -0,0 +1,78 @@
+"""
+snapshot.py
+
+Loads and saves whole-database snapshots with the SQLite backup API (sqlite3.Connection.backup).
+
+Together with the in-memory mode (config.DB_PATH = config.MEMORY_DB_PATH, see db_connection.py)
+this lets a session or a simulation run without disk I/O:
+
+    config.DB_PATH = config.MEMORY_DB_PATH
+    load_snapshot()          # my_database.db -> memory
+    ...                      # every read and write stays in memory
+    save_snapshot()          # memory -> my_database.db
+
+Both functions work on any database, so a file database can be snapshotted the same way.
+"""
+
+import os
+import sqlite3
+
+from EasyForce.common import config
+from EasyForce.data_management.db_connection import get_connection, in_transaction
+from EasyForce.data_management.schema_catalog import invalidate_catalog
+from EasyForce.data_management.data_structure.entity_cache import active_cache
+
+
+def load_snapshot(path: str = None) -> bool:
+    """
+    Replaces the contents of the current database with the database file at 'path'.
+
+    Args:
+        path: The snapshot file; defaults to config.SNAPSHOT_PATH.
+    Returns:
+        bool: True if the snapshot was loaded, False if the file does not exist or could not be read.
+    """
+    path = config.SNAPSHOT_PATH if path is None else path
+    if in_transaction():
+        raise RuntimeError("A snapshot cannot be loaded inside a transaction.")
+    if not os.path.exists(path):
+        return False
+    try:
+        source = sqlite3.connect(path)
+        try:
+            source.backup(get_connection())
+        finally:
+            source.close()
+    except sqlite3.Error as e:
+        print(f"Snapshot Error: could not load '{path}': {e}")
+        return False
+    # The schema and every cached row may have changed
+    invalidate_catalog()
+    cache = active_cache()
+    if cache is not None:
+        cache.clear()
+    return True
+
+
+def save_snapshot(path: str = None) -> bool:
+    """
+    Writes the current database to the file at 'path', replacing its contents.
+
+    Args:
+        path: The snapshot file; defaults to config.SNAPSHOT_PATH.
+    Returns:
+        bool: True if the snapshot was written.
+    """
+    path = config.SNAPSHOT_PATH if path is None else path
+    if in_transaction():
+        raise RuntimeError("A snapshot cannot be saved inside a transaction.")
+    try:
+        target = sqlite3.connect(path)
+        try:
+            get_connection().backup(target)
+        finally:
+            target.close()
+    except sqlite3.Error as e:
+        print(f"Snapshot Error: could not save '{path}': {e}")
+        return False
+    return True
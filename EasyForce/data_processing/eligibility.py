@@ -0,0 +1,173 @@
+"""
+eligibility.py
+
+The soldier x shift eligibility matrix shared by the scheduling solvers (see schedule_logic.py).
+
+A soldier is eligible for a shift when:
+- the shift lies inside one of the soldier's on-duty periods (Presence, see shift_slots.presence_timeline()),
+- the task's TaskRole rules do not exclude the soldier or one of the soldier's roles
+  (RoleEnforcementType 0), and
+- the shift does not overlap a CurrentTaskAssignment the schedule keeps.
+Must-include rules do not restrict anyone; the solvers use them to choose among the eligible.
+
+The matrix is computed with whole-row operations, never soldier-by-shift checks in Python:
+with NumPy, a boolean array (soldiers x slots) built with searchsorted and masks; without it,
+one int bitset per soldier (bit j = slot j) built from prefix masks of the slots sorted by start
+and by end. NumPy is optional - both give the same matrix.
+
+    matrix = EligibilityMatrix.build(data, slots)
+    matrix.candidates(0)        # soldier ids eligible for slots[0], in id order
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+try:
+    import numpy
+except ImportError:  # optional: the bitset implementation is used instead
+    numpy = None
+
+
+class EligibilityMatrix:
+    """
+    Boolean soldiers x slots matrix. 'soldiers' (sorted ids) and 'slots' give the row and column order;
+    'backend' is "numpy" or "bitset".
+    """
+
+    def __init__(self, soldiers: list, slots: list, backend: str, rows):
+        self.soldiers = soldiers
+        self.slots = slots
+        self.backend = backend
+        self._rows = rows
+        self._positions = {soldier_id: i for i, soldier_id in enumerate(soldiers)}
+
+    @classmethod
+    def build(cls, data, slots: list, use_numpy: bool = None) -> "EligibilityMatrix":
+        """
+        Args:
+            data: The schedule's ScheduleData (soldiers, roles, availability, rules, kept assignments).
+            slots: The ShiftSlots of the columns.
+            use_numpy: Force (True) or avoid (False) NumPy; by default it is used when installed.
+        """
+        if use_numpy and numpy is None:
+            raise ValueError("NumPy is not installed.")
+        use_numpy = numpy is not None if use_numpy is None else use_numpy
+        soldiers = sorted(data.soldiers)
+        slots = list(slots)
+        builder = (_NumpyRows if use_numpy else _BitsetRows)(len(soldiers), slots)
+
+        for i, soldier_id in enumerate(soldiers):
+            builder.set_available(i, [(period.start, period.end) for period in data.availability[soldier_id] if period.value])
+            for start, end in data.busy.get(soldier_id, ()):
+                builder.exclude_overlapping(i, start, end)
+
+        positions = {soldier_id: i for i, soldier_id in enumerate(soldiers)}
+        holders = defaultdict(list)
+        for i, soldier_id in enumerate(soldiers):
+            for role_id in data.soldier_roles.get(soldier_id, ()):
+                holders[role_id].append(i)
+        for task in builder.tasks():
+            rules = data.rules.get(task)
+            if rules is None:
+                continue
+            excluded = {positions[soldier_id] for soldier_id in rules.banned_soldiers if soldier_id in positions}
+            for role_id in rules.banned_roles:
+                excluded.update(holders.get(role_id, ()))
+            if excluded:
+                builder.exclude_task(sorted(excluded), task)
+        return cls(soldiers, slots, "numpy" if use_numpy else "bitset", builder.rows)
+
+    def is_eligible(self, soldier_id, slot_index: int) -> bool:
+        i = self._positions[soldier_id]
+        if self.backend == "numpy":
+            return bool(self._rows[i, slot_index])
+        return bool(self._rows[i] >> slot_index & 1)
+
+    def candidates(self, slot_index: int) -> list:
+        """Returns the ids of the soldiers eligible for slots[slot_index], in id order."""
+        if self.backend == "numpy":
+            return [self.soldiers[i] for i in numpy.flatnonzero(self._rows[:, slot_index]).tolist()]
+        return [soldier_id for soldier_id, row in zip(self.soldiers, self._rows) if row >> slot_index & 1]
+
+    def count(self) -> int:
+        """Returns the number of eligible (soldier, slot) pairs."""
+        if self.backend == "numpy":
+            return int(self._rows.sum())
+        return sum(bin(row).count("1") for row in self._rows)
+
+
+class _BitsetRows:
+    """Internal helper: builds one int bitset of eligible slots per soldier."""
+
+    def __init__(self, soldier_count: int, slots: list):
+        self._all = (1 << len(slots)) - 1
+        self._task_masks = defaultdict(int)
+        for j, slot in enumerate(slots):
+            self._task_masks[(slot.task_type, slot.task_id)] |= 1 << j
+        self._starts, self._start_prefix = self._prefixes([slot.start for slot in slots])
+        self._ends, self._end_prefix = self._prefixes([slot.end for slot in slots])
+        self.rows = [0] * soldier_count
+
+    @staticmethod
+    def _prefixes(values: list) -> tuple:
+        """Internal helper: (sorted values, masks) where masks[k] has the bits of the k slots with the smallest values."""
+        order = sorted(range(len(values)), key=values.__getitem__)
+        masks = [0]
+        for j in order:
+            masks.append(masks[-1] | 1 << j)
+        return [values[j] for j in order], masks
+
+    def _starting_before(self, minute) -> int:
+        return self._start_prefix[bisect_left(self._starts, minute)]
+
+    def _ending_by(self, minute) -> int:
+        return self._end_prefix[bisect_right(self._ends, minute)]
+
+    def tasks(self):
+        return self._task_masks.keys()
+
+    def set_available(self, i: int, periods: list):
+        row = 0
+        for start, end in periods:
+            row |= (self._all & ~self._starting_before(start)) & self._ending_by(end)
+        self.rows[i] = row
+
+    def exclude_overlapping(self, i: int, start, end):
+        self.rows[i] &= ~(self._starting_before(end) & ~self._ending_by(start))
+
+    def exclude_task(self, soldier_indices: list, task):
+        mask = ~self._task_masks[task]
+        for i in soldier_indices:
+            self.rows[i] &= mask
+
+
+class _NumpyRows:
+    """Internal helper: builds a boolean soldiers x slots NumPy array."""
+
+    def __init__(self, soldier_count: int, slots: list):
+        self._starts = numpy.array([slot.start for slot in slots], dtype=numpy.int64)
+        self._ends = numpy.array([slot.end for slot in slots], dtype=numpy.int64)
+        tasks = [(slot.task_type, slot.task_id) for slot in slots]
+        self._task_codes = {task: code for code, task in enumerate(dict.fromkeys(tasks))}
+        self._slot_tasks = numpy.array([self._task_codes[task] for task in tasks], dtype=numpy.int64)
+        self.rows = numpy.zeros((soldier_count, len(slots)), dtype=bool)
+
+    def tasks(self):
+        return self._task_codes.keys()
+
+    def set_available(self, i: int, periods: list):
+        if not periods:
+            return
+        starts = numpy.array([start for start, _ in periods], dtype=numpy.int64)
+        ends = numpy.array([end for _, end in periods], dtype=numpy.int64)
+        # The only period that can hold a slot is the first one ending at or after the slot's end
+        position = numpy.searchsorted(ends, self._ends, side="left")
+        inside = position < len(ends)
+        self.rows[i, inside] = starts[position[inside]] <= self._starts[inside]
+
+    def exclude_overlapping(self, i: int, start, end):
+        self.rows[i] &= (self._starts >= end) | (self._ends <= start)
+
+    def exclude_task(self, soldier_indices: list, task):
+        columns = numpy.flatnonzero(self._slot_tasks == self._task_codes[task])
+        self.rows[numpy.ix_(soldier_indices, columns)] = False
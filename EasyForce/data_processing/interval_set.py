@@ -0,0 +1,153 @@
+"""
+interval_set.py
+
+An in-memory set of labelled, non-overlapping intervals, used to merge and split an entity's
+presence / absence periods without going back to the database for every overlapping row.
+
+Intervals are closed: [start, end] with start < end, and two intervals that only touch
+(one's end equals the other's start) still blend, as in Presence merging. Endpoints can be
+any comparable values; Presence uses epoch minutes.
+
+    timeline = IntervalSet([Interval(0, 60, 1), Interval(60, 120, 1), Interval(200, 300, 0)])
+    list(timeline)        # [Interval(0, 120, 1), Interval(200, 300, 0)]
+    timeline.assign(100, 250, 0)
+    list(timeline)        # [Interval(0, 100, 1), Interval(100, 300, 0)]
+
+Building a set sorts its intervals once (O(n log n)); assign() locates the affected intervals
+with a binary search and only rewrites those.
+"""
+
+import heapq
+from bisect import bisect_left
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional
+
+
+class Interval(NamedTuple):
+    start: Any
+    end: Any
+    value: Any
+
+
+class IntervalSet:
+    """
+    Sorted, disjoint labelled intervals. Same-valued intervals that overlap or touch are kept
+    merged; where intervals with different values overlap, the one that starts later wins
+    on the common part (assign() always wins).
+    """
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self._intervals = self._normalize(intervals)
+        self._ends = [interval.end for interval in self._intervals]
+
+    @staticmethod
+    def _normalize(intervals: Iterable[Interval]) -> List[Interval]:
+        """Internal helper: one sorted sweep that turns arbitrary intervals into disjoint ones."""
+        pending = [Interval(*interval) for interval in intervals if interval[0] < interval[1]]
+        heapq.heapify(pending)
+        result = []
+        while pending:
+            current = heapq.heappop(pending)
+            if not result or result[-1].end < current.start:
+                result.append(current)
+                continue
+            last = result[-1]
+            if last.value == current.value:
+                if current.end > last.end:
+                    result[-1] = last._replace(end=current.end)
+                continue
+            # Different values overlap: the later start wins; the earlier one's remainder comes back later
+            if last.end > current.end:
+                heapq.heappush(pending, Interval(current.end, last.end, last.value))
+            if last.start < current.start:
+                result[-1] = last._replace(end=current.start)
+            else:
+                result.pop()
+            if result and result[-1].value == current.value and result[-1].end == current.start:
+                result[-1] = result[-1]._replace(end=current.end)
+            else:
+                result.append(current)
+        return result
+
+    def __iter__(self) -> Iterator[Interval]:
+        return iter(self._intervals)
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IntervalSet) and self._intervals == other._intervals
+
+    def __repr__(self):
+        return f"IntervalSet({self._intervals!r})"
+
+    def copy(self) -> "IntervalSet":
+        clone = object.__new__(IntervalSet)
+        clone._intervals = list(self._intervals)
+        clone._ends = list(self._ends)
+        return clone
+
+    def _blending_slice(self, start, end) -> slice:
+        """Internal helper: the positions of the intervals that overlap or touch [start, end]."""
+        first = bisect_left(self._ends, start)
+        last = first
+        while last < len(self._intervals) and self._intervals[last].start <= end:
+            last += 1
+        return slice(first, last)
+
+    def overlapping(self, start, end) -> List[Interval]:
+        """Returns the intervals that overlap or touch [start, end], in order."""
+        return self._intervals[self._blending_slice(start, end)]
+
+    def value_at(self, point) -> Optional[Any]:
+        """Returns the value of the interval containing 'point', or None."""
+        position = bisect_left(self._ends, point)
+        if position < len(self._intervals) and self._intervals[position].start <= point:
+            return self._intervals[position].value
+        return None
+
+    def covering(self, start, end) -> Optional[Any]:
+        """Returns the value of the interval that contains all of [start, end], or None if no single interval does."""
+        position = bisect_left(self._ends, end)
+        if position < len(self._intervals) and self._intervals[position].start <= start:
+            return self._intervals[position].value
+        return None
+
+    def assign(self, start, end, value) -> Interval:
+        """
+        Gives [start, end] the value 'value': same-valued intervals that overlap or touch it are
+        merged into it, and intervals with another value are cut back (or split in two) around it.
+
+        Returns:
+            Interval: the interval now holding [start, end] (after merging).
+        """
+        if not start < end:
+            raise ValueError(f"An interval must start before it ends ({start} >= {end}).")
+        blending = self._blending_slice(start, end)
+        merged_start, merged_end = start, end
+        before, after = [], []
+        for interval in self._intervals[blending]:
+            if interval.value == value:
+                merged_start = min(merged_start, interval.start)
+                merged_end = max(merged_end, interval.end)
+                continue
+            if interval.start < start:
+                before.append(interval._replace(end=min(interval.end, start)))
+            if interval.end > end:
+                after.append(interval._replace(start=max(interval.start, end)))
+        merged = Interval(merged_start, merged_end, value)
+        replacement = before + [merged] + after
+        self._intervals[blending] = replacement
+        self._ends[blending] = [interval.end for interval in replacement]
+        return merged
+
+
+def diff(old: Iterable[Interval], new: Iterable[Interval]) -> tuple:
+    """
+    Compares two collections of intervals.
+
+    Returns:
+        tuple: (removed, added) - the intervals only in 'old' and the intervals only in 'new', in order.
+    """
+    old, new = list(old), list(new)
+    old_set, new_set = set(old), set(new)
+    return [interval for interval in old if interval not in new_set], [interval for interval in new if interval not in old_set]
@@ -0,0 +1,94 @@
+"""
+min_cost_flow.py
+
+A small min-cost max-flow solver (successive shortest paths, Dijkstra with Johnson potentials),
+used by the 'flow' scheduling solver (see schedule_logic.assign_min_cost_flow()).
+
+Edge costs must be non-negative. solve() sends as much flow as possible from the source to the sink
+and, among the maximum flows, finds one of minimum total cost.
+
+    network = MinCostFlow(4)
+    edge = network.add_edge(0, 1, capacity=1, cost=3)
+    ...
+    flow, cost = network.solve(source=0, sink=3)
+    network.flow(edge)       # 0 or 1
+"""
+
+import heapq
+
+INFINITY = float("inf")
+
+
+class MinCostFlow:
+    def __init__(self, node_count: int):
+        self._adjacent = [[] for _ in range(node_count)]
+        # Edge e and its residual twin e ^ 1 are stored side by side
+        self._to, self._capacity, self._cost = [], [], []
+
+    def add_node(self) -> int:
+        """Adds a node and returns its index."""
+        self._adjacent.append([])
+        return len(self._adjacent) - 1
+
+    def add_edge(self, source: int, target: int, capacity: int, cost: int) -> int:
+        """Adds a directed edge and returns its index (for flow())."""
+        if cost < 0:
+            raise ValueError(f"Edge costs must be non-negative ({cost}).")
+        edge = len(self._to)
+        self._to += [target, source]
+        self._capacity += [capacity, 0]
+        self._cost += [cost, -cost]
+        self._adjacent[source].append(edge)
+        self._adjacent[target].append(edge + 1)
+        return edge
+
+    def flow(self, edge: int) -> int:
+        """Returns the flow on an edge after solve()."""
+        return self._capacity[edge ^ 1]
+
+    def solve(self, source: int, sink: int) -> tuple:
+        """
+        Returns:
+            tuple: (flow, cost) of a minimum-cost maximum flow from 'source' to 'sink'.
+        """
+        to, capacity, cost, adjacent = self._to, self._capacity, self._cost, self._adjacent
+        node_count = len(adjacent)
+        potential = [0] * node_count
+        total_flow = total_cost = 0
+        while True:
+            distance = [INFINITY] * node_count
+            via = [-1] * node_count
+            distance[source] = 0
+            queue = [(0, source)]
+            while queue:
+                node_distance, node = heapq.heappop(queue)
+                if node_distance > distance[node]:
+                    continue
+                node_potential = potential[node]
+                for edge in adjacent[node]:
+                    if capacity[edge]:
+                        target = to[edge]
+                        candidate = node_distance + cost[edge] + node_potential - potential[target]
+                        if candidate < distance[target]:
+                            distance[target] = candidate
+                            via[target] = edge
+                            heapq.heappush(queue, (candidate, target))
+            if distance[sink] == INFINITY:
+                return total_flow, total_cost
+            for node in range(node_count):
+                if distance[node] < INFINITY:
+                    potential[node] += distance[node]
+
+            bottleneck, node = INFINITY, sink
+            while node != source:
+                edge = via[node]
+                bottleneck = min(bottleneck, capacity[edge])
+                node = to[edge ^ 1]
+            node = sink
+            while node != source:
+                edge = via[node]
+                capacity[edge] -= bottleneck
+                capacity[edge ^ 1] += bottleneck
+                total_cost += bottleneck * cost[edge]
+                node = to[edge ^ 1]
+            total_flow += bottleneck
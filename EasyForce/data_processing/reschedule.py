@@ -0,0 +1,176 @@
+"""
+reschedule.py
+
+Incremental rescheduling: after one change (a soldier leaving base, a task's TaskRole rules)
+only the shifts that change touches are repaired, instead of rerunning schedule_shifts() over
+the whole horizon.
+
+    reschedule_soldier(soldier_id, departure, return_time)     # after an 'out' Presence
+    reschedule_task(TEMPORARY_TASK_TABLE, task_id)              # after TaskRole changes
+
+The interface calls them once a change has been committed (see the reschedule_after_* hooks of
+add_relationships.py, used by the update flows). Shifts that have already started are never changed.
+
+A repair:
+1. finds the CurrentTaskAssignment rows the change touches and takes every shift they belong to
+   (for a task, also the shifts it should have in the window but nobody is assigned to),
+2. loads the schedule data (schedule_logic.ScheduleData) for just the span of those shifts,
+3. re-fills each shift with the greedy rules (schedule_logic), keeping the soldiers who are still
+   eligible, and
+4. writes the difference - the rows removed and the rows added - in one transaction.
+Fairness (the least-loaded soldier first) counts the assignments within REPAIR_FAIRNESS_DAYS days.
+"""
+
+import time
+from collections import namedtuple, defaultdict
+from datetime import datetime
+
+from EasyForce.common.constants import SOLDIER_TABLE, SCHEDULE_HORIZON_DAYS, REPAIR_FAIRNESS_DAYS
+from EasyForce.common.utils import to_epoch_minutes, from_epoch_minutes
+from EasyForce.data_management.data_structure.data_modification import BaseEntity
+from EasyForce.data_management.data_structure.entities_classes import TimeRange
+from EasyForce.data_management.data_structure.relationships_classes import CurrentTaskAssignment
+from EasyForce.data_processing.eligibility import EligibilityMatrix
+from EasyForce.data_processing.schedule_logic import (
+    ScheduleData, assignments_in_horizon, fill_greedy, task_slots, time_range_ids
+)
+from EasyForce.data_processing.shift_slots import MINUTES_PER_DAY, ShiftSlot
+
+# What a repair did: shifts re-filled, assignment rows removed / added, seconds taken
+RepairReport = namedtuple("RepairReport", "slots removed added seconds")
+
+
+def reschedule_soldier(soldier_id, start, end, now=None) -> RepairReport:
+    """
+    Repairs the shifts of 'soldier_id' that overlap [start, end] (datetimes or ISO strings),
+    e.g. after recording that the soldier is off base then. Shifts that started before 'now'
+    (default: the current time) are left as they are, as in reschedule_task().
+
+    Returns:
+        RepairReport: or None if the repair could not be written.
+    """
+    first = to_epoch_minutes(datetime.now() if now is None else now)
+    rows = CurrentTaskAssignment.query().where("SoldierOrTeamType", "=", SOLDIER_TABLE) \
+        .where("SoldierOrTeamID", "=", soldier_id).overlapping(start, end).all()
+    time_ranges = TimeRange.get_many_by_ids([{"TimeID": time_id} for time_id in {row.TimeID for row in rows}])
+    return _safe_repair([row for row in rows
+                         if (row.TimeID,) in time_ranges and time_ranges[(row.TimeID,)].StartMinute >= first])
+
+
+def reschedule_task(task_type: str, task_id, start=None, end=None) -> RepairReport:
+    """
+    Repairs the shifts of a task that start within [start, end], e.g. after its TaskRole rules
+    changed. By default the window is the span of the stored schedule's upcoming shifts, within
+    SCHEDULE_HORIZON_DAYS days from now. Besides the shifts that already have assignments, every
+    shift the task should have in the window (from its presence, see schedule_logic.task_slots())
+    is filled, so a shift nobody could take before is staffed once the new rules allow it.
+
+    Returns:
+        RepairReport: or None if the repair could not be written.
+    """
+    first = to_epoch_minutes(datetime.now() if start is None else start)
+    last = first + SCHEDULE_HORIZON_DAYS * MINUTES_PER_DAY if end is None else to_epoch_minutes(end)
+    if start is None or end is None:
+        # By default a repair stays within the span the stored schedule has planned, so it never
+        # staffs shifts before or after the horizon of the last schedule run
+        planned = [time_range for _, time_range in assignments_in_horizon(first, last) if time_range.StartMinute >= first]
+        if start is None:
+            first = min((time_range.StartMinute for time_range in planned), default=first)
+        if end is None:
+            last = max((time_range.EndMinute for time_range in planned), default=first)
+    start, end = from_epoch_minutes(first), from_epoch_minutes(last)
+    rows = CurrentTaskAssignment.query().where("TaskType", "=", task_type).where("TaskID", "=", task_id) \
+        .where("SoldierOrTeamType", "=", SOLDIER_TABLE).overlapping(start, end).all()
+    time_ranges = TimeRange.get_many_by_ids([{"TimeID": time_id} for time_id in {row.TimeID for row in rows}])
+    rows = [row for row in rows if (row.TimeID,) in time_ranges]
+    # Shifts already under way are left as they are, and so is the rest of their period: a slot
+    # generated from 'first' (e.g. a TemporaryTask period clipped to the window) must not staff them twice
+    under_way = [time_ranges[(row.TimeID,)] for row in rows if time_ranges[(row.TimeID,)].StartMinute < first]
+    rows = [row for row in rows if time_ranges[(row.TimeID,)].StartMinute >= first]
+    if last <= first:
+        return _safe_repair(rows)
+    data = ScheduleData(first, max([last] + [time_ranges[(row.TimeID,)].EndMinute for row in rows]))
+    slots = [slot for slot in task_slots(data, task_type, task_id) if slot.start < last
+             and not any(slot.start < time_range.EndMinute and time_range.StartMinute < slot.end for time_range in under_way)]
+    return _safe_repair(rows, slots, data)
+
+
+def _safe_repair(rows: list, slots=(), data: ScheduleData = None) -> RepairReport:
+    """Internal helper: _repair() that reports a failed write instead of raising."""
+    try:
+        return _repair(rows, slots, data)
+    except RuntimeError as e:
+        print(f"Scheduling Error: {e}")
+        return None
+
+
+def _repair(rows: list, slots=(), data: ScheduleData = None) -> RepairReport:
+    """
+    Internal helper: re-fills the shifts the CurrentTaskAssignment 'rows' belong to, plus the ShiftSlot
+    'slots' (which may have no rows yet), and writes the difference. 'data' must cover every one of
+    these shifts; it is loaded for their span when not given.
+    """
+    started = time.perf_counter()
+    if not rows and not slots:
+        return RepairReport(0, 0, 0, time.perf_counter() - started)
+    # A shift is (task type, task id, start minute, end minute): {shift: [ShiftSlot, TimeID of its rows]}
+    time_ranges = TimeRange.get_many_by_ids([{"TimeID": time_id} for time_id in {row.TimeID for row in rows}])
+    shifts = {}
+    for row in rows:
+        time_range = time_ranges[(row.TimeID,)]
+        shifts.setdefault((row.TaskType, row.TaskID, time_range.StartMinute, time_range.EndMinute), [None, row.TimeID])
+    for slot in slots:
+        shifts.setdefault((slot.task_type, slot.task_id, slot.start, slot.end), [None, None])[0] = slot
+    window_start = min(key[2] for key in shifts)
+    window_end = max(key[3] for key in shifts)
+    if data is None:
+        data = ScheduleData(window_start, window_end)
+    for key, shift in shifts.items():
+        if shift[0] is None:
+            shift[0] = ShiftSlot(*key, data.required_personnel(key[0], key[1]))
+
+    # Every row of the repaired shifts is open again; all other assignments stay and occupy their soldiers
+    current = defaultdict(list)
+    data.busy = defaultdict(list)
+    for assignment, time_range in data.assignments:
+        key = (assignment.TaskType, assignment.TaskID, time_range.StartMinute, time_range.EndMinute)
+        if key in shifts:
+            current[key].append(assignment)
+        else:
+            data.busy[assignment.SoldierOrTeamID].append((time_range.StartMinute, time_range.EndMinute))
+
+    ordered = sorted(shifts.items(), key=lambda item: (item[1][0].start, item[1][0].end, item[0]))
+    matrix = EligibilityMatrix.build(data, [slot for _, (slot, _) in ordered])
+    load = _recent_load(window_start, window_end, data.soldiers)
+    free_from = {}
+    removed, staffed = [], []
+    for j, (key, (slot, time_id)) in enumerate(ordered):
+        on_shift = {assignment.SoldierOrTeamID: assignment for assignment in current[key]}
+        chosen = fill_greedy(data, slot, matrix.candidates(j), free_from, load, keep=frozenset(on_shift))
+        removed += [assignment for soldier_id, assignment in on_shift.items() if soldier_id not in chosen]
+        new_soldiers = [soldier_id for soldier_id in chosen if soldier_id not in on_shift]
+        if new_soldiers:
+            staffed.append((slot, time_id, new_soldiers))
+
+    added = []
+    if removed or staffed:
+        with BaseEntity.transaction():
+            # Shifts that had no rows get a TimeRange now, reused if the exact period exists
+            time_ids = time_range_ids({(slot.start, slot.end) for slot, time_id, _ in staffed if time_id is None})
+            added = [CurrentTaskAssignment(TaskType=slot.task_type, TaskID=slot.task_id, SoldierOrTeamType=SOLDIER_TABLE,
+                                           SoldierOrTeamID=soldier_id,
+                                           TimeID=time_id if time_id is not None else time_ids[(slot.start, slot.end)])
+                     for slot, time_id, new_soldiers in staffed for soldier_id in new_soldiers]
+            if None in CurrentTaskAssignment.delete_many(removed) or None in CurrentTaskAssignment.add_many(added):
+                raise RuntimeError("Could not write the repaired assignments.")
+    return RepairReport(len(shifts), len(removed), len(added), time.perf_counter() - started)
+
+
+def _recent_load(window_start: int, window_end: int, soldier_ids) -> dict:
+    """Internal helper: {soldier id: minutes assigned} within REPAIR_FAIRNESS_DAYS days around the window."""
+    margin = REPAIR_FAIRNESS_DAYS * MINUTES_PER_DAY
+    load = dict.fromkeys(soldier_ids, 0)
+    for assignment, time_range in assignments_in_horizon(window_start - margin, window_end + margin):
+        if assignment.SoldierOrTeamID in load:
+            load[assignment.SoldierOrTeamID] += time_range.EndMinute - time_range.StartMinute
+    return load
@@ -1,2 +1,469 @@
-def schedule_shifts():
-    return
\ No newline at end of file
+"""
+schedule_logic.py
+
+The shift-scheduling engine behind the "Schedule and display shifts" menu item.
+
+schedule_shifts() plans every task over a horizon (SCHEDULE_HORIZON_DAYS days from today by
+default) in timed phases:
+    load        - every table the schedule depends on, read once
+    eligibility - which soldier may take which shift, as a matrix per batch of shifts
+                  (see eligibility.py); the shifts are generated lazily (see shift_slots.py)
+    assign      - soldiers for each shift, by one of SOLVERS: "greedy" (earliest shift first,
+                  least-loaded soldier first) or "flow" (shifts starting together solved as a
+                  min-cost flow, see assign_min_cost_flow())
+    write       - the horizon's CurrentTaskAssignment rows replaced in one transaction
+
+Until the write phase all times are epoch minutes (see common.utils.to_epoch_minutes).
+
+Rules:
+- A soldier with presence periods ('in' the base) overlapping the horizon is available only
+  inside them; a soldier without any is available for the whole horizon. Absences ('out')
+  are never available. A shift must lie inside one available period.
+- TaskRole rows of a task: soldiers that MUST be included are placed first (when available),
+  then each role that must be included gets its MinRequiredCount, then the shift is filled
+  up to its required personnel. Soldiers or roles that CANNOT be included are never placed.
+- A soldier takes at most one shift at a time; shifts may follow each other directly.
+- A RecurringTask has a shift every ShiftDurationInMinutes inside its daily window, clipped by
+  the task's own Presence periods (see shift_slots.py).
+- A TemporaryTask has one shift per active Presence period of the task, needing the sum of its
+  role minimums plus its must-include soldiers (at least one).
+"""
+
+import heapq
+import time
+from itertools import islice
+from collections import namedtuple, defaultdict
+from datetime import datetime
+
+from EasyForce.common.constants import (
+    SOLDIER_TABLE, RECURRING_TASK_TABLE, TEMPORARY_TASK_TABLE, SCHEDULE_HORIZON_DAYS, DEFAULT_SCHEDULE_SOLVER,
+    ELIGIBILITY_BATCH_SIZE, DAY, MIN_IN_HOUR
+)
+from EasyForce.common.utils import to_epoch_minutes, from_epoch_minutes
+from EasyForce.data_management.data_structure.data_modification import BaseEntity
+from EasyForce.data_management.data_structure.entities_classes import (
+    TimeRange, Soldier, RecurringTask, TemporaryTask
+)
+from EasyForce.data_management.data_structure.relationships_classes import (
+    Presence, SoldierRole, TaskRole, CurrentTaskAssignment
+)
+from EasyForce.data_processing.eligibility import EligibilityMatrix
+from EasyForce.data_processing.interval_set import Interval, IntervalSet
+from EasyForce.data_processing.min_cost_flow import MinCostFlow
+from EasyForce.data_processing.shift_slots import (
+    MINUTES_PER_DAY, presence_timeline, recurring_task_slots, temporary_task_slots
+)
+
+# TaskRole rules of one task: soldier id sets, role id set and {role id: MinRequiredCount}
+TaskRules = namedtuple("TaskRules", "must_soldiers banned_soldiers banned_roles role_minimums")
+NO_RULES = TaskRules(frozenset(), frozenset(), frozenset(), {})
+
+# What a run did: slot / personnel counts, role minimum positions left unfilled, the gap between the most
+# and the least assigned soldier (in hours) and {phase: seconds}
+ScheduleReport = namedtuple("ScheduleReport", "solver slots required assigned unfilled_slots role_shortfall load_spread timings")
+
+
+class ScheduleData:
+    """Everything the engine reads from the database for one horizon, loaded once."""
+
+    def __init__(self, horizon_start: int, horizon_end: int):
+        self.horizon_start = horizon_start
+        self.horizon_end = horizon_end
+        self.soldiers = {soldier.SoldierID: soldier for soldier in Soldier.get_all()}
+        self.soldier_roles = defaultdict(set)
+        for soldier_role in SoldierRole.get_all():
+            self.soldier_roles[soldier_role.SoldierID].add(soldier_role.RoleID)
+        self.recurring_tasks = RecurringTask.get_all()
+        self.temporary_tasks = TemporaryTask.get_all()
+        self.task_names = {(RECURRING_TASK_TABLE, task.TaskID): task.TaskName for task in self.recurring_tasks}
+        self.task_names.update({(TEMPORARY_TASK_TABLE, task.TaskID): task.TaskName for task in self.temporary_tasks})
+        self.rules = _load_task_rules()
+        self.presence = _load_presence(horizon_start, horizon_end)
+        self.availability = {soldier_id: presence_timeline(self.presence.get((SOLDIER_TABLE, soldier_id), ()),
+                                                           horizon_start, horizon_end)
+                             for soldier_id in self.soldiers}
+        self.assignments = assignments_in_horizon(horizon_start, horizon_end)
+        # The assignments that started before the horizon are kept: {soldier id: [(start, end)]}
+        self.busy = defaultdict(list)
+        for assignment, time_range in self.assignments:
+            if time_range.StartMinute < horizon_start:
+                self.busy[assignment.SoldierOrTeamID].append((time_range.StartMinute, time_range.EndMinute))
+
+    def required_personnel(self, task_type: str, task_id) -> int:
+        """Returns how many soldiers a shift of the task needs (see the module docstring for TemporaryTask)."""
+        if task_type == RECURRING_TASK_TABLE:
+            return next((task.RequiredPersonnel for task in self.recurring_tasks if task.TaskID == task_id), 1)
+        rules = self.rules.get((task_type, task_id), NO_RULES)
+        return max(1, sum(rules.role_minimums.values()) + len(rules.must_soldiers))
+
+
+def _load_task_rules() -> dict:
+    """Returns {(task type, task id): TaskRules} from the TaskRole table."""
+    must_soldiers, banned_soldiers, banned_roles = defaultdict(set), defaultdict(set), defaultdict(set)
+    role_minimums = defaultdict(dict)
+    for rule in TaskRole.get_all():
+        task = (rule.TaskType, rule.TaskID)
+        if rule.SoldierOrRole == SOLDIER_TABLE:
+            (must_soldiers if rule.RoleEnforcementType else banned_soldiers)[task].add(rule.SoldierOrRoleID)
+        elif rule.RoleEnforcementType:
+            role_minimums[task][rule.SoldierOrRoleID] = rule.MinRequiredCount
+        else:
+            banned_roles[task].add(rule.SoldierOrRoleID)
+    tasks = set(must_soldiers) | set(banned_soldiers) | set(banned_roles) | set(role_minimums)
+    return {task: TaskRules(frozenset(must_soldiers[task]), frozenset(banned_soldiers[task]),
+                            frozenset(banned_roles[task]), role_minimums[task]) for task in tasks}
+
+
+def _load_presence(horizon_start: int, horizon_end: int) -> dict:
+    """Returns {(SoldierTeamTaskType, id): [Interval(start, end, isActive)]} for the periods overlapping the horizon."""
+    rows = Presence.overlapping(from_epoch_minutes(horizon_start), from_epoch_minutes(horizon_end))
+    time_ranges = TimeRange.get_many_by_ids([{"TimeID": time_id} for time_id in {row.TimeID for row in rows}])
+    presence = defaultdict(list)
+    for row in rows:
+        time_range = time_ranges.get((row.TimeID,))
+        if time_range is not None and time_range.StartMinute < time_range.EndMinute:
+            presence[(row.SoldierTeamTaskType, row.SoldierTeamTaskID)].append(
+                Interval(time_range.StartMinute, time_range.EndMinute, row.isActive))
+    return presence
+
+
+def assignments_in_horizon(horizon_start: int, horizon_end: int) -> list:
+    """Returns [(CurrentTaskAssignment, TimeRange)] for the soldier assignments overlapping the horizon."""
+    assignments = CurrentTaskAssignment.query().where("SoldierOrTeamType", "=", SOLDIER_TABLE) \
+        .overlapping(from_epoch_minutes(horizon_start), from_epoch_minutes(horizon_end)).all()
+    time_ranges = TimeRange.get_many_by_ids([{"TimeID": time_id} for time_id in {a.TimeID for a in assignments}])
+    return [(assignment, time_ranges[(assignment.TimeID,)]) for assignment in assignments
+            if (assignment.TimeID,) in time_ranges]
+
+
+######################## Slots ########################
+
+def iter_slots(data: ScheduleData):
+    """Yields every shift of the horizon lazily, ordered by start time (then end time and task)."""
+    generators = [_task_slots(data, RECURRING_TASK_TABLE, task) for task in data.recurring_tasks]
+    generators += [_task_slots(data, TEMPORARY_TASK_TABLE, task) for task in data.temporary_tasks]
+    return heapq.merge(*generators, key=lambda slot: (slot.start, slot.end, slot.task_type, slot.task_id))
+
+
+def task_slots(data: ScheduleData, task_type: str, task_id):
+    """Yields the shifts of one task within the horizon, ordered by start time (none for an unknown task)."""
+    tasks = data.recurring_tasks if task_type == RECURRING_TASK_TABLE else data.temporary_tasks
+    task = next((task for task in tasks if task.TaskID == task_id), None)
+    return _task_slots(data, task_type, task) if task is not None else iter(())
+
+
+def _task_slots(data: ScheduleData, task_type: str, task):
+    """Internal helper: the slot generator of one task, built from its presence within the horizon."""
+    if task_type == RECURRING_TASK_TABLE:
+        periods = data.presence.get((RECURRING_TASK_TABLE, task.TaskID))
+        presence = presence_timeline(periods, data.horizon_start, data.horizon_end) if periods else None
+        return recurring_task_slots(task, data.horizon_start, data.horizon_end, presence)
+    required = data.required_personnel(TEMPORARY_TASK_TABLE, task.TaskID)
+    presence = IntervalSet(data.presence.get((TEMPORARY_TASK_TABLE, task.TaskID), ()))
+    return temporary_task_slots(task, required, presence, data.horizon_start, data.horizon_end)
+
+
+######################## Assignment ########################
+
+def iter_batches(data: ScheduleData, slots, timings: dict = None, batch_size: int = ELIGIBILITY_BATCH_SIZE):
+    """
+    Yields an EligibilityMatrix for every 'batch_size' consecutive slots (any iterable, e.g. iter_slots()).
+    The time spent building them is added to timings["eligibility"] when 'timings' is given.
+    """
+    slots = iter(slots)
+    while True:
+        started = time.perf_counter()
+        batch = list(islice(slots, batch_size))
+        if not batch:
+            return
+        matrix = EligibilityMatrix.build(data, batch)
+        if timings is not None:
+            timings["eligibility"] = timings.get("eligibility", 0) + time.perf_counter() - started
+        yield matrix
+
+
+def assign_greedy(data: ScheduleData, slots, timings: dict = None) -> list:
+    """
+    Fills the slots (any iterable in start order, e.g. iter_slots()) one after the other. For each slot
+    the candidates are the soldiers of the eligibility matrix (see eligibility.py) who are not bound
+    by an earlier overlapping shift of this run; must-include soldiers come first, then role
+    minimums, then the least-loaded candidates (fewest minutes assigned so far, then lowest id).
+
+    Returns:
+        list: (ShiftSlot, [soldier ids]) for every slot, in slot order.
+    """
+    free_from = {}
+    load = dict.fromkeys(data.soldiers, 0)
+    schedule = []
+    for matrix in iter_batches(data, slots, timings):
+        for j, slot in enumerate(matrix.slots):
+            schedule.append((slot, fill_greedy(data, slot, matrix.candidates(j), free_from, load)))
+    return schedule
+
+
+def fill_greedy(data: ScheduleData, slot, eligible: list, free_from: dict, load: dict, keep=frozenset()) -> list:
+    """
+    Picks the soldiers of one slot from its 'eligible' soldiers (see assign_greedy()) and books them
+    in 'free_from' / 'load'. Soldiers in 'keep' (already on the shift) are preferred over any other
+    candidate of the same step, so a repair (see reschedule.py) changes as little as possible.
+
+    Returns:
+        list: The chosen soldier ids.
+    """
+    rules = data.rules.get((slot.task_type, slot.task_id), NO_RULES)
+    by_load = lambda soldier_id: (soldier_id not in keep, load[soldier_id], soldier_id)
+    candidates = [soldier_id for soldier_id in eligible if free_from.get(soldier_id, slot.start) <= slot.start]
+    chosen = [soldier_id for soldier_id in sorted(rules.must_soldiers) if soldier_id in candidates]
+    for role_id, minimum in rules.role_minimums.items():
+        missing = minimum - sum(1 for soldier_id in chosen if role_id in data.soldier_roles[soldier_id])
+        if missing > 0:
+            holders = [soldier_id for soldier_id in candidates
+                       if role_id in data.soldier_roles[soldier_id] and soldier_id not in chosen]
+            chosen += heapq.nsmallest(missing, holders, key=by_load)
+    missing = slot.required - len(chosen)
+    if missing > 0:
+        taken = set(chosen)
+        chosen += heapq.nsmallest(missing, (soldier_id for soldier_id in candidates if soldier_id not in taken),
+                                  key=by_load)
+    for soldier_id in chosen:
+        free_from[soldier_id] = slot.end
+        load[soldier_id] += slot.end - slot.start
+    return chosen
+
+
+def assign_min_cost_flow(data: ScheduleData, slots, timings: dict = None) -> list:
+    """
+    Like assign_greedy(), but the shifts that overlap one another - which compete for the same
+    soldiers - are filled together, as a min-cost max-flow (see min_cost_flow.py):
+        source -> soldier (1) -> shift (its RequiredPersonnel) -> sink
+    with the role minimums as capacity-limited side entries into their shift. The flow maximizes the
+    positions filled first; among those fillings it prefers must-include soldiers, then role
+    minimums, then the least-loaded soldiers (cost = minutes assigned so far).
+
+    A group is a run of shifts, in start order, that all share a common moment (each starts
+    before the earliest end in the run), so no soldier can take two of them and a capacity of 1
+    per soldier is exact. Shifts that merely chain (A overlaps B, B overlaps C, A and C do not)
+    are split into consecutive groups and filled one after the other, and a group never spans two
+    eligibility batches (ELIGIBILITY_BATCH_SIZE slots).
+
+    Returns:
+        list: (ShiftSlot, [soldier ids]) for every slot, in slot order.
+    """
+    free_from = {}
+    load = dict.fromkeys(data.soldiers, 0)
+    schedule = []
+    for matrix in iter_batches(data, slots, timings):
+        first = 0
+        while first < len(matrix.slots):
+            last, group_end = first, matrix.slots[first].end
+            while last < len(matrix.slots) and matrix.slots[last].start < group_end:
+                group_end = min(group_end, matrix.slots[last].end)
+                last += 1
+            group = matrix.slots[first:last]
+            chosen = _fill_flow(data, group, [matrix.candidates(j) for j in range(first, last)], free_from, load)
+            schedule.extend(zip(group, chosen))
+            first = last
+    return schedule
+
+
+def _fill_flow(data: ScheduleData, group: list, eligible: list, free_from: dict, load: dict) -> list:
+    """Internal helper: picks the soldiers of overlapping shifts for assign_min_cost_flow() and books them."""
+    demand = sum(slot.required for slot in group)
+    by_load = lambda soldier_id: (load[soldier_id], soldier_id)
+    candidates = [[soldier_id for soldier_id in soldier_ids if free_from.get(soldier_id, slot.start) <= slot.start]
+                  for slot, soldier_ids in zip(group, eligible)]
+    # An optimal filling only uses, per shift and per kind of entry, the 'demand' least-loaded candidates
+    entries = []
+    for g, slot in enumerate(group):
+        rules = data.rules.get((slot.task_type, slot.task_id), NO_RULES)
+        available = set(candidates[g])
+        entries.append((g, None, "must", [soldier_id for soldier_id in sorted(rules.must_soldiers) if soldier_id in available]))
+        for role_id, minimum in rules.role_minimums.items():
+            if minimum > 0:
+                holders = [soldier_id for soldier_id in candidates[g] if role_id in data.soldier_roles[soldier_id]]
+                entries.append((g, minimum, "role", heapq.nsmallest(demand, holders, key=by_load)))
+        entries.append((g, None, "any", heapq.nsmallest(demand, candidates[g], key=by_load)))
+
+    minutes = {soldier_id: load[soldier_id] for *_, soldier_ids in entries for soldier_id in soldier_ids}
+    if not minutes:
+        return [[] for _ in group]
+    # Any must-include entry is cheaper than any role entry, which is cheaper than any other entry
+    weight = max(minutes.values()) + 1
+    extra_cost = {"must": 0, "role": weight, "any": 2 * weight}
+
+    network = MinCostFlow(2)
+    source, sink = 0, 1
+    soldier_nodes = {}
+    for soldier_id in minutes:
+        soldier_nodes[soldier_id] = network.add_node()
+        network.add_edge(source, soldier_nodes[soldier_id], 1, 0)
+    shift_nodes = []
+    for slot in group:
+        shift_nodes.append(network.add_node())
+        network.add_edge(shift_nodes[-1], sink, slot.required, 0)
+    edges = []
+    for g, minimum, kind, soldier_ids in entries:
+        target = shift_nodes[g]
+        if minimum is not None:
+            target = network.add_node()
+            network.add_edge(target, shift_nodes[g], minimum, 0)
+        for soldier_id in soldier_ids:
+            edges.append((network.add_edge(soldier_nodes[soldier_id], target, 1, minutes[soldier_id] + extra_cost[kind]),
+                          g, soldier_id))
+    network.solve(source, sink)
+
+    chosen = [[] for _ in group]
+    for edge, g, soldier_id in edges:
+        if network.flow(edge):
+            chosen[g].append(soldier_id)
+    for slot, soldier_ids in zip(group, chosen):
+        soldier_ids.sort()
+        for soldier_id in soldier_ids:
+            free_from[soldier_id] = slot.end
+            load[soldier_id] += slot.end - slot.start
+    return chosen
+
+
+# Selectable with schedule_shifts(solver=...)
+SOLVERS = {
+    "greedy": assign_greedy,
+    "flow": assign_min_cost_flow,
+}
+
+
+######################## Writing ########################
+
+def _time_range_text(minutes: int) -> str:
+    return str(from_epoch_minutes(minutes))
+
+
+def time_range_ids(periods) -> dict:
+    """
+    Returns {(start, end): TimeID} for the (start, end) epoch-minute 'periods', reusing the TimeRange
+    row of every period that already exists and creating the others. Raises RuntimeError if a row
+    cannot be created; call it inside the transaction that uses the ids.
+    """
+    periods = set(periods)
+    existing = TimeRange.query().where("StartDateTime", "IN", {_time_range_text(start) for start, _ in periods}).all()
+    time_ids = {(time_range.StartMinute, time_range.EndMinute): time_range.TimeID for time_range in existing
+                if time_range.StartDateTime == _time_range_text(time_range.StartMinute)
+                and time_range.EndDateTime == _time_range_text(time_range.EndMinute)}
+    missing = [TimeRange(StartDateTime=_time_range_text(start), EndDateTime=_time_range_text(end))
+               for start, end in sorted(periods - set(time_ids))]
+    created = TimeRange.add_many(missing)
+    if None in created:
+        raise RuntimeError("Could not create the time ranges of the new shifts.")
+    time_ids.update({(time_range.StartMinute, time_range.EndMinute): time_range.TimeID for time_range in created})
+    return time_ids
+
+
+def write_schedule(data: ScheduleData, schedule: list) -> int:
+    """
+    Replaces the soldier assignments that start inside the horizon with 'schedule', in one transaction.
+    A TimeRange row is reused for every shift whose exact period already exists.
+
+    Returns:
+        int: The number of CurrentTaskAssignment rows written.
+    """
+    periods = {(slot.start, slot.end) for slot, soldier_ids in schedule if soldier_ids}
+    with BaseEntity.transaction():
+        replaced = [assignment for assignment, time_range in assignments_in_horizon(data.horizon_start, data.horizon_end)
+                    if time_range.StartMinute >= data.horizon_start]
+        if None in CurrentTaskAssignment.delete_many(replaced):
+            raise RuntimeError("Could not remove the previous assignments of the horizon.")
+
+        time_ids = time_range_ids(periods)
+        rows = [CurrentTaskAssignment(TaskType=slot.task_type, TaskID=slot.task_id, SoldierOrTeamType=SOLDIER_TABLE,
+                                      SoldierOrTeamID=soldier_id, TimeID=time_ids[(slot.start, slot.end)])
+                for slot, soldier_ids in schedule for soldier_id in soldier_ids]
+        if None in CurrentTaskAssignment.add_many(rows):
+            raise RuntimeError("Could not write the new assignments.")
+    return len(rows)
+
+
+######################## Entry point ########################
+
+def run_schedule(start: datetime, days: int = SCHEDULE_HORIZON_DAYS, solver: str = DEFAULT_SCHEDULE_SOLVER):
+    """
+    Schedules every task over [start, start + days] with one of SOLVERS and writes the result.
+
+    Returns:
+        tuple: (ScheduleReport, ScheduleData, schedule) - the schedule as returned by assign_greedy().
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver '{solver}' (expected one of {', '.join(SOLVERS)}).")
+    timings = {}
+    clock = time.perf_counter()
+
+    def phase(name):
+        nonlocal clock
+        now = time.perf_counter()
+        timings[name] = now - clock
+        clock = now
+
+    horizon_start = to_epoch_minutes(start)
+    horizon_end = horizon_start + days * MINUTES_PER_DAY
+    data = ScheduleData(horizon_start, horizon_end)
+    phase("load")
+    schedule = SOLVERS[solver](data, iter_slots(data), timings)
+    phase("assign")
+    # Slots and eligibility are built batch by batch while assigning; report them apart
+    timings["assign"] -= timings.get("eligibility", 0)
+    assigned = write_schedule(data, schedule)
+    phase("write")
+
+    load = dict.fromkeys(data.soldiers, 0)
+    role_shortfall = 0
+    for slot, soldier_ids in schedule:
+        for soldier_id in soldier_ids:
+            load[soldier_id] += slot.end - slot.start
+        for role_id, minimum in data.rules.get((slot.task_type, slot.task_id), NO_RULES).role_minimums.items():
+            role_shortfall += max(0, minimum - sum(1 for soldier_id in soldier_ids if role_id in data.soldier_roles[soldier_id]))
+    report = ScheduleReport(
+        solver=solver,
+        slots=len(schedule),
+        required=sum(slot.required for slot, _ in schedule),
+        assigned=assigned,
+        unfilled_slots=sum(1 for slot, soldier_ids in schedule if len(soldier_ids) < slot.required),
+        role_shortfall=role_shortfall,
+        load_spread=(max(load.values()) - min(load.values())) / MIN_IN_HOUR if load else 0,
+        timings=timings,
+    )
+    return report, data, schedule
+
+
+def print_report(report: ScheduleReport):
+    print(f"Scheduled {report.slots} shifts ({report.solver}): {report.assigned} of {report.required} positions filled, "
+          f"{report.unfilled_slots} shifts short of personnel, {report.role_shortfall} role positions missing.")
+    print("  ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in report.timings.items()))
+
+
+def display_schedule(data: ScheduleData, schedule: list, hours: int = DAY):
+    """Prints the shifts that start within 'hours' hours of the horizon's start."""
+    until = data.horizon_start + hours * MIN_IN_HOUR
+    for slot, soldier_ids in schedule:
+        if slot.start >= until:
+            break
+        names = ", ".join(data.soldiers[soldier_id].FullName for soldier_id in soldier_ids) or "-"
+        print(f"{from_epoch_minutes(slot.start):%d/%m/%Y %H:%M} - {from_epoch_minutes(slot.end):%d/%m/%Y %H:%M}  "
+              f"{data.task_names[(slot.task_type, slot.task_id)]} ({len(soldier_ids)}/{slot.required}): {names}")
+
+
+def schedule_shifts(start: datetime = None, days: int = SCHEDULE_HORIZON_DAYS, solver: str = DEFAULT_SCHEDULE_SOLVER):
+    """
+    Schedules every task from 'start' (default: today at midnight) for 'days' days with 'solver'
+    (a key of SOLVERS), then prints the run's report and the first day of shifts.
+
+    Returns:
+        ScheduleReport: or None if the schedule could not be written.
+    """
+    if start is None:
+        start = datetime.combine(datetime.now().date(), datetime.min.time())
+    try:
+        report, data, schedule = run_schedule(start, days, solver)
+    except RuntimeError as e:
+        print(f"Scheduling Error: {e}")
+        return None
+    print_report(report)
+    display_schedule(data, schedule)
+    return report
@@ -0,0 +1,111 @@
+"""
+shift_slots.py
+
+Turns tasks into concrete shifts (ShiftSlot: task, start, end, required personnel) for any horizon,
+lazily: the generators yield one day at a time in start order, so a month-long (or year-long)
+horizon is never held in memory. Times are epoch minutes (see common.utils.to_epoch_minutes).
+
+A RecurringTask has a daily window from EveryDayStartTime to EveryDayEndTime:
+    08:00 - 16:00   the same day
+    22:00 - 06:00   past midnight, into the next day (the end is earlier than the start)
+    08:00 - 08:00   all day (start and end equal, e.g. both DEFAULT_MORNING_HOUR)
+split into shifts of ShiftDurationInMinutes from the window's start; the last shift is cut at the
+window's end. The shifts of one window only depend on the task's window and the day, and are
+memoized per (window, day), so the scheduler and reports asking for the same days share them.
+
+A task's own Presence periods clip its shifts: if the task has active periods, only the parts of
+its shifts inside them are yielded, and its absences are never yielded.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+from EasyForce.common.constants import RECURRING_TASK_TABLE, TEMPORARY_TASK_TABLE, DAY, MIN_IN_HOUR, SHIFT_SLOT_CACHE_SIZE
+from EasyForce.common.utils import hhmm_to_minutes
+from EasyForce.data_processing.interval_set import Interval, IntervalSet
+
+MINUTES_PER_DAY = DAY * MIN_IN_HOUR
+
+# One shift of a task: times in epoch minutes, 'required' soldiers
+ShiftSlot = namedtuple("ShiftSlot", "task_type task_id start end required")
+
+
+@lru_cache(maxsize=SHIFT_SLOT_CACHE_SIZE)
+def window_shifts(start_time: str, end_time: str, duration: int, day: int) -> tuple:
+    """
+    Returns the shifts of one daily window as ((start, end), ...) epoch minutes.
+
+    Args:
+        start_time, end_time: The window as 'HH:MM' (EveryDayStartTime / EveryDayEndTime).
+        duration: ShiftDurationInMinutes.
+        day: The epoch minute of the midnight the window opens on.
+    """
+    if duration <= 0:
+        raise ValueError(f"A shift must last at least one minute ({duration}).")
+    window_start = day + hhmm_to_minutes(start_time)
+    window_length = (hhmm_to_minutes(end_time) - hhmm_to_minutes(start_time)) % MINUTES_PER_DAY or MINUTES_PER_DAY
+    window_end = window_start + window_length
+    return tuple((start, min(start + duration, window_end)) for start in range(window_start, window_end, duration))
+
+
+def _clip(slot: ShiftSlot, presence: IntervalSet) -> Iterator[ShiftSlot]:
+    """Internal helper: the parts of 'slot' inside the active periods of 'presence'."""
+    for period in presence.overlapping(slot.start, slot.end):
+        start, end = max(slot.start, period.start), min(slot.end, period.end)
+        if period.value and start < end:
+            yield slot._replace(start=start, end=end)
+
+
+def presence_timeline(periods: Iterable[Interval], horizon_start: int, horizon_end: int) -> IntervalSet:
+    """
+    Returns when a soldier or task is on duty within the horizon, as an IntervalSet (1 = on duty).
+    With active periods, it is on duty only inside them; without any, it is on duty for the
+    whole horizon. Absences are never on duty.
+
+    Args:
+        periods: Interval(start, end, isActive) for its Presence rows.
+    """
+    periods = list(periods)
+    if any(period.value for period in periods):
+        return IntervalSet(periods)
+    timeline = IntervalSet([Interval(horizon_start, horizon_end, 1)])
+    for period in periods:
+        start, end = max(period.start, horizon_start), min(period.end, horizon_end)
+        if start < end:
+            timeline.assign(start, end, 0)
+    return timeline
+
+
+def recurring_task_slots(task, horizon_start: int, horizon_end: int, presence: IntervalSet = None) -> Iterator[ShiftSlot]:
+    """
+    Yields the shifts of a RecurringTask that lie inside [horizon_start, horizon_end], in start order.
+
+    Args:
+        task: A RecurringTask.
+        horizon_start, horizon_end: Epoch minutes.
+        presence: The task's own Presence timeline (see presence_timeline()); None means unrestricted.
+    """
+    # Start a day early: yesterday's window may run past midnight into the horizon
+    day = horizon_start - horizon_start % MINUTES_PER_DAY - MINUTES_PER_DAY
+    while day < horizon_end:
+        for start, end in window_shifts(task.EveryDayStartTime, task.EveryDayEndTime, task.ShiftDurationInMinutes, day):
+            if start >= horizon_end:
+                return
+            if start < horizon_start or end > horizon_end:
+                continue
+            slot = ShiftSlot(RECURRING_TASK_TABLE, task.TaskID, start, end, task.RequiredPersonnel)
+            if presence is None:
+                yield slot
+            else:
+                yield from _clip(slot, presence)
+        day += MINUTES_PER_DAY
+
+
+def temporary_task_slots(task, required: int, presence: IntervalSet,
+                         horizon_start: int, horizon_end: int) -> Iterator[ShiftSlot]:
+    """Yields one shift per active period of a TemporaryTask's Presence, clipped to the horizon, in start order."""
+    for period in presence.overlapping(horizon_start, horizon_end):
+        start, end = max(period.start, horizon_start), min(period.end, horizon_end)
+        if period.value and start < end:
+            yield ShiftSlot(TEMPORARY_TASK_TABLE, task.TaskID, start, end, required)
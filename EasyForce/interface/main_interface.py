@@ -3,6 +3,7 @@ import sys
 from EasyForce.common.constants import TEAM_TABLE, SOLDIER_TABLE, ADD, UPDATE, DELETE
 from EasyForce.common.utils import questions, extract_match_from_text
 from EasyForce.data_management.read_db import display_all_tables
+from EasyForce.data_management.data_structure.data_modification import BaseEntity
 from EasyForce.data_processing.schedule_logic import schedule_shifts
 from EasyForce.interface.user_questions_management.general_questions import define_task_type, ask_closed_ended_question
 
@@ -31,21 +32,27 @@ def menu():
                 if choice == "Return":
                     break
                 action = extract_match_from_text(choice,actions)
-                if entity == "Task":
-                    if not questions(define_task_type(),action.lower()):
-                        continue
-                else:
-                    if not questions(entity,action.lower()):
-                        continue
+                # One identity map per command: rows read during the command are fetched from SQLite
+                # once, and the next command reads fresh rows
+                with BaseEntity.cached():
+                    if entity == "Task":
+                        done = questions(define_task_type(),action.lower())
+                    else:
+                        done = questions(entity,action.lower())
+                if not done:
+                    continue
             elif choice == "Schedule and display shifts":
-                schedule_shifts()
+                with BaseEntity.cached():
+                    schedule_shifts()
                 break
             elif choice == "Display any table":
-                if not questions("Display","table"):
+                with BaseEntity.cached():
+                    done = questions("Display","table")
+                if not done:
                     break
             elif choice == "Display all tables":
                 display_all_tables()
                 break
             else: # choice == "Exit":
                 print("Goodbye!")
-                sys.exit(0)
\ No newline at end of file
+                sys.exit(0)
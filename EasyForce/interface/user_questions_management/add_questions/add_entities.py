@@ -3,8 +3,14 @@ add_entities.py
 
 Functions for adding new entity records (TimeRange, Team, Soldier, Role, Tasks, etc.)
 All DB calls happen inside the entity class methods (no conn param).
+Each flow first asks all of its questions, then writes everything it collected inside one
+BaseEntity.transaction(): nothing is written while the user is still answering, and if any
+write fails the flow raises inside the transaction, so none of its records are kept.
+A new soldier or task has no assignments yet, so nothing here repairs the schedule; the
+update flows do (see update_entities.py).
 """
 
+from EasyForce.data_management.data_structure.data_modification import BaseEntity
 from EasyForce.data_management.data_structure.entities_classes import (
     Team, Soldier, TemporaryTask, RecurringTask
 )
@@ -14,47 +20,54 @@ from EasyForce.common.utils import questions, is_positive_integer, is_number, ye
 from EasyForce.interface.user_questions_management.general_questions import (
     ask_open_ended_question, ask_for_name, ask_closed_ended_question
 )
+from EasyForce.interface.user_questions_management.add_questions.add_relationships import (
+    add_presence_periods, add_soldier_roles, add_task_roles
+)
 
 
 def add_TimeRange_questions(table, table_data):
     """
-    If table == SOLDIER_TABLE, create presence in/out (Presence subcalls).
-    Otherwise, presence for tasks. No direct DB calls here.
+    If table == SOLDIER_TABLE, asks for presence in/out periods (Presence subcalls).
+    Otherwise, presence for tasks. No DB writes here.
+
+    Returns:
+        list: (start, end, isActive) of every period entered.
     """
     if table == SOLDIER_TABLE:
-        questions(PRESENCE_TABLE, ADD, table, table_data, "in")
-        questions(PRESENCE_TABLE, ADD, table, table_data, "out")
-    else:
-        questions(PRESENCE_TABLE, ADD, table, table_data)
+        return questions(PRESENCE_TABLE, ADD, table, table_data, "in") + \
+            questions(PRESENCE_TABLE, ADD, table, table_data, "out")
+    return questions(PRESENCE_TABLE, ADD, table, table_data)
 
 
-def add_Team_questions(soldier_name=None):
-    question = "Please enter the team name ('R' to return): "
-    if soldier_name:
-        question = f"Please enter {soldier_name}'s team name: "
-
+def ask_team_name(question, previous_question=False):
+    """Asks for a team name until it is not taken; returns None if the user returned."""
     while True:
-        team_name = ask_open_ended_question(question, "Team name", previous_question=(not bool(soldier_name)))
-        if not Team.get_column_values("TeamName") or team_name not in Team.get_column_values("TeamName"):
-            break
-        else:
-            print(f"The team name {team_name} already exists. Please use a unique name")
+        team_name = ask_open_ended_question(question, "Team name", previous_question=previous_question)
+        if not team_name or team_name not in (Team.get_column_values("TeamName") or []):
+            return team_name
+        print(f"The team name {team_name} already exists. Please use a unique name")
+
+
+def add_Team_questions():
+    team_name = ask_team_name("Please enter the team name ('R' to return): ", previous_question=True)
+    if not team_name:
+        return None
 
     # Create and .add() -> DB is accessed inside .add()
     new_team = Team(TeamName=team_name)
     if not new_team.add():
         return None
 
+    # Every soldier is a flow (and a transaction) of its own
     team_id = new_team.TeamID
-    if not soldier_name:
-        prompt = f"add soldiers to {new_team.TeamName} team"
-        while True:
-            if yes_no_question(prompt):
-                if not questions(SOLDIER_TABLE, ADD, new_team.TeamName):
-                    return team_id
-                prompt = f"add more soldiers to {new_team.TeamName} team"
-            else:
-                break
+    prompt = f"add soldiers to {new_team.TeamName} team"
+    while True:
+        if yes_no_question(prompt):
+            if not questions(SOLDIER_TABLE, ADD, new_team.TeamName):
+                return team_id
+            prompt = f"add more soldiers to {new_team.TeamName} team"
+        else:
+            break
     return team_id
 
 
@@ -84,21 +97,17 @@ def add_Soldier_questions(team_name=None):
         "SoldierID": soldier_id
     }
 
-    # Add roles for soldier
-    questions(ROLE_TABLE, ADD, SOLDIER_TABLE, data)
+    # Roles for soldier
+    role_names = questions(ROLE_TABLE, ADD, SOLDIER_TABLE, data)
 
-    # Assign or create team
+    # Existing team, or the name of a team to create
+    new_team_name = None
     if team_name:
-        # We rely on the classes to do DB calls
-        # We'll just create or get a Team in memory if needed
-        possible_team = Team.get_all()
-        found = next((t for t in possible_team if t.TeamName == team_name), None)
+        found = Team.get_by_unique_name(team_name)
         if found:
             data["TeamID"] = found.TeamID
         else:
-            new_team = Team(TeamName=team_name)
-            new_team.add()
-            data["TeamID"] = new_team.TeamID
+            new_team_name = team_name
     else:
         existing_teams = Team.get_all()
         if existing_teams:
@@ -106,44 +115,62 @@ def add_Soldier_questions(team_name=None):
             team_names.append("Add a new team")
             chosen = ask_closed_ended_question(f"Select {soldier_name}'s team:", team_names)
             if chosen == "Add a new team":
-                data["TeamID"] = questions(TEAM_TABLE, ADD, soldier_name)
+                new_team_name = ask_team_name(f"Please enter {soldier_name}'s team name: ")
             else:
                 found = next((t for t in existing_teams if t.TeamName == chosen), None)
                 data["TeamID"] = found.TeamID if found else None
         else:
             print("No existing teams. Please add a team first.")
-            data["TeamID"] = questions(TEAM_TABLE, ADD, soldier_name)
-
-    # Create soldier
-    new_soldier = Soldier(**data)
-    if not new_soldier.add():
+            new_team_name = ask_team_name(f"Please enter {soldier_name}'s team name: ")
+
+    # Presence periods
+    periods = questions(TIME_RANGE_TABLE, ADD, SOLDIER_TABLE, data)
+
+    try:
+        with Soldier.transaction():
+            if new_team_name:
+                new_team = Team(TeamName=new_team_name).add()
+                if not new_team:
+                    raise RuntimeError(f"the team {new_team_name} could not be added")
+                data["TeamID"] = new_team.TeamID
+            if not Soldier(**data).add():
+                raise RuntimeError(f"{soldier_name} could not be added")
+            if not add_soldier_roles(soldier_id, role_names) or not add_presence_periods(SOLDIER_TABLE, soldier_id, periods):
+                raise RuntimeError(f"the roles or presence of {soldier_name} could not be added")
+    except RuntimeError as e:
+        print(f"Add Error: {e}; nothing was saved.")
         return None
-
-    # Add TimeRange
-    questions(TIME_RANGE_TABLE, ADD, SOLDIER_TABLE, data)
     return soldier_id
 
 
 def add_Role_questions(table, table_data):
+    """
+    Returns:
+        list: for a soldier, the role names entered; for a task, its TaskRole rows
+              (see add_relationships.add_TaskRole_questions()). No DB writes here.
+    """
+    collected = []
     if table == SOLDIER_TABLE:
         if yes_no_question(f"add {table_data['FullName']} a role"):
-            questions(SOLDIER_ROLE_TABLE, ADD, table_data)
+            collected = questions(SOLDIER_ROLE_TABLE, ADD, table_data)
     elif table in (TEMPORARY_TASK_TABLE, RECURRING_TASK_TABLE):
         if yes_no_question("add any task restrictions"):
             options = ["Role","Team","Soldier"]
             while options:
                 chosen = ask_closed_ended_question("Which task restrictions would you like to add:",options,True)
                 if chosen == "Role":
-                    questions(TASK_ROLE_TABLE, ADD, table, table_data, ROLE_TABLE)
+                    collected += questions(TASK_ROLE_TABLE, ADD, table, table_data, ROLE_TABLE)
                     options.remove("Role")
                 elif chosen == "Team":
-                    questions(TASK_ROLE_TABLE, ADD, table, table_data, TEAM_TABLE)
+                    collected += questions(TASK_ROLE_TABLE, ADD, table, table_data, TEAM_TABLE)
                     options.remove("Team")
                 elif chosen == "Soldier":
-                    questions(TASK_ROLE_TABLE, ADD, table, table_data, SOLDIER_TABLE)
+                    collected += questions(TASK_ROLE_TABLE, ADD, table, table_data, SOLDIER_TABLE)
                     options.remove("Soldier")
                 else:
                     break
+    return collected
+
 
 def add_Task_questions(table):
     data = {}
@@ -156,13 +183,8 @@ def add_Task_questions(table):
         rep_q = "Please enter the task reputation:"
         rep_opts = ["Good", "Bad", "None"]
         task_rep = ask_closed_ended_question(rep_q, rep_opts)
-        new_temp = TemporaryTask(TaskName=t_name, TaskReputation=task_rep)
-        new_temp.add()
-        if not new_temp.TaskID:
-            return None
-        data["TaskID"] = new_temp.TaskID
-        data["TaskName"] = new_temp.TaskName
-        data["TaskReputation"] = new_temp.TaskReputation
+        new_task = TemporaryTask(TaskName=t_name, TaskReputation=task_rep)
+        data["TaskReputation"] = task_rep
     else:
         # Recurring
         while True:
@@ -196,21 +218,29 @@ def add_Task_questions(table):
                     e_end = str(end_dt[1])
                     break
 
-        new_rec = RecurringTask(
+        new_task = RecurringTask(
             TaskName=t_name,
             ShiftDurationInMinutes=int(shift * MIN_IN_HOUR),
             EveryDayStartTime=e_start,
             EveryDayEndTime=e_end,
             RequiredPersonnel=amt
         )
-        new_rec.add()
-        if not new_rec.TaskID:
-            return None
-        data["TaskID"] = new_rec.TaskID
-        data["TaskName"] = new_rec.TaskName
-
-    # Add TimeRange
-    questions(TIME_RANGE_TABLE, ADD, table, data)
-    # Add Roles
-    questions(ROLE_TABLE, ADD, table, data)
-    return data.get("TaskID")
\ No newline at end of file
+    data["TaskName"] = t_name
+
+    # TimeRange
+    periods = questions(TIME_RANGE_TABLE, ADD, table, data)
+    # Roles
+    task_roles = questions(ROLE_TABLE, ADD, table, data)
+
+    try:
+        with BaseEntity.transaction():
+            if not new_task.add():
+                raise RuntimeError(f"the task {t_name} could not be added")
+            data["TaskID"] = new_task.TaskID
+            if not add_presence_periods(table, new_task.TaskID, periods) or \
+                    not add_task_roles(table, new_task.TaskID, task_roles):
+                raise RuntimeError(f"the times or restrictions of {t_name} could not be added")
+    except RuntimeError as e:
+        print(f"Add Error: {e}; nothing was saved.")
+        return None
+    return data["TaskID"]
@@ -3,11 +3,15 @@ add_relationships.py
 
 Functions for adding relationship records (Presence, SoldierRole, etc.)
 All DB calls only happen in the class methods (no conn param).
+The *_questions functions only collect the answers; the add_* writers below them store the
+collected records, inside the transaction of the entity flow that asked (see add_entities.py);
+the reschedule_after_* hooks repair the schedule once an update flow's transaction has been
+committed (see update_entities.py).
 """
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 from EasyForce.data_management.data_structure.relationships_classes import (
-    Presence, SoldierRole, TaskRole
+    Presence, SoldierRole, TaskRole, CurrentTaskAssignment
 )
 from EasyForce.data_management.data_structure.entities_classes import TimeRange, Soldier, Role, Team
 from EasyForce.common.constants import *
@@ -17,9 +21,23 @@ from EasyForce.common.utils import (
 from EasyForce.interface.user_questions_management.general_questions import (
     ask_closed_ended_question, ask_open_ended_question
 )
+from EasyForce.data_processing.reschedule import reschedule_soldier, reschedule_task
+
+
+def print_repair(report):
+    """Prints what an incremental reschedule changed, if anything."""
+    if report is not None and (report.removed or report.added):
+        print(f"Rescheduled {report.slots} affected shifts: {report.removed} assignments replaced by {report.added} "
+              f"({report.seconds * 1000:.0f} ms).")
 
 
 def add_Presence_questions(table, table_data, pos=""):
+    """
+    Asks for the periods an entity is on base ('pos' "in") or away ("out"), or a task is active.
+
+    Returns:
+        list: (start, end, isActive) of every period entered; nothing is written here.
+    """
     if table == SOLDIER_TABLE:
         question = f"Add times when {table_data['FullName']} is {pos} the base"
         is_presence = 1 if pos == "in" else 0
@@ -33,6 +51,7 @@ def add_Presence_questions(table, table_data, pos=""):
         end_prompt = "Enter the task's end time (DD/MM/YYYY HH:MM) or Enter for unknowing: "
         more_prompt = "Add more times for the task's presence?"
 
+    periods = []
     if yes_no_question(question):
         while True:
             start_dt = get_datetime_input(start_prompt)
@@ -40,52 +59,100 @@ def add_Presence_questions(table, table_data, pos=""):
             if not start_dt[1] < end_dt[1]:
                 print(f"The {'arrival' if is_presence else 'departure'} time must be earlier than the {'departure' if is_presence else 'return'} time.")
                 continue
-            # Create TimeRange
-            new_range = TimeRange(
-                StartDateTime=str(start_dt[1]),
-                EndDateTime=str(end_dt[1])
-            )
-            new_range.add()
-
-            # Create Presence
-            pid = table_data["SoldierID"] if table == SOLDIER_TABLE else table_data["TaskID"]
-            presence_obj = Presence(
-                SoldierTeamTaskType=table,
-                SoldierTeamTaskID=pid,
-                TimeID=new_range.TimeID,
-                isActive=is_presence
-            )
-            presence_obj.add()
+            periods.append((start_dt[1], end_dt[1], is_presence))
 
             if (not start_dt[0] and not end_dt[0]) or not yes_no_question(more_prompt):
                 break
+    return periods
+
+
+def add_presence_periods(table, entity_id, periods) -> bool:
+    """
+    Writes the (start, end, isActive) 'periods' of add_Presence_questions() as TimeRange + Presence rows.
+
+    Returns:
+        bool: False if any row could not be added.
+    """
+    for start, end, is_presence in periods:
+        new_range = TimeRange(StartDateTime=str(start), EndDateTime=str(end)).add()
+        if not new_range:
+            return False
+        presence_obj = Presence(
+            SoldierTeamTaskType=table,
+            SoldierTeamTaskID=entity_id,
+            TimeID=new_range.TimeID,
+            isActive=is_presence
+        )
+        if not presence_obj.add():
+            return False
+    return True
+
+
+def reschedule_after_presence(table, entity_id, periods, had_active_periods=True):
+    """
+    Repairs the upcoming shifts of a soldier once the 'periods' of add_presence_periods() have been
+    committed: a soldier leaving base can no longer take the shifts of that period. A soldier without
+    any 'in' period counts as on base all the time ('had_active_periods' False, checked before the
+    write), so the first 'in' period takes away every upcoming shift outside it.
+    """
+    if table != SOLDIER_TABLE:
+        return
+    if not had_active_periods and any(is_presence for _, _, is_presence in periods):
+        now = datetime.now()
+        print_repair(reschedule_soldier(entity_id, now, now + timedelta(days=SCHEDULE_HORIZON_DAYS)))
+        return
+    for start, end, is_presence in periods:
+        if not is_presence:
+            print_repair(reschedule_soldier(entity_id, start, end))
 
 
 def add_SoldierRole_questions(table_data):
-    soldier_id = table_data["SoldierID"]
+    """
+    Returns:
+        list: the role names entered for the soldier; nothing is written here.
+    """
     soldier_name = table_data["FullName"]
+    role_names = []
     while True:
         role_name = ask_open_ended_question(f"{soldier_name}'s role: ", "Role name")
         if not role_name:
             break
-
-        existing_roles = Role.get_all()
-        found_role = next((r for r in existing_roles if r.RoleName == role_name), None)
-        if not found_role:
-            new_role = Role(RoleName=role_name)
-            new_role.add()
-            role_id = new_role.RoleID
-        else:
-            role_id = found_role.RoleID
-
-        sr = SoldierRole(SoldierID=soldier_id, RoleID=role_id)
-        sr.add()
+        role_names.append(role_name)
 
         if not yes_no_question(f"add {soldier_name} another role"):
             break
+    return role_names
+
+
+def add_soldier_roles(soldier_id, role_names) -> bool:
+    """
+    Gives the soldier every role in 'role_names', adding the roles that do not exist yet.
+
+    Returns:
+        bool: False if any row could not be added.
+    """
+    for role_name in role_names:
+        found_role = Role.query().where("RoleName", "=", role_name).first()
+        if not found_role:
+            found_role = Role(RoleName=role_name).add()
+            if not found_role:
+                return False
+
+        sr = SoldierRole(SoldierID=soldier_id, RoleID=found_role.RoleID)
+        if not sr.upsert():
+            return False
+    return True
 
 
 def add_TaskRole_questions(table_type, table_data, entity_type):
+    """
+    Asks which soldiers, roles or teams ('entity_type') the new task must or must not get.
+
+    Returns:
+        list: TaskRole rows without a TaskID (see add_task_roles()); nothing is written here.
+    """
+    task_roles = []
+
     def add_role(enforcement_type):
         while True:
             if not role_names:
@@ -104,15 +171,13 @@ def add_TaskRole_questions(table_type, table_data, entity_type):
                         min_required_count = int(val)
                         break
 
-            tr = TaskRole(
+            task_roles.append(TaskRole(
                 TaskType=table_type,
-                TaskID=table_data["TaskID"],
                 SoldierOrRole=ROLE_TABLE,
                 SoldierOrRoleID=found.RoleID,
                 MinRequiredCount=min_required_count,
                 RoleEnforcementType=1 if enforcement_type == ADD else 0
-            )
-            tr.add()
+            ))
 
             if not yes_no_question("Add another role?"):
                 break
@@ -126,15 +191,13 @@ def add_TaskRole_questions(table_type, table_data, entity_type):
             display_list.remove(chosen)
             soldier_id = int(chosen.split("ID: ")[1])
 
-            tr = TaskRole(
+            task_roles.append(TaskRole(
                 TaskType=table_type,
-                TaskID=table_data["TaskID"],
                 SoldierOrRole=SOLDIER_TABLE,
                 SoldierOrRoleID=soldier_id,
                 MinRequiredCount=1,
                 RoleEnforcementType=1 if enforcement_type == ADD else 0
-            )
-            tr.add()
+            ))
 
             if not yes_no_question("Add another soldier?"):
                 break
@@ -147,24 +210,15 @@ def add_TaskRole_questions(table_type, table_data, entity_type):
             chosen = ask_closed_ended_question("Choose a team:", display_list)
             display_list.remove(chosen)
             team_id = Team.get_by_unique_name(chosen).TeamID
-            soldiers_in_team = Soldier.get_all_by_column_value("TeamID",team_id)
-
-            if soldiers_in_team:
-                for soldier in soldiers_in_team:
-                    tr = TaskRole(
-                        TaskType=table_type,
-                        TaskID=table_data["TaskID"],
-                        SoldierOrRole=SOLDIER_TABLE,
-                        SoldierOrRoleID=soldier.SoldierID,
-                        MinRequiredCount=1,
-                        RoleEnforcementType=1 if enforcement_type == ADD else 0
-                    )
-                    existed_tr = tr.get_by_id({"TaskType":table_type, "TaskID":table_data["TaskID"],"SoldierOrRole":SOLDIER_TABLE,"SoldierOrRoleID":soldier.SoldierID})
-                    if existed_tr:
-                        existed_tr.RoleEnforcementType=1 if enforcement_type == ADD else 0
-                        existed_tr.update()
-                    else:
-                        tr.add()
+            # get_all_by_column_value() returns None for a team without soldiers
+            for soldier in Soldier.get_all_by_column_value("TeamID",team_id) or []:
+                task_roles.append(TaskRole(
+                    TaskType=table_type,
+                    SoldierOrRole=SOLDIER_TABLE,
+                    SoldierOrRoleID=soldier.SoldierID,
+                    MinRequiredCount=1,
+                    RoleEnforcementType=1 if enforcement_type == ADD else 0
+                ))
 
             if not yes_no_question("Add another team?"):
                 break
@@ -190,7 +244,40 @@ def add_TaskRole_questions(table_type, table_data, entity_type):
             add_team(ADD)
         if yes_no_question("add specific teams that CANNOT be included?"):
             add_team(DELETE)
+    return task_roles
+
+
+def add_task_roles(table_type, task_id, task_roles) -> bool:
+    """
+    Writes the TaskRole rows collected by add_TaskRole_questions() for task 'task_id'.
+    A soldier chosen twice (e.g. alone and through a team) keeps the last choice, and so does a
+    soldier or role that already had a rule for the task.
+
+    Returns:
+        bool: False if any row could not be added.
+    """
+    latest = {}
+    for tr in task_roles:
+        tr.TaskID = task_id
+        latest[(tr.SoldierOrRole, tr.SoldierOrRoleID)] = tr
+    # A rule given again for an existing task replaces the stored one
+    stored = TaskRole.get_many_by_ids([{"TaskType": table_type, "TaskID": task_id, "SoldierOrRole": soldier_or_role,
+                                        "SoldierOrRoleID": soldier_or_role_id}
+                                       for soldier_or_role, soldier_or_role_id in latest])
+    # One transaction for the whole batch instead of one commit per row
+    if None in TaskRole.delete_many(list(stored.values())) or None in TaskRole.add_many(latest.values()):
+        return False
+    return True
+
 
+def reschedule_after_task_roles(table_type, task_id):
+    """
+    Makes the task's upcoming shifts follow its new rules once add_task_roles() has been committed.
+    A task that has never been scheduled has nothing to repair; the next full schedule covers it.
+    """
+    scheduled = CurrentTaskAssignment.query().where("TaskType", "=", table_type).where("TaskID", "=", task_id).exists()
+    if scheduled:
+        print_repair(reschedule_task(table_type, task_id))
 
 
 def add_CurrentTaskAssignment_questions(*args):
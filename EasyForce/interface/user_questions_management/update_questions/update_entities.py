@@ -1,6 +1,21 @@
-# from EasyForce.data_management.data_structure.entities_classes import Team, Soldier
-# from EasyForce.interface.user_questions_management.general_questions import ask_closed_ended_question, \
-#     ask_open_ended_question
+"""
+update_entities.py
+
+Functions for updating existing entity records.
+Like the add flows (see add_entities.py), each flow asks all of its questions first and then
+writes inside one BaseEntity.transaction(). Once that transaction has been committed, the
+reschedule_after_* hooks of add_relationships.py repair the stored schedule around the change.
+"""
+
+from EasyForce.data_management.data_structure.data_modification import BaseEntity
+from EasyForce.data_management.data_structure.entities_classes import Team, Soldier, RecurringTask, TemporaryTask
+from EasyForce.data_management.data_structure.relationships_classes import Presence
+from EasyForce.common.constants import *
+from EasyForce.common.utils import questions
+from EasyForce.interface.user_questions_management.general_questions import ask_closed_ended_question
+from EasyForce.interface.user_questions_management.add_questions.add_relationships import (
+    add_presence_periods, add_task_roles, reschedule_after_presence, reschedule_after_task_roles
+)
 
 
 def update_TimeRange_questions():
@@ -10,21 +25,81 @@ def update_Team_questions():
     return
 
 def update_Soldier_questions():
-    # teams_list = [t.TeamName for t in Team.get_all()]
-    # team_name = ask_closed_ended_question("Select the team the soldier is on:",teams_list)
-    # team_id = Team.get_by_unique_name(team_name)
-    # soldier_list = [f"{s.TeamName}, ID: {s.SoldierID}" for s in Soldier.get_all_by_column_value("TeamID",team_id)]
-    # chosen_soldier = ask_closed_ended_question("Select the soldier:",soldier_list)
-    # soldier_id = int(chosen_soldier.split("ID: ")[1])
-    # soldier = Soldier.get_by_id({"SoldierID":soldier_id})
-    # print(f"The current data: {soldier}")
-    # attributes = Soldier.get_columns()
-    # chosen_attribute = ask_closed_ended_question("Select the attributes you want to update",attributes)
+    """
+    Adds presence periods (on base or away) to an existing soldier, then repairs the soldier's
+    upcoming shifts that the new periods affect.
 
-    return
+    Returns:
+        The soldier's id, or None if nothing was saved.
+    """
+    teams_list = [t.TeamName for t in Team.get_all()]
+    if not teams_list:
+        print("No teams available.")
+        return None
+    team_name = ask_closed_ended_question("Select the team the soldier is on:", teams_list, previous_question=True)
+    if team_name == "Return":
+        return None
+    team_id = Team.get_by_unique_name(team_name).TeamID
+    soldiers = Soldier.get_all_by_column_value("TeamID", team_id) or []
+    if not soldiers:
+        print("No soldiers in this team.")
+        return None
+    soldier_list = [f"{s.FullName}, ID: {s.SoldierID}" for s in soldiers]
+    chosen_soldier = ask_closed_ended_question("Select the soldier:", soldier_list, previous_question=True)
+    if chosen_soldier == "Return":
+        return None
+    soldier_id = int(chosen_soldier.split("ID: ")[1])
+    soldier = next(s for s in soldiers if s.SoldierID == soldier_id)
+
+    periods = questions(TIME_RANGE_TABLE, ADD, SOLDIER_TABLE, {"FullName": soldier.FullName, "SoldierID": soldier_id})
+    if not periods:
+        return None
+    # Read before the write: the first 'in' period changes what the soldier's other shifts depend on
+    had_active_periods = Presence.query().where("SoldierTeamTaskType", "=", SOLDIER_TABLE) \
+        .where("SoldierTeamTaskID", "=", soldier_id).where("isActive", "=", 1).exists()
+
+    try:
+        with BaseEntity.transaction():
+            if not add_presence_periods(SOLDIER_TABLE, soldier_id, periods):
+                raise RuntimeError(f"the presence of {soldier.FullName} could not be added")
+    except RuntimeError as e:
+        print(f"Update Error: {e}; nothing was saved.")
+        return None
+    reschedule_after_presence(SOLDIER_TABLE, soldier_id, periods, had_active_periods)
+    return soldier_id
 
 def update_Role_questions():
     return
 
-def update_Task_questions():
-    return
\ No newline at end of file
+def update_Task_questions(table):
+    """
+    Adds TaskRole rules (soldiers, roles or teams that must or cannot take the task) to an
+    existing task, then repairs the task's upcoming shifts under the new rules.
+
+    Returns:
+        The task's id, or None if nothing was saved.
+    """
+    tasks = (RecurringTask if table == RECURRING_TASK_TABLE else TemporaryTask).get_all()
+    if not tasks:
+        print("No tasks available.")
+        return None
+    chosen = ask_closed_ended_question("Choose a task:", [f"{t.TaskName}, ID: {t.TaskID}" for t in tasks],
+                                       previous_question=True)
+    if chosen == "Return":
+        return None
+    task_id = int(chosen.split("ID: ")[1])
+    task = next(t for t in tasks if t.TaskID == task_id)
+
+    task_roles = questions(ROLE_TABLE, ADD, table, {"TaskName": task.TaskName})
+    if not task_roles:
+        return None
+
+    try:
+        with BaseEntity.transaction():
+            if not add_task_roles(table, task_id, task_roles):
+                raise RuntimeError(f"the restrictions of {task.TaskName} could not be added")
+    except RuntimeError as e:
+        print(f"Update Error: {e}; nothing was saved.")
+        return None
+    reschedule_after_task_roles(table, task_id)
+    return task_id
@@ -1,9 +1,41 @@
 import sys
+from EasyForce.common import config
+from EasyForce.common.constants import GARBAGE_COLLECTOR_BATCH_SIZE
+from EasyForce.data_management.db_connection import is_read_only
 from EasyForce.data_management.init_db.init_database import initialize_database
-from interface.main_interface import menu
+from EasyForce.data_management.snapshot import load_snapshot, save_snapshot
+from EasyForce.data_management.data_structure.entities_classes import TimeRange
+from EasyForce.interface.main_interface import menu
 
-if __name__ == "__main__":
+
+def start_up(in_memory: bool = False) -> bool:
+    """
+    Prepares the database for a session: loads the snapshot (--memory), brings the schema up to
+    date and removes the time ranges the previous session left unused. A read-only profile
+    (query_only) skips the cleanup, so only a database that is already up to date can be read.
+
+    Returns:
+        bool: False if the database is not ready to use.
+    """
+    if in_memory:
+        config.DB_PATH = config.MEMORY_DB_PATH
+        load_snapshot()
     if not initialize_database():
         print("Please ensure the database initialization is completed successfully before using the system.")
+        return False
+    if not is_read_only():
+        # Time ranges left unused by the previous session, removed in short transactions
+        TimeRange.garbage_collector(batch_size=GARBAGE_COLLECTOR_BATCH_SIZE)
+    return True
+
+
+if __name__ == "__main__":
+    # --memory: work on an in-memory copy of my_database.db and write it back on exit
+    in_memory = "--memory" in sys.argv[1:]
+    if not start_up(in_memory):
         sys.exit(1)
-    menu()
\ No newline at end of file
+    try:
+        menu()
+    finally:
+        if in_memory and not is_read_only() and save_snapshot():
+            print(f"Saved the session to {config.SNAPSHOT_PATH}.")
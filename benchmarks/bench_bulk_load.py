@@ -0,0 +1,103 @@
+"""
+bench_bulk_load.py
+
+Imports a presence and task history backlog (soldiers, teams, tasks, time ranges,
+Presence and TaskHistory rows) into a fresh database with add_many(), once with the
+per-row validation triggers active and once inside BaseEntity.bulk_load(), where
+they are replaced by one set-based integrity check at the end.
+
+With 'existing rows', the database already holds that many rows of each kind before the
+timed import, to show that a load costs work for the rows it inserts, not for the whole table.
+
+Run from the repository root:
+    python -m benchmarks.bench_bulk_load [presence rows] [existing rows]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from EasyForce.common import config
+from EasyForce.data_management.db_connection import close_connections
+from EasyForce.data_management.data_structure.data_modification import BaseEntity
+from EasyForce.data_management.data_structure.entities_classes import Team, Soldier, TimeRange, RecurringTask
+from EasyForce.data_management.data_structure.relationships_classes import Presence, TaskHistory
+from EasyForce.data_management.init_db.init_database import initialize_database
+
+SOLDIERS = 2000
+TEAMS = 40
+TASKS = 20
+
+
+def _build(row_count, first=0):
+    """
+    Builds the entity lists up front, so only the database writes are timed. With 'first', the
+    rows continue after 'first' rows already loaded (which brought the teams, soldiers and tasks).
+    """
+    entities = [] if first else [
+        [Team(TeamID=i + 1, TeamName=f"Team {i}") for i in range(TEAMS)],
+        [Soldier(SoldierID=i + 1, FullName=f"Soldier {i}", TeamID=i % TEAMS + 1) for i in range(SOLDIERS)],
+        [RecurringTask(TaskID=i + 1, TaskName=f"Task {i}", ShiftDurationInMinutes=240,
+                       EveryDayStartTime="08:00", EveryDayEndTime="20:00", RequiredPersonnel=2) for i in range(TASKS)],
+    ]
+    return entities + [
+        [TimeRange(TimeID=i + 1, StartDateTime=f"2025-01-01 00:00:{i % 60:02}.{i:06}",
+                   EndDateTime=f"2025-01-02 00:00:00.{i:06}") for i in range(first, first + row_count)],
+        [Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=i % SOLDIERS + 1, TimeID=i + 1, isActive=i % 2)
+         for i in range(first, first + row_count)],
+        [TaskHistory(TaskType="RecurringTask", TaskID=i % TASKS + 1, SoldierOrTeamType="Soldier",
+                     SoldierOrTeamID=i % SOLDIERS + 1, TaskReputation="None", TimeID=i + 1,
+                     CompletionStatus="Completed") for i in range(first, first + row_count)],
+    ]
+
+
+def _load(batches):
+    for batch in batches:
+        type(batch[0]).add_many(batch)
+
+
+def load_with_triggers(batches):
+    with BaseEntity.transaction():
+        _load(batches)
+
+
+def load_bulk_mode(batches):
+    with BaseEntity.bulk_load():
+        _load(batches)
+
+
+def run(loader, row_count, existing=0):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        close_connections()
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_database()
+        if existing:
+            load_bulk_mode(_build(existing))
+        batches = _build(row_count, existing)
+        start = time.perf_counter()
+        loader(batches)
+        elapsed = time.perf_counter() - start
+        loaded = len(Presence.get_all())
+        close_connections()
+    if loaded != existing + row_count:
+        raise RuntimeError(f"Expected {existing + row_count} presence rows, found {loaded}.")
+    return elapsed
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    existing = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    print(f"import: {row_count} time ranges, {row_count} presence rows, {row_count} task history rows"
+          + (f" into a database holding {existing} of each" if existing else ""))
+    results = [run(loader, row_count, existing) for loader in (load_with_triggers, load_bulk_mode)]
+    for label, elapsed in zip(("per-row triggers", "bulk_load()"), results):
+        print(f"{label:18} {elapsed * 1000:10.1f} ms")
+    print(f"speed-up: {results[0] / results[1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
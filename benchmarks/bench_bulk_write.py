@@ -0,0 +1,76 @@
+"""
+bench_bulk_write.py
+
+Loads a brigade-sized force (teams, soldiers, roles, soldier roles) into a fresh database,
+once with one add() per row and once with the add_many() bulk API.
+
+Run from the repository root:
+    python -m benchmarks.bench_bulk_write [soldiers]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from EasyForce.common import config
+from EasyForce.data_management.db_connection import close_connections
+from EasyForce.data_management.data_structure.entities_classes import Team, Soldier, Role
+from EasyForce.data_management.data_structure.relationships_classes import SoldierRole
+from EasyForce.data_management.init_db.init_database import initialize_database
+
+SOLDIERS_PER_TEAM = 50
+ROLES = 20
+
+
+def _brigade(soldier_count):
+    teams = [Team(TeamName=f"Team {i}") for i in range(soldier_count // SOLDIERS_PER_TEAM + 1)]
+    roles = [Role(RoleName=f"Role {i}") for i in range(ROLES)]
+    return teams, roles
+
+
+def load_one_by_one(soldier_count):
+    teams, roles = _brigade(soldier_count)
+    for entity in teams + roles:
+        entity.add()
+    for i in range(soldier_count):
+        Soldier(SoldierID=i + 1, FullName=f"Soldier {i}", TeamID=teams[i // SOLDIERS_PER_TEAM].TeamID).add()
+        SoldierRole(SoldierID=i + 1, RoleID=roles[i % ROLES].RoleID).add()
+
+
+def load_bulk(soldier_count):
+    teams, roles = _brigade(soldier_count)
+    Team.add_many(teams)
+    Role.add_many(roles)
+    Soldier.add_many([Soldier(SoldierID=i + 1, FullName=f"Soldier {i}", TeamID=teams[i // SOLDIERS_PER_TEAM].TeamID)
+                      for i in range(soldier_count)])
+    SoldierRole.add_many([SoldierRole(SoldierID=i + 1, RoleID=roles[i % ROLES].RoleID) for i in range(soldier_count)])
+
+
+def run(loader, soldier_count):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        close_connections()
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_database()
+        start = time.perf_counter()
+        loader(soldier_count)
+        elapsed = time.perf_counter() - start
+        loaded = len(Soldier.get_all())
+        close_connections()
+    if loaded != soldier_count:
+        raise RuntimeError(f"Expected {soldier_count} soldiers, found {loaded}.")
+    return elapsed
+
+
+def main():
+    soldier_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"brigade load: {soldier_count} soldiers, {ROLES} roles, {SOLDIERS_PER_TEAM} soldiers per team")
+    for label, loader in (("add() per row", load_one_by_one), ("add_many()", load_bulk)):
+        print(f"{label:16} {run(loader, soldier_count) * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
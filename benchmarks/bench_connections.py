@@ -0,0 +1,112 @@
+"""
+bench_connections.py
+
+Counts how many SQLite connections a typical interactive add-soldier flow opens,
+with the legacy connect-per-call behaviour and with the pooled connection.
+
+The flow is driven through add_Soldier_questions() with scripted answers:
+a new soldier with one role, a new team, one "in base" range and one "out of base" range.
+
+Run from the repository root:
+    python -m benchmarks.bench_connections [repetitions]
+"""
+
+import builtins
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from EasyForce.common import config
+from EasyForce.data_management import read_db
+from EasyForce.data_management.data_structure import data_modification
+from EasyForce.data_management.db_connection import close_connections
+from EasyForce.data_management.init_db.init_database import initialize_database
+from EasyForce.interface.user_questions_management.add_questions.add_entities import add_Soldier_questions
+
+
+def _scripted_answers(index):
+    return iter([
+        f"Soldier {index}", str(1000 + index),                  # name, ID
+        "1", f"Role {index}", "2",                               # add a role, no more roles
+        f"Team {index}",                                         # new team (first soldier of the team)
+        "1", "01/03/2025 08:00", "10/03/2025 18:00", "2",        # in base
+        "1", "03/03/2025 08:00", "04/03/2025 08:00", "2",        # out of base
+    ])
+
+
+def _legacy_connection():
+    return sqlite3.connect(config.DB_PATH)
+
+
+@contextlib.contextmanager
+def _legacy_transaction():
+    with _legacy_connection() as conn:
+        yield conn
+
+
+@contextlib.contextmanager
+def _legacy_mode():
+    """
+    Emulates the old behaviour: every call opens (and commits on) a brand new connection.
+    Transaction scopes also open one each here, so the "before" count is slightly pessimistic.
+    """
+    saved = data_modification.get_connection, data_modification.transaction, read_db.get_connection
+    data_modification.get_connection = read_db.get_connection = _legacy_connection
+    data_modification.transaction = _legacy_transaction
+    try:
+        yield
+    finally:
+        data_modification.get_connection, data_modification.transaction, read_db.get_connection = saved
+
+
+def run_flow(repetitions, legacy):
+    counter = {"connect": 0}
+    real_connect = sqlite3.connect
+
+    def counting_connect(*args, **kwargs):
+        counter["connect"] += 1
+        return real_connect(*args, **kwargs)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        close_connections()
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_database()
+        close_connections()
+
+        mode = _legacy_mode() if legacy else contextlib.nullcontext()
+        real_input = builtins.input
+        sqlite3.connect = counting_connect
+        start = time.perf_counter()
+        try:
+            with mode, contextlib.redirect_stdout(io.StringIO()):
+                for i in range(repetitions):
+                    answers = _scripted_answers(i)
+                    builtins.input = lambda prompt="": next(answers)
+                    add_Soldier_questions()
+        finally:
+            elapsed = time.perf_counter() - start
+            builtins.input = real_input
+            sqlite3.connect = real_connect
+        soldiers = len(data_modification.get_connection().execute("SELECT SoldierID FROM Soldier").fetchall())
+        close_connections()
+    if soldiers != repetitions:
+        raise RuntimeError(f"Expected {repetitions} soldiers to be added, found {soldiers}.")
+    return counter["connect"], elapsed
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"add-soldier flow x{repetitions}")
+    for label, legacy in (("connect-per-call (before)", True), ("pooled (after)", False)):
+        connections, elapsed = run_flow(repetitions, legacy)
+        print(f"{label:28} connections opened: {connections:6}  "
+              f"per flow: {connections / repetitions:7.1f}  time: {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
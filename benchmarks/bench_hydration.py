@@ -0,0 +1,103 @@
+"""
+bench_hydration.py
+
+Hydrates Presence rows into entity instances two ways and compares time and retained memory:
+  - dict-based: the previous construction path, cls(**dict(zip(columns, row))) followed by
+    a setattr() loop into each instance's __dict__; every row keeps its own column values,
+  - slot-based: the generated per-layout constructor of the __slots__ BaseEntity, whose rows
+    share one object per distinct value of the repeated columns (the entity type and id).
+The time of fetching the rows alone is printed too: no constructor can go below it.
+
+Run from the repository root:
+    python -m benchmarks.bench_hydration [rows]        (e.g. 1000000)
+"""
+
+import gc
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+from EasyForce.data_management.data_structure.relationships_classes import Presence
+
+
+class DictPresence:
+    """Stand-in for the old entity layout: attributes live in a per-instance __dict__."""
+
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+def _rows(conn):
+    return conn.execute("SELECT SoldierTeamTaskType, SoldierTeamTaskID, TimeID, isActive FROM Presence")
+
+
+def fetch_only(conn):
+    return list(_rows(conn))
+
+
+def hydrate_dict_based(conn):
+    columns = Presence.get_columns()
+    return [DictPresence(**dict(zip(columns, row))) for row in _rows(conn)]
+
+
+def hydrate_slot_based(conn):
+    build = Presence._row_constructor(Presence.get_columns())
+    return [build(row) for row in _rows(conn)]
+
+
+def measure(hydrate, conn):
+    """
+    Returns (seconds, retained bytes, bytes per instance object).
+    Time is taken without tracemalloc, which would slow the allocation-heavy path down unevenly.
+    The per-instance figure excludes the column values.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    instances = hydrate(conn)
+    elapsed = time.perf_counter() - start
+    assert len(instances) and instances[-1].TimeID is not None
+    del instances
+
+    gc.collect()
+    tracemalloc.start()
+    instances = hydrate(conn)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    instance_dict = getattr(instances[0], "__dict__", None)
+    per_instance = sys.getsizeof(instances[0]) + (sys.getsizeof(instance_dict) if instance_dict is not None else 0)
+    del instances
+    return elapsed, retained, per_instance
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE Presence (SoldierTeamTaskType TEXT, SoldierTeamTaskID INTEGER, "
+                 "TimeID INTEGER, isActive INTEGER)")
+    conn.executemany("INSERT INTO Presence VALUES (?, ?, ?, ?)",
+                     (("Soldier", i % 5000, i, i % 2) for i in range(row_count)))
+
+    print(f"hydrating {row_count} Presence rows")
+    gc.collect()
+    start = time.perf_counter()
+    fetch_only(conn)
+    fetch_time = time.perf_counter() - start
+    print(f"{'fetch only (no objects)':22} time: {fetch_time * 1000:9.1f} ms")
+
+    results = {}
+    for label, hydrate in (("dict-based (before)", hydrate_dict_based), ("slot-based (after)", hydrate_slot_based)):
+        elapsed, retained, per_instance = measure(hydrate, conn)
+        results[label] = (elapsed, retained, per_instance)
+        print(f"{label:22} time: {elapsed * 1000:9.1f} ms   retained: {retained / 2 ** 20:8.1f} MiB   "
+              f"instance object: {per_instance} B")
+
+    (before_time, before_mem, before_obj), (after_time, after_mem, after_obj) = results.values()
+    print(f"speed-up: {before_time / after_time:.1f}x   memory: {after_mem / before_mem:.0%} of before   "
+          f"instance object: {after_obj / before_obj:.0%} of before")
+    print(f"construction cost on top of the fetch: {(before_time - fetch_time) / (after_time - fetch_time):.1f}x lower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+bench_overlap.py
+
+Finds the TimeRange rows overlapping a set of random one-hour windows in a long history,
+once with the B-tree range condition on (StartMinute, EndMinute) and once through the
+TimeRange R*Tree (TimeRange.query().overlapping()).
+
+Run from the repository root:
+    python -m benchmarks.bench_overlap [time ranges]
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from EasyForce.common import config
+from EasyForce.common.utils import to_epoch_minutes
+from EasyForce.data_management.db_connection import close_connections
+from EasyForce.data_management.data_structure.entities_classes import TimeRange
+from EasyForce.data_management.init_db.init_database import initialize_database
+
+WINDOWS = 1000
+HISTORY_DAYS = 3 * 365
+BASE = datetime(2023, 1, 1)
+
+
+def _fill(row_count, generator):
+    ranges = []
+    for i in range(row_count):
+        start = BASE + timedelta(minutes=generator.randrange(HISTORY_DAYS * 24 * 60))
+        ranges.append(TimeRange(TimeID=i + 1, StartDateTime=str(start),
+                                EndDateTime=str(start + timedelta(minutes=generator.randrange(60, 3 * 24 * 60)))))
+    TimeRange.add_many(ranges)
+
+
+def btree_lookup(start, end):
+    return TimeRange.query().where("StartMinute", "<=", to_epoch_minutes(end)) \
+        .where("EndMinute", ">=", to_epoch_minutes(start)).all()
+
+
+def rtree_lookup(start, end):
+    return TimeRange.query().overlapping(start, end).all()
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    generator = random.Random(1)
+    windows = []
+    for _ in range(WINDOWS):
+        start = BASE + timedelta(minutes=generator.randrange(HISTORY_DAYS * 24 * 60))
+        windows.append((start, start + timedelta(hours=1)))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        close_connections()
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_database()
+        _fill(row_count, generator)
+
+        print(f"{WINDOWS} one-hour windows over {row_count} time ranges ({HISTORY_DAYS} days)")
+        results = {}
+        for label, lookup in (("B-tree (minutes)", btree_lookup), ("R*Tree", rtree_lookup)):
+            start_time = time.perf_counter()
+            results[label] = [len(lookup(start, end)) for start, end in windows]
+            print(f"{label:18} {(time.perf_counter() - start_time) * 1000:10.1f} ms")
+        close_connections()
+    if len(set(map(tuple, results.values()))) != 1:
+        raise RuntimeError("The two lookups returned different rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+bench_profiles.py
+
+Runs three workloads against a fresh database file under every performance profile in
+config.PERFORMANCE_PROFILES, plus SQLite's own defaults (rollback journal, synchronous=FULL,
+~2 MB cache) as the baseline. A read-only profile (query_only) only runs the reporting workload,
+on a database written under the interactive profile:
+
+    interactive   single-row TimeRange.add() calls, each committed on its own
+    bulk import   one BaseEntity.bulk_load() with add_many() of TimeRange rows
+    reporting     full-table streams and overlap lookups over the imported history
+
+Run from the repository root:
+    python -m benchmarks.bench_profiles [bulk rows]
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from EasyForce.common import config
+from EasyForce.data_management.db_connection import close_connections
+from EasyForce.data_management.data_structure.data_modification import BaseEntity
+from EasyForce.data_management.data_structure.entities_classes import TimeRange
+from EasyForce.data_management.init_db.init_database import initialize_database
+
+SQLITE_DEFAULTS = {
+    "journal_mode": "DELETE",
+    "synchronous": "FULL",
+    "cache_size": -2000,
+    "mmap_size": 0,
+    "temp_store": "DEFAULT",
+    "busy_timeout": 5000,
+}
+SINGLE_WRITES = 500
+SCANS = 5
+LOOKUPS = 500
+BASE = datetime(2023, 1, 1)
+
+
+def _ranges(count, generator):
+    ranges = []
+    for _ in range(count):
+        start = BASE + timedelta(minutes=generator.randrange(3 * 365 * 24 * 60))
+        ranges.append(TimeRange(StartDateTime=str(start),
+                                EndDateTime=str(start + timedelta(minutes=generator.randrange(60, 3 * 24 * 60)))))
+    return ranges
+
+
+def interactive(generator, _):
+    for time_range in _ranges(SINGLE_WRITES, generator):
+        time_range.add()
+
+
+def bulk_import(generator, row_count):
+    ranges = _ranges(row_count, generator)
+    with BaseEntity.bulk_load():
+        TimeRange.add_many(ranges)
+
+
+def reporting(generator, _):
+    for _ in range(SCANS):
+        sum(1 for _ in TimeRange.iter_all())
+    for _ in range(LOOKUPS):
+        start = BASE + timedelta(minutes=generator.randrange(3 * 365 * 24 * 60))
+        TimeRange.overlapping(start, start + timedelta(days=1))
+
+
+def run(profile, row_count):
+    """
+    Returns {workload: seconds} for one profile, each workload timed on the same database
+    (None for the write workloads of a read-only profile).
+    """
+    read_only = config.PERFORMANCE_PROFILES[profile].get("query_only") == "ON"
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        config.DB_PROFILE = "interactive" if read_only else profile
+        close_connections()
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_database()
+        generator = random.Random(3)
+        for workload in (interactive, bulk_import, reporting):
+            if workload is reporting and read_only:
+                config.DB_PROFILE = profile
+                close_connections()
+            start = time.perf_counter()
+            workload(generator, row_count)
+            timings[workload.__name__] = None if read_only and workload is not reporting \
+                else time.perf_counter() - start
+        close_connections()
+    return timings
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    config.PERFORMANCE_PROFILES["sqlite-defaults"] = SQLITE_DEFAULTS
+    config.DB_PRAGMA_OVERRIDES = {}
+    print(f"interactive: {SINGLE_WRITES} single-row commits, bulk import: {row_count} rows, "
+          f"reporting: {SCANS} full scans + {LOOKUPS} overlap lookups")
+    print(f"{'profile':16} {'interactive':>12} {'bulk import':>12} {'reporting':>12}")
+    for profile in ("sqlite-defaults", *(name for name in config.PERFORMANCE_PROFILES if name != "sqlite-defaults")):
+        timings = run(profile, row_count)
+        print(f"{profile:16}" + "".join(f"{'-':>13}" if seconds is None else f"{seconds * 1000:10.1f} ms"
+                                        for seconds in timings.values()))
+
+
+if __name__ == "__main__":
+    main()
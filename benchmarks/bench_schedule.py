@@ -0,0 +1,136 @@
+"""
+bench_schedule.py
+
+Schedules a 30-day horizon for a few hundred soldiers with every solver of schedule_logic.SOLVERS,
+and prints the quality of each schedule and the time of every phase of run_schedule(); then
+records one soldier's absence and times the incremental repair (reschedule.reschedule_soldier()).
+
+The generated base has teams of soldiers with roles, presence periods with absences, recurring
+tasks (day, overnight and all-day windows), temporary tasks and TaskRole rules.
+
+Run from the repository root:
+    python -m benchmarks.bench_schedule [soldiers] [days]
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from EasyForce.common import config
+from EasyForce.data_management.db_connection import close_connections
+from EasyForce.data_management.data_structure.entities_classes import (
+    Team, Soldier, Role, RecurringTask, TemporaryTask, TimeRange
+)
+from EasyForce.data_management.data_structure.relationships_classes import (
+    Presence, SoldierRole, TaskRole, CurrentTaskAssignment
+)
+from EasyForce.data_management.init_db.init_database import initialize_database
+from EasyForce.data_processing.reschedule import reschedule_soldier
+from EasyForce.data_processing.schedule_logic import SOLVERS, run_schedule
+
+START = datetime(2025, 3, 1)
+TEAM_SIZE = 20
+ROLES = 8
+# (start, end, shift minutes, personnel): day, evening, overnight and all-day windows
+RECURRING_WINDOWS = [("08:00", "16:00", 240, 2), ("06:00", "18:00", 180, 1), ("16:00", "00:00", 240, 2),
+                     ("22:00", "06:00", 240, 2), ("20:00", "04:00", 120, 1), ("08:00", "08:00", 480, 1),
+                     ("08:00", "08:00", 240, 2), ("00:00", "00:00", 360, 1), ("07:00", "19:00", 360, 3),
+                     ("12:00", "20:00", 240, 1), ("18:00", "02:00", 480, 2), ("05:00", "13:00", 240, 1)]
+TEMPORARY_TASKS = 6
+
+
+def _fill(soldier_count, days, generator):
+    """Writes the base through the bulk APIs; returns nothing."""
+    team_count = max(1, soldier_count // TEAM_SIZE)
+    Team.add_many([Team(TeamID=i + 1, TeamName=f"Team {i + 1}") for i in range(team_count)])
+    Soldier.add_many([Soldier(SoldierID=i + 1, FullName=f"Soldier {i + 1}", TeamID=i % team_count + 1)
+                      for i in range(soldier_count)])
+    Role.add_many([Role(RoleID=i + 1, RoleName=f"Role {i + 1}") for i in range(ROLES)])
+    SoldierRole.add_many([SoldierRole(SoldierID=i + 1, RoleID=role_id) for i in range(soldier_count)
+                          for role_id in generator.sample(range(1, ROLES + 1), generator.randrange(3))])
+
+    RecurringTask.add_many([RecurringTask(TaskID=i + 1, TaskName=f"Recurring {i + 1}", ShiftDurationInMinutes=minutes,
+                                          EveryDayStartTime=start, EveryDayEndTime=end, RequiredPersonnel=personnel)
+                            for i, (start, end, minutes, personnel) in enumerate(RECURRING_WINDOWS)])
+    TemporaryTask.add_many([TemporaryTask(TaskID=i + 1, TaskName=f"Temporary {i + 1}", TaskReputation="None")
+                            for i in range(TEMPORARY_TASKS)])
+    rules = []
+    for i in range(len(RECURRING_WINDOWS)):
+        rules.append(TaskRole(TaskType="RecurringTask", TaskID=i + 1, SoldierOrRole="Role",
+                              SoldierOrRoleID=i % ROLES + 1, MinRequiredCount=1, RoleEnforcementType=1))
+        rules.append(TaskRole(TaskType="RecurringTask", TaskID=i + 1, SoldierOrRole="Role",
+                              SoldierOrRoleID=(i + 3) % ROLES + 1, MinRequiredCount=0, RoleEnforcementType=0))
+    for i in range(TEMPORARY_TASKS):
+        rules.append(TaskRole(TaskType="TemporaryTask", TaskID=i + 1, SoldierOrRole="Role",
+                              SoldierOrRoleID=i % ROLES + 1, MinRequiredCount=2, RoleEnforcementType=1))
+    TaskRole.add_many(rules)
+
+    # Every soldier is on base for the horizon, with a few absences; temporary tasks run a few times
+    periods = [("Soldier", i + 1, START - timedelta(days=1), START + timedelta(days=days + 1), 1)
+               for i in range(soldier_count)]
+    for i in range(soldier_count):
+        for _ in range(generator.randrange(4)):
+            start = START + timedelta(hours=generator.randrange(days * 24))
+            periods.append(("Soldier", i + 1, start, start + timedelta(hours=generator.randrange(12, 72)), 0))
+    for i in range(TEMPORARY_TASKS):
+        for _ in range(days // 5):
+            start = START + timedelta(hours=generator.randrange(days * 24 - 12))
+            periods.append(("TemporaryTask", i + 1, start, start + timedelta(hours=generator.randrange(2, 12)), 1))
+    time_ranges = TimeRange.add_many([TimeRange(StartDateTime=str(start), EndDateTime=str(end))
+                                      for _, _, start, end, _ in periods])
+    # Written directly, not through Presence.add(): the engine resolves overlapping stays and absences itself
+    rows = [Presence(SoldierTeamTaskType=entity_type, SoldierTeamTaskID=entity_id, TimeID=time_range.TimeID, isActive=active)
+            for (entity_type, entity_id, _, _, active), time_range in zip(periods, time_ranges)]
+    Presence.add_many(rows)
+
+
+def _repair_one_absence(days):
+    """Sends the soldier of a mid-horizon shift away for two days and repairs the schedule around it."""
+    middle = START + timedelta(days=days // 2)
+    assignment = CurrentTaskAssignment.query().overlapping(middle, middle + timedelta(hours=1)).first()
+    start, end = middle - timedelta(hours=12), middle + timedelta(days=2)
+    absence = TimeRange(StartDateTime=str(start), EndDateTime=str(end)).add()
+    Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=assignment.SoldierOrTeamID,
+             TimeID=absence.TimeID, isActive=0).add()
+    # The generated base lies in the past: repair as if it were the start of the horizon
+    return reschedule_soldier(assignment.SoldierOrTeamID, start, end, now=START)
+
+
+def main():
+    soldier_count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    generator = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        close_connections()
+        with contextlib.redirect_stdout(io.StringIO()):
+            initialize_database()
+        _fill(soldier_count, days, generator)
+
+        reports = {}
+        for solver in SOLVERS:
+            start_time = time.perf_counter()
+            report, _, _ = run_schedule(START, days, solver)
+            reports[solver] = (report, time.perf_counter() - start_time)
+        repair = _repair_one_absence(days)
+        close_connections()
+
+    print(f"{soldier_count} soldiers, {len(RECURRING_WINDOWS)} recurring + {TEMPORARY_TASKS} temporary tasks, {days} days")
+    for solver, (report, total) in reports.items():
+        print(f"\n{solver}: {report.slots} shifts, {report.assigned}/{report.required} positions filled, "
+              f"{report.unfilled_slots} shifts short, {report.role_shortfall} role positions missing, "
+              f"load spread {report.load_spread:.0f} h")
+        for name, seconds in report.timings.items():
+            print(f"  {name:12} {seconds * 1000:10.1f} ms")
+        print(f"  {'total':12} {total * 1000:10.1f} ms")
+    print(f"\nOne soldier away for two days, incremental repair: {repair.slots} shifts, "
+          f"{repair.removed} assignments replaced, {repair.seconds * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
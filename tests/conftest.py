@@ -0,0 +1,26 @@
+import pytest
+
+from EasyForce.common import config
+from EasyForce.data_management.db_connection import close_connections
+from EasyForce.data_management.init_db.init_database import initialize_database
+
+
+@pytest.fixture
+def temp_db(monkeypatch):
+    """Points the whole application at a fresh, fully initialized in-memory database."""
+    monkeypatch.setattr(config, "DB_PATH", config.MEMORY_DB_PATH)
+    close_connections()
+    assert initialize_database()
+    yield config.DB_PATH
+    # Closing the last connection discards the in-memory database
+    close_connections()
+
+
+@pytest.fixture
+def file_db(tmp_path, monkeypatch):
+    """Like temp_db, but on a database file, for behaviour that needs one (journal modes, snapshots)."""
+    monkeypatch.setattr(config, "DB_PATH", str(tmp_path / "test_database.db"))
+    close_connections()
+    assert initialize_database()
+    yield config.DB_PATH
+    close_connections()
@@ -0,0 +1,71 @@
+import pytest
+
+from EasyForce.data_management.bulk_load import IntegrityCheckError
+from EasyForce.data_management.db_connection import get_connection
+from EasyForce.data_management.data_structure.data_modification import BaseEntity
+from EasyForce.data_management.data_structure.entities_classes import Team, Soldier, TimeRange
+from EasyForce.data_management.data_structure.relationships_classes import Presence
+from EasyForce.data_management.init_db.init_triggers import DEFERRABLE_TRIGGERS, REDUNDANT_UNIQUENESS_TRIGGERS
+
+
+def trigger_names():
+    return {row[0] for row in get_connection().execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+
+
+def load(soldier_ids, presence_ids):
+    with BaseEntity.bulk_load():
+        assert not trigger_names() & set(DEFERRABLE_TRIGGERS)
+        team = Team(TeamName="Alpha").add()
+        Soldier.add_many([Soldier(SoldierID=i, FullName=f"S{i}", TeamID=team.TeamID) for i in soldier_ids])
+        time_range = TimeRange(StartDateTime="2025-03-01 08:00:00", EndDateTime="2025-03-02 08:00:00").add()
+        Presence.add_many([Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=i, TimeID=time_range.TimeID,
+                                    isActive=1) for i in presence_ids])
+
+
+def test_bulk_load_commits_valid_data_and_restores_triggers(temp_db):
+    load(range(1, 101), range(1, 101))
+    assert len(Presence.get_all()) == 100
+    assert set(DEFERRABLE_TRIGGERS) <= trigger_names()
+
+
+def test_bulk_load_rolls_back_on_integrity_violation(temp_db):
+    with pytest.raises(IntegrityCheckError) as error:
+        load(range(1, 11), range(1, 12))
+    assert error.value.violations[0][1] == [("Soldier", 11, 1)]
+    assert Team.get_all() == [] and Presence.get_all() == []
+    assert set(DEFERRABLE_TRIGGERS) <= trigger_names()
+
+
+def test_redundant_uniqueness_triggers_are_dropped_but_names_stay_unique(temp_db):
+    assert not trigger_names() & set(REDUNDANT_UNIQUENESS_TRIGGERS)
+    Team(TeamName="Alpha").add()
+    assert Team(TeamName="Alpha").add() is None
+
+
+def test_bulk_load_only_checks_the_rows_it_inserted(temp_db):
+    load(range(1, 3), range(1, 3))
+    # Presence is not covered by a foreign key: soldier 2's row is left behind
+    get_connection().execute("DELETE FROM Soldier WHERE SoldierID = 2")
+    with BaseEntity.bulk_load():
+        Soldier(SoldierID=3, FullName="S3", TeamID=1).add()
+        Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=3, TimeID=1, isActive=1).add()
+    assert len(Presence.get_all()) == 3
+
+
+def test_bulk_load_indexes_only_the_ranges_it_inserted(temp_db):
+    kept = TimeRange(StartDateTime="2025-03-01 08:00", EndDateTime="2025-03-01 12:00").add()
+    moved = TimeRange(StartDateTime="2025-03-05 08:00", EndDateTime="2025-03-05 12:00").add()
+    with BaseEntity.bulk_load():
+        loaded = TimeRange.add_many([TimeRange(StartDateTime=f"2025-03-0{day} 10:00", EndDateTime=f"2025-03-0{day} 14:00")
+                                     for day in (1, 3)])
+        # Changes to ranges are still mirrored by the update trigger, for loaded ranges too
+        moved.StartDateTime, moved.EndDateTime = "2025-03-02 08:00", "2025-03-02 12:00"
+        moved.update()
+        loaded[1].StartDateTime = "2025-03-02 10:00"
+        loaded[1].update()
+
+    assert sorted(time_range.TimeID for time_range in TimeRange.overlapping("2025-03-01 09:00", "2025-03-01 11:00")) \
+        == [kept.TimeID, kept.TimeID + 2]
+    assert len(TimeRange.overlapping("2025-03-02 09:00", "2025-03-02 11:00")) == 2
+    assert TimeRange.overlapping("2025-03-05 00:00", "2025-03-06 00:00") == []
+    assert get_connection().execute("SELECT COUNT(*) FROM TimeRangeRTree").fetchone()[0] == 4
@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+
+from EasyForce.common import config
+from EasyForce.data_management.db_connection import get_connection, close_connections, profile_pragmas
+from EasyForce.main import start_up
+
+
+def _pragma(name):
+    return get_connection().execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_default_profile_is_applied_to_new_connections(file_db):
+    assert _pragma("journal_mode") == "wal"
+    assert _pragma("synchronous") == 1  # NORMAL
+    assert _pragma("cache_size") == config.PERFORMANCE_PROFILES["interactive"]["cache_size"]
+
+
+def test_profile_and_overrides_take_effect_on_reconnect(temp_db, monkeypatch):
+    monkeypatch.setattr(config, "DB_PROFILE", "bulk-import")
+    monkeypatch.setattr(config, "DB_PRAGMA_OVERRIDES", {"busy_timeout": "1234"})
+    close_connections()
+    assert _pragma("synchronous") == 0  # OFF
+    assert _pragma("busy_timeout") == 1234
+
+
+def test_settings_come_from_the_config_file_and_the_environment(tmp_path, monkeypatch):
+    config_file = tmp_path / "easyforce.ini"
+    config_file.write_text("[database]\nprofile = reporting\ncache_size = -500\nsynchronous = FULL\n")
+    monkeypatch.setattr(config, "CONFIG_FILE", str(config_file))
+    monkeypatch.setenv("EASYFORCE_DB_SYNCHRONOUS", "OFF")
+
+    assert config._load_db_settings() == ("reporting", {"cache_size": "-500", "synchronous": "OFF"})
+
+    monkeypatch.setenv("EASYFORCE_DB_PROFILE", "interactive")
+    assert config._load_db_settings()[0] == "interactive"
+
+
+@pytest.mark.parametrize("profile, overrides", [
+    ("no-such-profile", {}),
+    ("interactive", {"synchronous": "OFF; DROP TABLE Soldier"}),
+])
+def test_invalid_settings_are_rejected(monkeypatch, profile, overrides):
+    monkeypatch.setattr(config, "DB_PRAGMA_OVERRIDES", overrides)
+    with pytest.raises(ValueError):
+        profile_pragmas(profile)
+
+
+def test_read_only_reporting_profile_rejects_writes(file_db, monkeypatch):
+    monkeypatch.setattr(config, "DB_PROFILE", "reporting")  # the former name is an alias
+    close_connections()
+    assert _pragma("query_only") == 1
+    get_connection().execute("SELECT COUNT(*) FROM Soldier").fetchone()
+    with pytest.raises(sqlite3.OperationalError):
+        get_connection().execute("INSERT INTO Team (TeamName) VALUES ('Alpha')")
+
+
+def test_startup_under_the_read_only_profile_skips_its_writes(file_db, monkeypatch):
+    get_connection().execute("INSERT INTO TimeRange (StartDateTime, EndDateTime) VALUES ('2025-03-01 08:00', '2025-03-01 16:00')")
+    monkeypatch.setattr(config, "DB_PROFILE", "read-only-reporting")
+    close_connections()
+
+    assert start_up()
+    # The unused range the garbage collector would have deleted is still there
+    assert get_connection().execute("SELECT COUNT(*) FROM TimeRange").fetchone()[0] == 1
+
+
+def test_foreign_keys_stay_off_as_in_the_entity_operations_before_pooling(temp_db):
+    assert _pragma("foreign_keys") == 0
+    conn = get_connection()
+    conn.execute("INSERT INTO TemporaryTask (TaskName, TaskReputation) VALUES ('Convoy', 'Good')")
+    # With foreign keys on, TaskHistory's invalid reference makes this a "foreign key mismatch"
+    conn.execute("DELETE FROM TemporaryTask")
@@ -0,0 +1,276 @@
+import pytest
+
+from EasyForce.common.utils import to_epoch_minutes
+from EasyForce.data_management.db_connection import connection_stats, reset_connection_stats
+from EasyForce.data_management.data_structure.data_modification import BaseEntity
+from EasyForce.data_management.data_structure.entities_classes import Team, Soldier, TimeRange, RecurringTask
+from EasyForce.data_management.data_structure.relationships_classes import Presence, SoldierRole, TaskRole
+
+
+def test_entity_operations_reuse_one_pooled_connection(temp_db):
+    reset_connection_stats()
+    team = Team(TeamName="Alpha").add()
+    Soldier(SoldierID=1, FullName="Dana", TeamID=team.TeamID).add()
+    time_range = TimeRange(StartDateTime="2025-03-01 08:00:00", EndDateTime="2025-03-02 08:00:00").add()
+    Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=1, TimeID=time_range.TimeID, isActive=1).add()
+
+    assert Soldier.get_by_id({"SoldierID": 1}).FullName == "Dana"
+    # The fixture already opened this thread's connection while initializing the schema
+    assert connection_stats()["opened"] == 0
+    assert connection_stats()["reused"] > 0
+
+
+def test_add_many_fills_autoincrement_ids_and_reports_each_row(temp_db):
+    teams = Team.add_many([Team(TeamName="Alpha"), Team(TeamName="Bravo"), Team(TeamName="Alpha")])
+
+    # The duplicate name is rejected on its own; the other rows are still inserted
+    assert teams[2] is None
+    assert [t.TeamName for t in Team.get_all()] == ["Alpha", "Bravo"]
+    assert [t.TeamID for t in teams[:2]] == [t.TeamID for t in Team.get_all()]
+
+
+def test_update_many_and_delete_many_report_missing_rows(temp_db):
+    team = Team(TeamName="Alpha").add()
+    soldiers = Soldier.add_many([Soldier(SoldierID=i, FullName=f"S{i}", TeamID=team.TeamID) for i in (1, 2)])
+    missing = Soldier(SoldierID=99, FullName="Ghost", TeamID=team.TeamID)
+
+    for soldier in soldiers:
+        soldier.FullName += " (updated)"
+    assert Soldier.update_many(soldiers + [missing]) == soldiers + [None]
+    assert Soldier.get_by_id({"SoldierID": 2}).FullName == "S2 (updated)"
+
+    assert Soldier.delete_many([soldiers[0], missing]) == [soldiers[0], None]
+    assert [s.SoldierID for s in Soldier.get_all()] == [2]
+
+
+def test_transaction_commits_once_and_rolls_back_nested_scopes(temp_db):
+    with BaseEntity.transaction():
+        Team(TeamName="Alpha").add()
+        try:
+            with BaseEntity.transaction():
+                Team(TeamName="Bravo").add()
+                raise RuntimeError("abort the inner scope only")
+        except RuntimeError:
+            pass
+        Team(TeamName="Charlie").add()
+
+    assert [t.TeamName for t in Team.get_all()] == ["Alpha", "Charlie"]
+
+    try:
+        with BaseEntity.transaction():
+            Team(TeamName="Delta").add()
+            raise RuntimeError("abort everything")
+    except RuntimeError:
+        pass
+    assert Team.get_by_unique_name("Delta") is None
+
+
+def test_upsert_inserts_then_updates_in_place(temp_db):
+    task = RecurringTask(TaskName="Guard", ShiftDurationInMinutes=240, EveryDayStartTime="08:00",
+                         EveryDayEndTime="20:00", RequiredPersonnel=2).add()
+    rule = dict(TaskType="RecurringTask", TaskID=task.TaskID, SoldierOrRole="Role", SoldierOrRoleID=3)
+    TaskRole(**rule, MinRequiredCount=2, RoleEnforcementType=1).upsert()
+    TaskRole(**rule, MinRequiredCount=4, RoleEnforcementType=0).upsert()
+    stored = TaskRole.get_by_id(rule)
+    assert (stored.MinRequiredCount, stored.RoleEnforcementType) == (4, 0)
+
+    # All-key tables ignore the duplicate instead of failing
+    assert SoldierRole(SoldierID=1, RoleID=3).upsert() is not None
+    assert SoldierRole(SoldierID=1, RoleID=3).upsert() is not None
+    assert len(SoldierRole.get_all()) == 1
+
+
+def test_add_update_delete_detect_conflicts_and_missing_rows_without_prefetch(temp_db):
+    assert Soldier(SoldierID=7, FullName="Dana", TeamID=1).add() is not None
+    assert Soldier(SoldierID=7, FullName="Duplicate", TeamID=1).add() is None
+    assert Soldier(SoldierID=8, FullName="Ghost", TeamID=1).update() is None
+    assert Soldier(SoldierID=8, FullName="Ghost", TeamID=1).delete() is None
+    assert Soldier.get_by_id({"SoldierID": 7}).FullName == "Dana"
+
+
+def test_get_many_by_ids_fetches_single_and_composite_keys_in_chunks(temp_db):
+    team = Team(TeamName="Alpha").add()
+    Soldier.add_many([Soldier(SoldierID=i, FullName=f"S{i}", TeamID=team.TeamID) for i in range(1, 2001)])
+    SoldierRole.add_many([SoldierRole(SoldierID=i, RoleID=i % 3) for i in range(1, 2001)])
+
+    soldiers = Soldier.get_many_by_ids([{"SoldierID": i} for i in range(1, 2500)])
+    assert len(soldiers) == 2000
+    assert soldiers[(1234,)].FullName == "S1234"
+
+    wanted = [{"SoldierID": i, "RoleID": i % 3} for i in range(1, 1500)] + [{"SoldierID": 5, "RoleID": 99}]
+    soldier_roles = SoldierRole.get_many_by_ids(wanted)
+    assert len(soldier_roles) == 1499
+    assert (5, 99) not in soldier_roles
+
+
+def test_iterators_stream_rows_in_batches(temp_db):
+    TimeRange.add_many([TimeRange(StartDateTime=f"2025-03-01 {h:02}:00:00", EndDateTime=f"2025-03-01 {h:02}:30:00")
+                        for h in range(24)])
+    iterator = TimeRange.iter_all(batch_size=5)
+    assert next(iterator).TimeID == 1
+    assert len(list(iterator)) == 23
+
+    Soldier(SoldierID=1, FullName="Dana", TeamID=1).add()
+    Presence.add_many([Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=1, TimeID=i, isActive=i % 2)
+                       for i in range(1, 25)])
+    active = list(Presence.iter_by_columns({"SoldierTeamTaskID": 1, "isActive": 1}, batch_size=4))
+    assert [p.TimeID for p in active] == list(range(1, 25, 2))
+    assert list(Presence.iter_by_columns({"NoSuchColumn": 1})) == []
+    assert len(list(Presence.iter_by_columns({}, batch_size=4))) == 24
+
+
+def test_entities_are_slot_based_and_built_per_column_layout():
+    soldier = Soldier(SoldierID=1, FullName="Dana")
+    assert not hasattr(soldier, "__dict__")
+    assert soldier.TeamID is None
+    with pytest.raises(TypeError):
+        Soldier(Nickname="D")
+
+    full = Soldier._row_constructor(Soldier.get_columns())((2, "Noa", 3))
+    projected = Soldier._row_constructor(("FullName", "SoldierID"))(("Noa", 2))
+    assert (full.SoldierID, full.FullName, full.TeamID) == (2, "Noa", 3)
+    assert (projected.SoldierID, projected.FullName, projected.TeamID) == (2, "Noa", None)
+    # The code is generated once per layout; each call gets its own shared values
+    assert Soldier._row_constructor(Soldier.get_columns()).__code__ is Soldier._row_constructor(Soldier.get_columns()).__code__
+
+
+def test_rows_of_one_query_share_their_repeated_values():
+    build = Presence._row_constructor(Presence.get_columns())
+    rows = [("".join(["Sol", "dier"]), 1000 + i % 2, 5000 + i, 1) for i in range(4)]
+    first, second, third, _ = [build(row) for row in rows]
+    assert first.SoldierTeamTaskType is second.SoldierTeamTaskType
+    assert first.SoldierTeamTaskID is third.SoldierTeamTaskID and first.SoldierTeamTaskID == 1000
+    # Only the repeated columns are shared, and only within one constructor
+    assert rows[0][2] is first.TimeID
+    other = Presence._row_constructor(Presence.get_columns())(rows[1])
+    assert other.SoldierTeamTaskType is rows[1][0]
+
+
+def test_identity_map_serves_repeated_lookups_and_is_invalidated_by_writes(temp_db):
+    team = Team(TeamName="Alpha").add()
+    Soldier.add_many([Soldier(SoldierID=i, FullName=f"S{i}", TeamID=team.TeamID) for i in range(1, 4)])
+    assert Soldier.get_by_id({"SoldierID": 1}) is not Soldier.get_by_id({"SoldierID": 1})
+
+    with BaseEntity.cached(maxsize=2) as cache:
+        first = Soldier.get_by_id({"SoldierID": 1})
+        assert Soldier.get_by_id({"SoldierID": 1}) is first
+        assert Soldier.get_many_by_ids([{"SoldierID": 1}, {"SoldierID": 2}])[(1,)] is first
+        assert (cache.hits, cache.misses) == (2, 2)
+
+        first.FullName = "Dana"
+        first.update()
+        assert Soldier.get_by_id({"SoldierID": 1}) is not first
+        assert Soldier.get_by_id({"SoldierID": 1}).FullName == "Dana"
+
+        Soldier.get_by_id({"SoldierID": 3})
+        assert len(cache) == 2
+
+        with pytest.raises(RuntimeError):
+            with BaseEntity.transaction():
+                Soldier(SoldierID=4, FullName="Rolled back", TeamID=team.TeamID).add()
+                Soldier.get_by_id({"SoldierID": 4})
+                raise RuntimeError
+        assert len(cache) == 0
+        assert Soldier.get_by_id({"SoldierID": 4}) is None
+
+    assert cache.stats()["maxsize"] == 2
+
+
+def test_update_writes_only_changed_columns(temp_db):
+    RecurringTask(TaskID=1, TaskName="Guard", ShiftDurationInMinutes=60, EveryDayStartTime="08:00",
+                  EveryDayEndTime="20:00", RequiredPersonnel=2).add()
+    TaskRole.add_many([TaskRole(TaskType="RecurringTask", TaskID=1, SoldierOrRole="Soldier", SoldierOrRoleID=i,
+                                MinRequiredCount=1, RoleEnforcementType=1) for i in (1, 2)])
+    statements = []
+    BaseEntity._get_connection().set_trace_callback(statements.append)
+
+    stored = TaskRole.query().order_by("SoldierOrRoleID").all()
+    assert stored[0].changed_columns() == ()
+    stored[0].RoleEnforcementType = 0
+    stored[1].RoleEnforcementType = 1  # same value: not a change
+    assert stored[0].changed_columns() == ("RoleEnforcementType",) and stored[1].changed_columns() == ()
+
+    statements.clear()
+    assert TaskRole.update_many(stored) == stored
+    assert stored[1].update() is stored[1]
+    # The trace callback also reports the statement once per trigger it fires
+    updates = {sql for sql in statements if sql.startswith("UPDATE")}
+    assert len(updates) == 1 and "SET RoleEnforcementType = 0 WHERE" in updates.pop()
+    assert stored[0].changed_columns() == ()
+    assert [tr.RoleEnforcementType for tr in TaskRole.query().order_by("SoldierOrRoleID").all()] == [0, 1]
+    BaseEntity._get_connection().set_trace_callback(None)
+
+
+def test_time_range_epoch_minutes_are_filled_on_every_write(temp_db):
+    single = TimeRange(StartDateTime="2025-03-01 08:00:00", EndDateTime="2025-03-01 09:00:00").add()
+    assert (single.StartMinute, single.EndMinute) == (to_epoch_minutes("2025-03-01 08:00:00"),
+                                                      to_epoch_minutes("2025-03-01 09:00:00"))
+
+    batch = TimeRange.add_many([TimeRange(StartDateTime="2025-03-02 08:00", EndDateTime="2025-03-02T10:00:30.250000")])
+    assert batch[0].EndMinute - batch[0].StartMinute == 120
+
+    single.EndDateTime = "2025-03-01 12:00:00"
+    single.update()
+    assert single.EndMinute - single.StartMinute == 240
+    assert single.changed_columns() == ()
+
+
+def test_presence_merges_ranges_written_with_different_precision(temp_db):
+    team = Team(TeamName="Alpha").add()
+    Soldier(SoldierID=1, FullName="Dana", TeamID=team.TeamID).add()
+    # As text '2025-03-01 12:00' < '2025-03-01 12:00:00', so the touching ranges would not blend
+    first = TimeRange(StartDateTime="2025-03-01 08:00", EndDateTime="2025-03-01 12:00").add()
+    second = TimeRange(StartDateTime="2025-03-01 12:00:00", EndDateTime="2025-03-01 16:00:00.500000").add()
+    Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=1, TimeID=first.TimeID, isActive=1).add()
+    Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=1, TimeID=second.TimeID, isActive=1).add()
+
+    presences = Presence.get_all()
+    assert len(presences) == 1
+    merged = TimeRange.get_by_id({"TimeID": presences[0].TimeID})
+    assert (merged.StartDateTime, merged.EndDateTime) == ("2025-03-01 08:00", "2025-03-01 16:00:00.500000")
+
+
+def test_presence_merge_only_touches_blending_ranges(temp_db):
+    team = Team(TeamName="Alpha").add()
+    Soldier(SoldierID=1, FullName="Dana", TeamID=team.TeamID).add()
+    for start, end in (("2025-03-01 08:00:00", "2025-03-02 08:00:00"), ("2025-03-10 08:00:00", "2025-03-11 08:00:00")):
+        time_range = TimeRange(StartDateTime=start, EndDateTime=end).add()
+        Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=1, TimeID=time_range.TimeID, isActive=1).add()
+
+    extension = TimeRange(StartDateTime="2025-03-02 00:00:00", EndDateTime="2025-03-03 08:00:00").add()
+    assert Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=1, TimeID=extension.TimeID, isActive=1).add()
+
+    ranges = sorted((TimeRange.get_by_id({"TimeID": p.TimeID}).StartDateTime, TimeRange.get_by_id({"TimeID": p.TimeID}).EndDateTime)
+                    for p in Presence.get_all())
+    assert ranges == [("2025-03-01 08:00:00", "2025-03-03 08:00:00"), ("2025-03-10 08:00:00", "2025-03-11 08:00:00")]
+
+def test_presence_absence_splits_the_period_without_dumping_tables(temp_db, capsys):
+    team = Team(TeamName="Alpha").add()
+    Soldier(SoldierID=1, FullName="Dana", TeamID=team.TeamID).add()
+    stay = TimeRange(StartDateTime="2025-03-01 08:00", EndDateTime="2025-03-10 08:00").add()
+    leave = TimeRange(StartDateTime="2025-03-04 08:00", EndDateTime="2025-03-05 08:00").add()
+    Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=1, TimeID=stay.TimeID, isActive=1).add()
+    absence = Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=1, TimeID=leave.TimeID, isActive=0).add()
+
+    assert absence.TimeID == leave.TimeID
+    periods = sorted((TimeRange.get_by_id({"TimeID": p.TimeID}).StartDateTime,
+                      TimeRange.get_by_id({"TimeID": p.TimeID}).EndDateTime, p.isActive) for p in Presence.get_all())
+    assert periods == [("2025-03-01 08:00", "2025-03-04 08:00", 1),
+                       ("2025-03-04 08:00", "2025-03-05 08:00", 0),
+                       ("2025-03-05 08:00", "2025-03-10 08:00", 1)]
+    assert capsys.readouterr().out == ""
+
+
+def test_garbage_collector_deletes_unused_and_too_short_ranges(temp_db):
+    team = Team(TeamName="Alpha").add()
+    Soldier(SoldierID=1, FullName="Dana", TeamID=team.TeamID).add()
+    used = TimeRange(StartDateTime="2025-03-01 08:00", EndDateTime="2025-03-01 10:00").add()
+    Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=1, TimeID=used.TimeID, isActive=1).add()
+    TimeRange.add_many([TimeRange(StartDateTime="2025-03-02 08:00", EndDateTime=f"2025-03-02 09:{i:02}") for i in range(25)])
+    TimeRange(StartDateTime="2025-03-03 08:00:00", EndDateTime="2025-03-03 08:01:30").add()
+
+    # Bounded incremental run: two batches of ten
+    assert TimeRange.garbage_collector(batch_size=10, max_batches=2) == 20
+    assert TimeRange.garbage_collector(batch_size=10) == 6
+    assert TimeRange.garbage_collector() == 0
+    assert [tr.TimeID for tr in TimeRange.get_all()] == [used.TimeID]
@@ -0,0 +1,69 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from EasyForce.data_processing.eligibility import EligibilityMatrix
+from EasyForce.data_processing.interval_set import Interval
+from EasyForce.data_processing.schedule_logic import TaskRules
+from EasyForce.data_processing.shift_slots import ShiftSlot, presence_timeline
+
+HORIZON = (0, 10 * 24 * 60)
+
+
+def _random_schedule(seed):
+    """Returns (data, slots) shaped like ScheduleData / iter_slots(), with random presence, roles and rules."""
+    generator = random.Random(seed)
+    soldiers = list(range(1, 41))
+    availability, busy, soldier_roles = {}, {}, {}
+    for soldier_id in soldiers:
+        periods = []
+        for _ in range(generator.randrange(4)):
+            start = generator.randrange(*HORIZON)
+            periods.append(Interval(start, start + generator.randrange(60, 3 * 24 * 60), generator.random() < 0.5))
+        availability[soldier_id] = presence_timeline(periods, *HORIZON)
+        if generator.random() < 0.2:
+            busy[soldier_id] = [(HORIZON[0] - 60, HORIZON[0] + generator.randrange(600))]
+        soldier_roles[soldier_id] = set(generator.sample(range(1, 5), generator.randrange(3)))
+    rules = {("RecurringTask", task_id): TaskRules(frozenset(), frozenset(generator.sample(soldiers, 3)),
+                                                   frozenset({task_id % 4 + 1}), {}) for task_id in (1, 2)}
+    slots = []
+    for _ in range(300):
+        start = generator.randrange(*HORIZON)
+        slots.append(ShiftSlot("RecurringTask", generator.randrange(1, 5), start,
+                               start + generator.randrange(30, 12 * 60), 1))
+    data = SimpleNamespace(soldiers=dict.fromkeys(soldiers), availability=availability, busy=busy,
+                           soldier_roles=soldier_roles, rules=rules)
+    return data, slots
+
+
+def _eligible(data, soldier_id, slot):
+    """The rule, one pair at a time."""
+    rules = data.rules.get((slot.task_type, slot.task_id))
+    if rules and (soldier_id in rules.banned_soldiers or rules.banned_roles & data.soldier_roles[soldier_id]):
+        return False
+    if any(start < slot.end and end > slot.start for start, end in data.busy.get(soldier_id, ())):
+        return False
+    return data.availability[soldier_id].covering(slot.start, slot.end) == 1
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_bitset_matrix_matches_pairwise_rules(seed):
+    data, slots = _random_schedule(seed)
+    matrix = EligibilityMatrix.build(data, slots, use_numpy=False)
+
+    assert matrix.backend == "bitset"
+    for j, slot in enumerate(slots):
+        assert matrix.candidates(j) == [soldier_id for soldier_id in sorted(data.soldiers)
+                                        if _eligible(data, soldier_id, slot)]
+    assert matrix.count() == sum(_eligible(data, soldier_id, slot) for soldier_id in data.soldiers for slot in slots)
+
+
+def test_numpy_matrix_matches_the_bitset_one():
+    pytest.importorskip("numpy")
+    data, slots = _random_schedule(4)
+    bitset = EligibilityMatrix.build(data, slots, use_numpy=False)
+    array = EligibilityMatrix.build(data, slots, use_numpy=True)
+
+    assert array.backend == "numpy"
+    assert [array.candidates(j) for j in range(len(slots))] == [bitset.candidates(j) for j in range(len(slots))]
@@ -0,0 +1,26 @@
+import pytest
+
+from EasyForce.data_management.db_connection import get_connection
+
+# (lookup as issued by the entity classes / query builder, index it must use)
+ACCESS_PATHS = (
+    ("SELECT * FROM TimeRange WHERE StartDateTime = ? AND EndDateTime = ?", "idx_TimeRange_Start_End"),
+    ("SELECT * FROM TimeRange WHERE StartDateTime <= ? AND EndDateTime >= ?", "idx_TimeRange_Start_End"),
+    ("SELECT * FROM TimeRange WHERE StartMinute <= ? AND EndMinute >= ?", "idx_TimeRange_Minutes"),
+    ("SELECT * FROM Soldier WHERE TeamID = ?", "idx_Soldier_TeamID"),
+    ("SELECT * FROM SoldierRole WHERE RoleID = ?", "idx_SoldierRole_RoleID"),
+    ("SELECT * FROM TaskRole WHERE SoldierOrRole = ? AND SoldierOrRoleID = ?", "idx_TaskRole_SoldierOrRole"),
+    ("SELECT * FROM CurrentTaskAssignment WHERE SoldierOrTeamType = ? AND SoldierOrTeamID = ?",
+     "idx_CurrentTaskAssignment_SoldierOrTeam"),
+    ("SELECT * FROM CurrentTaskAssignment WHERE TimeID = ?", "idx_CurrentTaskAssignment_TimeID"),
+    ("SELECT * FROM TaskHistory WHERE SoldierOrTeamType = ? AND SoldierOrTeamID = ?", "idx_TaskHistory_SoldierOrTeam"),
+    ("SELECT * FROM TaskHistory WHERE TimeID = ?", "idx_TaskHistory_TimeID"),
+    ("SELECT * FROM Presence WHERE TimeID = ?", "idx_Presence_TimeID"),
+)
+
+
+@pytest.mark.parametrize("query, index", ACCESS_PATHS)
+def test_hot_lookups_use_their_index(temp_db, query, index):
+    plan = get_connection().execute(f"EXPLAIN QUERY PLAN {query}", [None] * query.count("?")).fetchall()
+    details = " ".join(row[3] for row in plan)
+    assert f"INDEX {index}" in details, details
@@ -0,0 +1,87 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from EasyForce.common.utils import to_epoch_minutes
+from EasyForce.data_management.db_connection import get_connection
+from EasyForce.data_management.data_structure.entities_classes import Team, Soldier, TimeRange
+from EasyForce.data_management.data_structure.relationships_classes import Presence
+
+
+def _rtree_rows():
+    return get_connection().execute(
+        "SELECT TimeID, StartMinute, EndMinute FROM TimeRangeRTree ORDER BY TimeID").fetchall()
+
+
+def test_rtree_follows_inserts_updates_and_deletes(temp_db):
+    kept = TimeRange(StartDateTime="2025-03-01 08:00", EndDateTime="2025-03-01 10:00").add()
+    moved = TimeRange(StartDateTime="2025-03-02 08:00", EndDateTime="2025-03-02 10:00").add()
+    dropped = TimeRange.add_many([TimeRange(StartDateTime="2025-03-03 08:00", EndDateTime="2025-03-03 10:00")])[0]
+
+    moved.EndDateTime = "2025-03-02 20:00"
+    moved.update()
+    dropped.delete()
+
+    assert _rtree_rows() == [(kept.TimeID, kept.StartMinute, kept.EndMinute),
+                             (moved.TimeID, moved.StartMinute, moved.EndMinute)]
+
+
+def test_overlapping_matches_a_full_scan(temp_db):
+    generator = random.Random(7)
+    base = datetime(2025, 1, 1)
+    ranges = []
+    for _ in range(300):
+        start = base + timedelta(minutes=generator.randrange(60 * 24 * 30))
+        ranges.append(TimeRange(StartDateTime=str(start),
+                                EndDateTime=str(start + timedelta(minutes=generator.randrange(1, 60 * 24 * 3)))))
+    TimeRange.add_many(ranges)
+
+    for _ in range(20):
+        start = base + timedelta(minutes=generator.randrange(60 * 24 * 30))
+        end = start + timedelta(minutes=generator.randrange(60 * 24))
+        expected = {r.TimeID for r in ranges
+                    if r.StartMinute <= to_epoch_minutes(end) and r.EndMinute >= to_epoch_minutes(start)}
+        assert {r.TimeID for r in TimeRange.overlapping(start, end)} == expected
+
+
+def test_present_at_lists_soldiers_on_base(temp_db):
+    team = Team(TeamName="Alpha").add()
+    for soldier_id, (start, end, active) in enumerate((("2025-03-01 08:00", "2025-03-05 08:00", 1),
+                                                        ("2025-03-02 08:00", "2025-03-03 08:00", 1),
+                                                        ("2025-03-01 08:00", "2025-03-05 08:00", 0)), start=1):
+        Soldier(SoldierID=soldier_id, FullName=f"Soldier {soldier_id}", TeamID=team.TeamID).add()
+        time_range = TimeRange(StartDateTime=start, EndDateTime=end).add()
+        Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=soldier_id,
+                 TimeID=time_range.TimeID, isActive=active).add()
+
+    assert Presence.present_at("2025-03-02 12:00") == [1, 2]
+    assert Presence.present_at(datetime(2025, 3, 4, 12)) == [1]
+    assert Presence.present_at("2025-03-06 12:00") == []
+    assert len(Presence.overlapping("2025-03-04 00:00", "2025-03-10 00:00")) == 2
+
+
+def test_overlapping_needs_a_time_column(temp_db):
+    with pytest.raises(ValueError):
+        Team.overlapping("2025-03-01 08:00", "2025-03-01 10:00")
+
+
+def test_overlap_lookup_uses_the_rtree(temp_db):
+    query, params = Presence.query().overlapping("2025-03-01 08:00", "2025-03-01 10:00").sql()
+    plan = get_connection().execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+    details = " ".join(row[3] for row in plan)
+    assert "TimeRangeRTree VIRTUAL TABLE" in details, details
+    assert "INDEX idx_Presence_TimeID" in details, details
+
+
+def test_bulk_load_rebuilds_the_rtree(temp_db):
+    existing = TimeRange(StartDateTime="2025-03-01 08:00", EndDateTime="2025-03-01 10:00").add()
+    with TimeRange.bulk_load():
+        loaded = TimeRange.add_many([TimeRange(StartDateTime=f"2025-03-0{day} 08:00", EndDateTime=f"2025-03-0{day} 10:00")
+                                     for day in range(2, 6)])
+        existing.delete()
+
+    assert _rtree_rows() == [(r.TimeID, r.StartMinute, r.EndMinute) for r in loaded]
+    # The sync triggers are back after the load
+    TimeRange(StartDateTime="2025-03-09 08:00", EndDateTime="2025-03-09 10:00").add()
+    assert len(_rtree_rows()) == 5
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from EasyForce.data_processing.interval_set import Interval, IntervalSet, diff
+
+
+def test_construction_sorts_and_merges_blending_intervals():
+    timeline = IntervalSet([Interval(200, 300, 0), Interval(60, 120, 1), Interval(0, 60, 1), Interval(5, 5, 1)])
+    assert list(timeline) == [Interval(0, 120, 1), Interval(200, 300, 0)]
+
+
+def test_construction_lets_the_later_start_win_an_overlap():
+    timeline = IntervalSet([Interval(0, 100, 1), Interval(40, 60, 0)])
+    assert list(timeline) == [Interval(0, 40, 1), Interval(40, 60, 0), Interval(60, 100, 1)]
+
+
+@pytest.mark.parametrize("start, end, value, expected", [
+    # [ ( ) ] => [ ]
+    (0, 400, 0, [Interval(0, 400, 0)]),
+    # ( [ ] ) => ( )[ ]( )
+    (20, 40, 0, [Interval(0, 20, 1), Interval(20, 40, 0), Interval(40, 100, 1), Interval(200, 300, 0)]),
+    # touching same-valued periods merge; another value is cut back
+    (100, 250, 1, [Interval(0, 250, 1), Interval(250, 300, 0)]),
+    (100, 150, 0, [Interval(0, 100, 1), Interval(100, 150, 0), Interval(200, 300, 0)]),
+    (150, 200, 0, [Interval(0, 100, 1), Interval(150, 300, 0)]),
+])
+def test_assign_merges_and_splits(start, end, value, expected):
+    timeline = IntervalSet([Interval(0, 100, 1), Interval(200, 300, 0)])
+    merged = timeline.assign(start, end, value)
+    assert list(timeline) == expected
+    assert merged in expected and merged.start <= start and merged.end >= end
+
+
+def test_assign_matches_a_minute_by_minute_model():
+    generator = random.Random(5)
+    timeline, model = IntervalSet(), {}
+    for _ in range(300):
+        start = generator.randrange(1000)
+        end = start + generator.randrange(1, 100)
+        value = generator.randrange(2)
+        timeline.assign(start, end, value)
+        for minute in range(start, end):
+            model[minute] = value
+    covered = {minute: interval.value for interval in timeline for minute in range(interval.start, interval.end)}
+    assert covered == model
+    intervals = list(timeline)
+    assert all(a.end <= b.start and (a.end < b.start or a.value != b.value) for a, b in zip(intervals, intervals[1:]))
+
+
+def test_lookups_and_diff():
+    timeline = IntervalSet([Interval(0, 100, 1), Interval(200, 300, 0)])
+    assert (timeline.value_at(50), timeline.value_at(150), timeline.value_at(300)) == (1, None, 0)
+    assert timeline.overlapping(100, 200) == [Interval(0, 100, 1), Interval(200, 300, 0)]
+
+    before = list(timeline)
+    timeline.assign(250, 350, 1)
+    assert diff(before, timeline) == ([Interval(200, 300, 0)], [Interval(200, 250, 0), Interval(250, 350, 1)])
+    with pytest.raises(ValueError):
+        timeline.assign(10, 10, 1)
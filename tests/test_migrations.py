@@ -0,0 +1,73 @@
+import sqlite3
+
+import pytest
+
+from EasyForce.data_management.db_connection import get_connection
+from EasyForce.data_management.init_db import init_database
+from EasyForce.data_management.init_db.init_database import initialize_database, get_schema_version, SCHEMA_VERSION
+from EasyForce.data_management.schema_catalog import get_table_schema
+
+
+def _undo_epoch_minute_migrations(conn):
+    """Returns the TimeRange table to its version 3 shape (migrations 4 and 5 undone)."""
+    for trigger in ("sync_TimeRangeRTree_insert", "sync_TimeRangeRTree_update", "sync_TimeRangeRTree_delete"):
+        conn.execute(f"DROP TRIGGER {trigger}")
+    conn.execute("DROP TABLE TimeRangeRTree")
+    conn.execute("DROP INDEX idx_TimeRange_Minutes")
+    conn.execute("ALTER TABLE TimeRange DROP COLUMN StartMinute")
+    conn.execute("ALTER TABLE TimeRange DROP COLUMN EndMinute")
+
+
+def test_up_to_date_startup_is_one_pragma_read(temp_db):
+    assert get_schema_version() == SCHEMA_VERSION
+    statements = []
+    get_connection().set_trace_callback(statements.append)
+    assert initialize_database()
+    get_connection().set_trace_callback(None)
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_only_pending_migrations_are_applied(temp_db):
+    conn = get_connection()
+    conn.execute("DROP INDEX idx_Soldier_TeamID")
+    # Migration 4 adds columns, which cannot be re-added: undo it as well
+    _undo_epoch_minute_migrations(conn)
+    conn.execute("PRAGMA user_version = 1")
+
+    assert initialize_database()
+    assert get_schema_version() == SCHEMA_VERSION
+    assert "idx_Soldier_TeamID" in [index.name for index in get_table_schema("Soldier").indexes]
+
+
+def test_epoch_minute_migration_fills_existing_rows(temp_db):
+    conn = get_connection()
+    _undo_epoch_minute_migrations(conn)
+    conn.execute("PRAGMA user_version = 3")
+    conn.execute("INSERT INTO TimeRange (StartDateTime, EndDateTime) VALUES ('2025-03-01 08:00:00', '2025-03-01T09:30:45.5')")
+
+    assert initialize_database()
+    schema = get_table_schema("TimeRange")
+    assert schema.generated_columns == ("StartMinute", "EndMinute")
+    assert "idx_TimeRange_Minutes" in [index.name for index in schema.indexes]
+    start_minute, end_minute = conn.execute("SELECT StartMinute, EndMinute FROM TimeRange").fetchone()
+    assert end_minute - start_minute == 90
+    # Migration 5 indexes the ranges that already exist
+    assert conn.execute("SELECT StartMinute, EndMinute FROM TimeRangeRTree").fetchall() == [(start_minute, end_minute)]
+
+
+def test_failing_migration_keeps_previous_version(temp_db, monkeypatch):
+    broken = ((SCHEMA_VERSION + 1, "Broken", ("CREATE INDEX idx_ok ON Team (TeamName)", "CREATE INDEX idx_bad ON NoSuchTable (x)")),)
+    monkeypatch.setattr(init_database, "MIGRATIONS", init_database.MIGRATIONS + broken)
+    monkeypatch.setattr(init_database, "SCHEMA_VERSION", SCHEMA_VERSION + 1)
+
+    assert not initialize_database()
+    assert get_schema_version() == SCHEMA_VERSION
+    assert "idx_ok" not in [index.name for index in get_table_schema("Team").indexes]
+
+
+def test_time_range_validity_compares_times_not_text(temp_db):
+    conn = get_connection()
+    # As text 'T' sorts after ' ', so the earlier end used to pass the check
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO TimeRange (StartDateTime, EndDateTime) VALUES ('2025-03-01 08:00', '2025-03-01T07:30:00')")
+    conn.execute("INSERT INTO TimeRange (StartDateTime, EndDateTime) VALUES ('2025-03-01T08:00:00', '2025-03-01 09:00')")
@@ -0,0 +1,34 @@
+import pytest
+
+from EasyForce.data_processing.min_cost_flow import MinCostFlow
+
+
+def test_maximum_flow_at_minimum_cost():
+    # 0 -> {1, 2} -> 3: both paths are needed for the maximum flow of 3, the cheap one is filled first
+    network = MinCostFlow(4)
+    cheap = network.add_edge(0, 1, capacity=2, cost=1)
+    network.add_edge(1, 3, capacity=2, cost=0)
+    expensive = network.add_edge(0, 2, capacity=5, cost=4)
+    network.add_edge(2, 3, capacity=1, cost=0)
+
+    assert network.solve(0, 3) == (3, 6)
+    assert (network.flow(cheap), network.flow(expensive)) == (2, 1)
+
+
+def test_cheaper_rerouting_is_found():
+    # Workers 1 and 2, jobs 3 and 4: worker 1 is cheapest on both, but only one job each
+    network = MinCostFlow(6)
+    for worker in (1, 2):
+        network.add_edge(0, worker, capacity=1, cost=0)
+    for job in (3, 4):
+        network.add_edge(job, 5, capacity=1, cost=0)
+    edges = {(1, 3): network.add_edge(1, 3, 1, 1), (1, 4): network.add_edge(1, 4, 1, 2),
+             (2, 3): network.add_edge(2, 3, 1, 5), (2, 4): network.add_edge(2, 4, 1, 9)}
+
+    assert network.solve(0, 5) == (2, 7)
+    assert {pair for pair, edge in edges.items() if network.flow(edge)} == {(1, 4), (2, 3)}
+
+
+def test_negative_costs_are_rejected():
+    with pytest.raises(ValueError):
+        MinCostFlow(2).add_edge(0, 1, capacity=1, cost=-1)
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from EasyForce.common.constants import MAX_SQL_VARIABLES
+
+from EasyForce.data_management.data_structure.entities_classes import Team, Soldier, TimeRange
+
+
+@pytest.fixture
+def soldiers(temp_db):
+    alpha = Team(TeamName="Alpha").add()
+    bravo = Team(TeamName="Bravo").add()
+    Soldier.add_many([Soldier(SoldierID=i, FullName=f"Soldier {i:02}", TeamID=alpha.TeamID if i % 2 else bravo.TeamID)
+                      for i in range(1, 11)])
+    return alpha, bravo
+
+
+def test_where_filters_order_and_page_inside_sqlite(soldiers):
+    alpha, _ = soldiers
+    query = Soldier.query().where("TeamID", "=", alpha.TeamID)
+
+    assert [s.SoldierID for s in query.order_by("SoldierID", descending=True).limit(2, offset=1).all()] == [7, 5]
+    assert [s.SoldierID for s in Soldier.query().where("SoldierID", "BETWEEN", (3, 5)).all()] == [3, 4, 5]
+    assert [s.SoldierID for s in Soldier.query().where("SoldierID", "IN", [2, 9, 42]).order_by("SoldierID").all()] == [2, 9]
+    assert Soldier.query().where("SoldierID", "IN", range(2000)).count() == 10
+    assert query.count() == 5 and query.exists()
+    assert not query.where("SoldierID", ">", 10).exists()
+    assert query.first().SoldierID in (1, 3, 5, 7, 9)
+    assert Soldier.query().where("FullName", "=", "nobody").first() is None
+
+
+def test_projection_builds_partial_instances(soldiers):
+    names = Soldier.query().columns("FullName").where("SoldierID", "<=", 2).order_by("SoldierID").all()
+    assert [(s.FullName, s.SoldierID) for s in names] == [("Soldier 01", None), ("Soldier 02", None)]
+    assert [s.SoldierID for s in Soldier.query().columns("SoldierID").order_by("SoldierID").iter(batch_size=3)] == list(range(1, 11))
+
+
+def test_invalid_columns_and_operators_are_rejected(temp_db):
+    with pytest.raises(ValueError):
+        Soldier.query().where("Nickname", "=", "D")
+    with pytest.raises(ValueError):
+        Soldier.query().where("SoldierID", "; DROP TABLE Soldier", 1)
+
+
+def test_long_in_lists_bind_values_like_short_ones(temp_db):
+    TimeRange.add_many([TimeRange(StartDateTime=f"2025-03-{day:02} 08:00:00", EndDateTime=f"2025-03-{day:02} 16:00:00")
+                        for day in range(1, 6)])
+    starts = [datetime(2025, 3, 1, 8) + timedelta(minutes=minute) for minute in range(0, 5 * 24 * 60, 5)]
+    assert len(starts) > MAX_SQL_VARIABLES
+    for values in (starts, starts[:24]):
+        assert TimeRange.query().where("StartDateTime", "IN", values).count() == (5 if values is starts else 1)
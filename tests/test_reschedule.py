@@ -0,0 +1,116 @@
+from datetime import datetime
+
+from EasyForce.data_management.data_structure.entities_classes import (
+    Team, Soldier, RecurringTask, TemporaryTask, TimeRange
+)
+from EasyForce.data_management.data_structure.relationships_classes import Presence, TaskRole, CurrentTaskAssignment
+from EasyForce.data_processing.reschedule import reschedule_soldier, reschedule_task
+from EasyForce.data_processing.schedule_logic import run_schedule
+
+START = datetime(2025, 3, 1)
+
+
+def _setup(soldiers=4):
+    team = Team(TeamName="Alpha").add()
+    for soldier_id in range(1, soldiers + 1):
+        Soldier(SoldierID=soldier_id, FullName=f"Soldier {soldier_id}", TeamID=team.TeamID).add()
+    RecurringTask(TaskID=1, TaskName="Gate", ShiftDurationInMinutes=240,
+                  EveryDayStartTime="00:00", EveryDayEndTime="00:00", RequiredPersonnel=1).add()
+    run_schedule(START, days=2)
+
+
+def _assignments():
+    """Returns {(shift start, soldier id)} of the stored assignments."""
+    rows = CurrentTaskAssignment.get_all()
+    ranges = TimeRange.get_many_by_ids([{"TimeID": row.TimeID} for row in rows])
+    return {(ranges[(row.TimeID,)].StartDateTime, row.SoldierOrTeamID) for row in rows}
+
+
+def test_absence_repairs_only_the_soldiers_shifts(temp_db):
+    _setup()
+    before = _assignments()
+    absence = TimeRange(StartDateTime="2025-03-01 06:00", EndDateTime="2025-03-01 20:00").add()
+    Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=2, TimeID=absence.TimeID, isActive=0).add()
+
+    report = reschedule_soldier(2, "2025-03-01 06:00", "2025-03-01 20:00", now=START)
+
+    after = _assignments()
+    # The four-hour shifts overlapping 06:00-20:00
+    overlapping = {f"2025-03-01 {hour}:00:00" for hour in ("04", "08", "12", "16")}
+    lost = {(start, soldier_id) for start, soldier_id in before if soldier_id == 2 and start in overlapping}
+    assert report.removed == report.added == len(before - after) == len(lost)
+    assert before - after == lost
+    assert all(soldier_id != 2 for start, soldier_id in after - before)
+    assert len(after) == len(before)
+
+
+def test_absence_leaves_the_shifts_that_have_started(temp_db):
+    _setup()
+    before = _assignments()
+    absence = TimeRange(StartDateTime="2025-03-01 06:00", EndDateTime="2025-03-01 20:00").add()
+    Presence(SoldierTeamTaskType="Soldier", SoldierTeamTaskID=2, TimeID=absence.TimeID, isActive=0).add()
+
+    reschedule_soldier(2, "2025-03-01 06:00", "2025-03-01 20:00", now=datetime(2025, 3, 1, 10))
+
+    after = _assignments()
+    started = {f"2025-03-01 {hour}:00:00" for hour in ("04", "08")}
+    assert {entry for entry in before if entry[0] in started} <= after
+    later = {f"2025-03-01 {hour}:00:00" for hour in ("12", "16")}
+    assert not [start for start, soldier_id in after if soldier_id == 2 and start in later]
+
+
+def test_task_rule_change_replaces_the_excluded_soldier(temp_db):
+    _setup()
+    before = _assignments()
+    TaskRole(TaskType="RecurringTask", TaskID=1, SoldierOrRole="Soldier", SoldierOrRoleID=3,
+             MinRequiredCount=0, RoleEnforcementType=0).add()
+
+    report = reschedule_task("RecurringTask", 1, START, datetime(2025, 3, 3))
+
+    after = _assignments()
+    assert report.slots == len(before) and report.removed == report.added == sum(1 for _, s in before if s == 3)
+    assert {entry for entry in before if entry[1] != 3} <= after
+    assert all(soldier_id != 3 for _, soldier_id in after)
+
+
+def test_nothing_to_repair(temp_db):
+    _setup()
+    before = _assignments()
+
+    report = reschedule_soldier(1, "2025-04-01 00:00", "2025-04-02 00:00", now=START)
+
+    assert (report.slots, report.removed, report.added) == (0, 0, 0)
+    assert _assignments() == before
+
+
+def test_task_repair_fills_shifts_that_had_nobody(temp_db):
+    _setup(soldiers=1)
+    # The only soldier is banned, so no shift of the task is staffed
+    rule = TaskRole(TaskType="RecurringTask", TaskID=1, SoldierOrRole="Soldier", SoldierOrRoleID=1,
+                    MinRequiredCount=0, RoleEnforcementType=0).add()
+    run_schedule(START, days=2)
+    assert _assignments() == set()
+
+    rule.delete()
+    report = reschedule_task("RecurringTask", 1, START, datetime(2025, 3, 2))
+
+    after = _assignments()
+    assert report.slots == report.added == len(after) == 6
+    assert {start for start, _ in after} == {f"2025-03-01 {hour:02}:00:00" for hour in range(0, 24, 4)}
+
+
+def test_task_repair_in_the_middle_of_a_shift_keeps_it(temp_db):
+    team = Team(TeamName="Alpha").add()
+    for soldier_id in (1, 2):
+        Soldier(SoldierID=soldier_id, FullName=f"Soldier {soldier_id}", TeamID=team.TeamID).add()
+    TemporaryTask(TaskID=1, TaskName="Convoy", TaskReputation="None").add()
+    period = TimeRange(StartDateTime="2025-03-01 00:00", EndDateTime="2025-03-03 00:00").add()
+    Presence(SoldierTeamTaskType="TemporaryTask", SoldierTeamTaskID=1, TimeID=period.TimeID, isActive=1).add()
+    run_schedule(START, days=2)
+    before = _assignments()
+
+    report = reschedule_task("TemporaryTask", 1, datetime(2025, 3, 1, 10), datetime(2025, 3, 3))
+
+    assert len(before) == 1
+    assert (report.slots, report.added) == (0, 0)
+    assert _assignments() == before
@@ -0,0 +1,106 @@
+from datetime import datetime
+
+import pytest
+
+from EasyForce.data_management.data_structure.entities_classes import (
+    Team, Soldier, Role, RecurringTask, TemporaryTask, TimeRange
+)
+from EasyForce.data_management.data_structure.relationships_classes import (
+    Presence, SoldierRole, TaskRole, CurrentTaskAssignment
+)
+from EasyForce.data_processing.schedule_logic import run_schedule, schedule_shifts
+
+START = datetime(2025, 3, 1)
+
+
+def _add_soldiers(count):
+    team = Team(TeamName="Alpha").add()
+    return [Soldier(SoldierID=i, FullName=f"Soldier {i}", TeamID=team.TeamID).add() for i in range(1, count + 1)]
+
+
+def _add_presence(entity_type, entity_id, start, end, active=1):
+    time_range = TimeRange(StartDateTime=start, EndDateTime=end).add()
+    Presence(SoldierTeamTaskType=entity_type, SoldierTeamTaskID=entity_id, TimeID=time_range.TimeID, isActive=active).add()
+
+
+def _assignments():
+    """Returns sorted (task id, soldier id, start, end) tuples of the stored assignments."""
+    rows = CurrentTaskAssignment.get_all()
+    ranges = TimeRange.get_many_by_ids([{"TimeID": row.TimeID} for row in rows])
+    return sorted((row.TaskID, row.SoldierOrTeamID, ranges[(row.TimeID,)].StartDateTime, ranges[(row.TimeID,)].EndDateTime)
+                  for row in rows)
+
+
+def test_schedule_respects_presence_rules_and_overlaps(temp_db):
+    _add_soldiers(4)
+    officer = Role(RoleName="Officer").add()
+    SoldierRole(SoldierID=4, RoleID=officer.RoleID).add()
+    RecurringTask(TaskID=1, TaskName="Gate", ShiftDurationInMinutes=240,
+                  EveryDayStartTime="08:00", EveryDayEndTime="16:00", RequiredPersonnel=2).add()
+    TaskRole(TaskType="RecurringTask", TaskID=1, SoldierOrRole="Role", SoldierOrRoleID=officer.RoleID,
+             MinRequiredCount=1, RoleEnforcementType=1).add()
+    TaskRole(TaskType="RecurringTask", TaskID=1, SoldierOrRole="Soldier", SoldierOrRoleID=1,
+             MinRequiredCount=0, RoleEnforcementType=0).add()
+    # Soldier 2 is away on the first morning
+    _add_presence("Soldier", 2, "2025-03-01 00:00", "2025-03-01 12:00", active=0)
+
+    report, _, schedule = run_schedule(START, days=1)
+
+    assert report.slots == 2 and report.required == 4
+    assert [sorted(soldier_ids) for _, soldier_ids in schedule] == [[3, 4], [2, 4]]
+    assert report.assigned == 4 and report.unfilled_slots == 0
+    assert _assignments() == [(1, 2, "2025-03-01 12:00:00", "2025-03-01 16:00:00"),
+                              (1, 3, "2025-03-01 08:00:00", "2025-03-01 12:00:00"),
+                              (1, 4, "2025-03-01 08:00:00", "2025-03-01 12:00:00"),
+                              (1, 4, "2025-03-01 12:00:00", "2025-03-01 16:00:00")]
+
+
+def test_temporary_task_uses_its_presence_and_must_soldiers(temp_db):
+    _add_soldiers(3)
+    TemporaryTask(TaskID=7, TaskName="Convoy", TaskReputation="Good").add()
+    _add_presence("TemporaryTask", 7, "2025-03-01 10:00", "2025-03-01 14:00")
+    TaskRole(TaskType="TemporaryTask", TaskID=7, SoldierOrRole="Soldier", SoldierOrRoleID=3,
+             MinRequiredCount=0, RoleEnforcementType=1).add()
+    # Soldier 1 is only on base in the evening
+    _add_presence("Soldier", 1, "2025-03-01 18:00", "2025-03-02 00:00")
+
+    report, _, schedule = run_schedule(START, days=1)
+
+    assert report.slots == 1
+    assert schedule[0][1] == [3]
+
+
+def test_rescheduling_replaces_the_horizon(temp_db):
+    _add_soldiers(3)
+    RecurringTask(TaskID=1, TaskName="Gate", ShiftDurationInMinutes=480,
+                  EveryDayStartTime="08:00", EveryDayEndTime="08:00", RequiredPersonnel=1).add()
+
+    first = schedule_shifts(START, days=2)
+    stored = _assignments()
+    second = schedule_shifts(START, days=2)
+
+    assert first.assigned == second.assigned == 6
+    assert _assignments() == stored
+    # Every soldier gets an equal share of the all-day task
+    assert sorted(soldier_id for _, soldier_id, _, _ in stored) == [1, 1, 2, 2, 3, 3]
+
+
+@pytest.mark.parametrize("command_start, command_end", [("08:00", "16:00"), ("10:00", "18:00")])
+def test_flow_solver_resolves_competing_role_minimums(temp_db, command_start, command_end):
+    _add_soldiers(2)
+    officer = Role(RoleName="Officer").add()
+    SoldierRole(SoldierID=1, RoleID=officer.RoleID).add()
+    # Two overlapping shifts; only the second needs the one officer
+    RecurringTask(TaskID=1, TaskName="Gate", ShiftDurationInMinutes=480,
+                  EveryDayStartTime="08:00", EveryDayEndTime="16:00", RequiredPersonnel=1).add()
+    RecurringTask(TaskID=2, TaskName="Command", ShiftDurationInMinutes=480,
+                  EveryDayStartTime=command_start, EveryDayEndTime=command_end, RequiredPersonnel=1).add()
+    TaskRole(TaskType="RecurringTask", TaskID=2, SoldierOrRole="Role", SoldierOrRoleID=officer.RoleID,
+             MinRequiredCount=1, RoleEnforcementType=1).add()
+
+    greedy, _, _ = run_schedule(START, days=1, solver="greedy")
+    flow, _, schedule = run_schedule(START, days=1, solver="flow")
+
+    assert greedy.role_shortfall == 1
+    assert flow.role_shortfall == 0 and flow.assigned == 2
+    assert [(slot.task_id, soldier_ids) for slot, soldier_ids in schedule] == [(1, [2]), (2, [1])]
@@ -0,0 +1,40 @@
+from EasyForce.data_management.db_connection import get_connection
+from EasyForce.data_management.schema_catalog import get_catalog, get_table_schema
+from EasyForce.data_management.read_db import (
+    get_primary_key_column_names, get_unique_column_name, get_primary_key_val_by_unique_column_val
+)
+from EasyForce.data_management.data_structure.entities_classes import Team, Soldier, TimeRange, Role, TemporaryTask, RecurringTask
+from EasyForce.data_management.data_structure.relationships_classes import (
+    Presence, SoldierRole, TaskRole, CurrentTaskAssignment, TaskHistory
+)
+
+ENTITIES = (TimeRange, Team, Soldier, Role, TemporaryTask, RecurringTask,
+            Presence, SoldierRole, TaskRole, CurrentTaskAssignment, TaskHistory)
+
+
+def test_catalog_matches_entity_declarations(temp_db):
+    for entity in ENTITIES:
+        schema = entity.get_schema()
+        assert schema.primary_key == tuple(entity.get_primary_key_columns_names())
+        assert schema.columns == tuple(entity.get_columns())
+        assert get_primary_key_column_names(entity.get_table_name()) == schema.primary_key
+
+    assert get_unique_column_name("Team") == "TeamName"
+    assert get_unique_column_name("TaskRole") is None
+    assert get_primary_key_column_names("NoSuchTable") is None
+    assert get_table_schema("Soldier").column_types["FullName"] == "TEXT"
+
+
+def test_catalog_is_read_once_and_reloaded_after_schema_change(temp_db):
+    Team(TeamName="Alpha").add()
+    get_catalog()
+    statements = []
+    get_connection().set_trace_callback(statements.append)
+    assert get_primary_key_val_by_unique_column_val("Team", "Alpha") == 1
+    assert Team.get_by_unique_name("Alpha").TeamID == 1
+    # Only the cheap version check runs; table_info / index_list / index_info come from the cache
+    assert {sql for sql in statements if sql.startswith("PRAGMA")} == {"PRAGMA schema_version"}
+
+    get_connection().execute("CREATE INDEX idx_test_soldier_name ON Soldier (FullName)")
+    assert "idx_test_soldier_name" in [index.name for index in get_table_schema("Soldier").indexes]
+    get_connection().set_trace_callback(None)
@@ -0,0 +1,60 @@
+from datetime import datetime
+from itertools import islice
+
+from EasyForce.common.constants import DEFAULT_MORNING_HOUR
+from EasyForce.common.utils import to_epoch_minutes
+from EasyForce.data_management.data_structure.entities_classes import RecurringTask
+from EasyForce.data_processing.interval_set import Interval
+from EasyForce.data_processing.shift_slots import (
+    presence_timeline, recurring_task_slots, window_shifts
+)
+
+DAY_START = to_epoch_minutes(datetime(2025, 3, 1))
+DAY_END = DAY_START + 24 * 60
+
+
+def _task(start, end, duration):
+    return RecurringTask(TaskID=1, TaskName="Gate", ShiftDurationInMinutes=duration,
+                         EveryDayStartTime=start, EveryDayEndTime=end, RequiredPersonnel=1)
+
+
+def _offsets(slots):
+    return [(slot.start - DAY_START, slot.end - DAY_START) for slot in slots]
+
+
+def test_day_window_is_split_and_the_last_shift_cut():
+    assert _offsets(recurring_task_slots(_task("08:00", "16:00", 180), DAY_START, DAY_END)) == \
+        [(480, 660), (660, 840), (840, 960)]
+
+
+def test_overnight_window_runs_past_midnight():
+    # Of yesterday's 22:00-06:00 window only the 02:00-06:00 shift lies in the horizon; tonight's ends after it
+    assert _offsets(recurring_task_slots(_task("22:00", "06:00", 240), DAY_START, DAY_END)) == [(120, 360)]
+    assert _offsets(recurring_task_slots(_task("22:00", "06:00", 240), DAY_START, DAY_END + 360)) == \
+        [(120, 360), (1320, 1560), (1560, 1800)]
+
+
+def test_equal_start_and_end_is_an_all_day_window():
+    slots = _offsets(recurring_task_slots(_task(DEFAULT_MORNING_HOUR, DEFAULT_MORNING_HOUR, 480), DAY_START, DAY_END))
+    assert slots == [(0, 480), (480, 960), (960, 1440)]
+
+
+def test_slots_are_clipped_by_the_task_presence():
+    presence = presence_timeline([Interval(DAY_START + 600, DAY_START + 900, 1)], DAY_START, DAY_END)
+    assert _offsets(recurring_task_slots(_task("08:00", "16:00", 240), DAY_START, DAY_END, presence)) == \
+        [(600, 720), (720, 900)]
+
+    absent = presence_timeline([Interval(DAY_START + 600, DAY_START + 900, 0)], DAY_START, DAY_END)
+    assert _offsets(recurring_task_slots(_task("08:00", "16:00", 240), DAY_START, DAY_END, absent)) == \
+        [(480, 600), (900, 960)]
+
+
+def test_slots_are_generated_lazily_and_memoized():
+    window_shifts.cache_clear()
+    ten_years = recurring_task_slots(_task("08:00", "16:00", 60), DAY_START, DAY_START + 3650 * 24 * 60)
+    assert len(list(islice(ten_years, 10))) == 10
+    # Eight shifts a day: only yesterday, today and tomorrow were expanded
+    assert window_shifts.cache_info().currsize == 3
+
+    list(recurring_task_slots(_task("08:00", "16:00", 60), DAY_START, DAY_END))
+    assert window_shifts.cache_info().hits >= 2
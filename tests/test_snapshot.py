@@ -0,0 +1,83 @@
+import threading
+
+from EasyForce.common import config
+from EasyForce.data_management.db_connection import get_connection, close_connections, is_memory_database
+from EasyForce.data_management.init_db.init_database import initialize_database, get_schema_version, SCHEMA_VERSION
+from EasyForce.data_management.snapshot import load_snapshot, save_snapshot
+from EasyForce.data_management.data_structure.data_modification import BaseEntity
+from EasyForce.data_management.data_structure.entities_classes import Team, TimeRange
+
+
+def test_memory_database_is_shared_by_threads(temp_db):
+    assert is_memory_database()
+    Team(TeamName="Alpha").add()
+    seen = []
+
+    def read_from_other_thread():
+        seen.extend(team.TeamName for team in Team.get_all())
+        close_connections()
+
+    thread = threading.Thread(target=read_from_other_thread)
+    thread.start()
+    thread.join()
+    assert seen == ["Alpha"]
+
+
+def test_snapshot_round_trip_between_memory_and_file(temp_db, tmp_path):
+    snapshot = str(tmp_path / "snapshot.db")
+    team = Team(TeamName="Alpha").add()
+    TimeRange(StartDateTime="2025-03-01 08:00", EndDateTime="2025-03-01 10:00").add()
+    assert save_snapshot(snapshot)
+
+    # A new, empty in-memory database picks the data up again
+    close_connections()
+    assert get_schema_version() == 0
+    assert load_snapshot(snapshot)
+    assert get_schema_version() == SCHEMA_VERSION
+    # Entities cached before a load are dropped
+    with BaseEntity.cached():
+        renamed = Team.get_by_id({"TeamID": team.TeamID})
+        renamed.TeamName = "Renamed"
+        renamed.update()
+        assert load_snapshot(snapshot)
+        assert Team.get_by_id({"TeamID": team.TeamID}).TeamName == "Alpha"
+    assert [tr.EndMinute - tr.StartMinute for tr in TimeRange.overlapping("2025-03-01 09:00", "2025-03-01 09:00")] == [120]
+
+
+def test_snapshot_can_seed_memory_from_a_database_file(file_db, monkeypatch):
+    Team(TeamName="Bravo").add()
+    close_connections()
+
+    monkeypatch.setattr(config, "DB_PATH", config.MEMORY_DB_PATH)
+    assert load_snapshot(file_db)
+    assert initialize_database()
+    Team(TeamName="Charlie").add()
+    assert save_snapshot(file_db)
+    close_connections()
+
+    monkeypatch.setattr(config, "DB_PATH", file_db)
+    assert sorted(team.TeamName for team in Team.get_all()) == ["Bravo", "Charlie"]
+
+
+def test_missing_snapshot_is_reported(temp_db, tmp_path):
+    assert not load_snapshot(str(tmp_path / "missing.db"))
+    assert get_connection().execute("SELECT COUNT(*) FROM Team").fetchone()[0] == 0
+
+
+def test_memory_database_waits_for_another_threads_table_lock(temp_db):
+    locked, release = threading.Event(), threading.Event()
+
+    def write_in_other_thread():
+        with BaseEntity.transaction():
+            Team(TeamName="Alpha").add()
+            locked.set()
+            release.wait(5)
+        close_connections()
+
+    thread = threading.Thread(target=write_in_other_thread)
+    thread.start()
+    locked.wait(5)
+    # Reading Team now meets the writer's table lock (SQLITE_LOCKED); the read waits for its commit
+    threading.Timer(0.1, release.set).start()
+    assert [team.TeamName for team in Team.get_all()] == ["Alpha"]
+    thread.join()
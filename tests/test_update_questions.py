@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from EasyForce.data_management.data_structure.entities_classes import Team, Soldier, RecurringTask, TimeRange
+from EasyForce.data_management.data_structure.relationships_classes import CurrentTaskAssignment
+from EasyForce.data_processing.schedule_logic import run_schedule
+from EasyForce.interface.user_questions_management.update_questions.update_entities import (
+    update_Soldier_questions, update_Task_questions
+)
+
+# The repairs never change shifts that have started, so the schedule begins tomorrow
+DAY = datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time())
+
+
+@pytest.fixture
+def scheduled(temp_db):
+    team = Team(TeamName="Alpha").add()
+    for soldier_id in range(1, 5):
+        Soldier(SoldierID=soldier_id, FullName=f"Soldier {soldier_id}", TeamID=team.TeamID).add()
+    RecurringTask(TaskID=1, TaskName="Gate", ShiftDurationInMinutes=240,
+                  EveryDayStartTime="00:00", EveryDayEndTime="00:00", RequiredPersonnel=1).add()
+    run_schedule(DAY, days=2)
+    return _assignments()
+
+
+def _assignments():
+    """Returns {(shift start, soldier id)} of the stored assignments."""
+    rows = CurrentTaskAssignment.get_all()
+    ranges = TimeRange.get_many_by_ids([{"TimeID": row.TimeID} for row in rows])
+    return {(datetime.fromisoformat(ranges[(row.TimeID,)].StartDateTime), row.SoldierOrTeamID) for row in rows}
+
+
+def _answer(monkeypatch, answers):
+    """Feeds 'answers' to input() in order."""
+    answers = iter(answers)
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    return answers
+
+
+def _at(day, hour):
+    return (day + timedelta(hours=hour)).strftime("%d/%m/%Y %H:%M")
+
+
+def test_soldier_absence_repairs_the_shifts_it_overlaps(scheduled, monkeypatch):
+    # Team, soldier 2, no 'in' period, one 'out' period from 06:00 to 20:00
+    answers = _answer(monkeypatch, ["1", "2", "2", "1", _at(DAY, 6), _at(DAY, 20), "2"])
+
+    assert update_Soldier_questions() == 2
+
+    after = _assignments()
+    assert next(answers, None) is None
+    assert len(after) == len(scheduled)
+    assert not [start for start, soldier_id in after
+                if soldier_id == 2 and DAY + timedelta(hours=2) <= start < DAY + timedelta(hours=20)]
+
+
+def test_soldier_first_presence_period_repairs_the_shifts_outside_it(scheduled, monkeypatch):
+    assert any(soldier_id == 2 and start >= DAY + timedelta(days=1) for start, soldier_id in scheduled)
+    # Team, soldier 2, on base for the first day only, no 'out' period
+    answers = _answer(monkeypatch, ["1", "2", "1", _at(DAY, 0), _at(DAY, 24), "2", "2"])
+
+    assert update_Soldier_questions() == 2
+
+    after = _assignments()
+    assert next(answers, None) is None
+    assert len(after) == len(scheduled)
+    assert {entry for entry in scheduled if entry[1] == 2 and entry[0] < DAY + timedelta(days=1)} <= after
+    assert not [start for start, soldier_id in after if soldier_id == 2 and start >= DAY + timedelta(days=1)]
+
+
+def test_task_rules_repair_the_tasks_shifts(scheduled, monkeypatch):
+    assert any(soldier_id == 3 for _, soldier_id in scheduled)
+    # Task 1, add restrictions, soldiers: none must be included, soldier 3 cannot be, then done
+    answers = _answer(monkeypatch, ["1", "1", "3", "2", "1", "3", "2", "3"])
+
+    assert update_Task_questions("RecurringTask") == 1
+
+    after = _assignments()
+    assert next(answers, None) is None
+    assert len(after) == len(scheduled)
+    assert all(soldier_id != 3 for _, soldier_id in after)